@@ -0,0 +1,69 @@
+"""Throughput of the account and tax model against the single-pot batch.
+
+Times project_accounts_batch() for every tax preset and project_batch() on
+the same random profiles, and a loop of per-year Python branching over a
+sample of them (what the account rules would cost without arrays), scaled
+to the same profile count. Run from the repository root:
+
+    python -m benchmarks.bench_accounts --profiles 200000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from pension_calculator.accounts import TAX_PRESETS, project_accounts_batch
+from pension_calculator.batch import project_batch
+
+
+def looped_after_tax(current_age, retirement_age, current_savings, monthly_income,
+                     income_growth_rate, monthly_expenses, annual_return, inflation_rate, accounts):
+    """Final after-tax capital of one profile, year by year and account by account."""
+    balances = [0.0] * len(accounts)
+    uncapped = [i for i, account in enumerate(accounts) if np.isinf(account.annual_cap)]
+    balances[uncapped[0] if uncapped else -1] = current_savings
+    price_level = 1.0
+    for year in range(1, int(retirement_age - current_age) + 1):
+        price_level *= 1 + inflation_rate / 100
+        remaining = max(monthly_income * 12 * (1 + income_growth_rate / 100) ** year
+                        - monthly_expenses * 12 * price_level, 0.0)
+        for i, account in enumerate(accounts):
+            kept = 1 - account.deduction_rate
+            paid = min(remaining, account.annual_cap * kept * price_level)
+            remaining -= paid
+            balances[i] = (balances[i] + paid / kept) * (1 + annual_return / 100 * (1 - account.return_tax_rate))
+    return sum(balance * (1 - account.withdrawal_tax_rate) for balance, account in zip(balances, accounts))
+
+
+def best_time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=200000)
+    parser.add_argument('--loop-sample', type=int, default=2000, help='profiles run through the Python loop')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    seconds, _ = best_time(lambda: project_batch(*profiles), args.repeat)
+    print(f"project_batch            {args.profiles / seconds:12,.0f} profiles/s")
+
+    sample = [tuple(column[i] for column in profiles) for i in range(args.loop_sample)]
+    for name, accounts in TAX_PRESETS.items():
+        seconds, result = best_time(lambda: project_accounts_batch(*profiles, accounts=accounts), args.repeat)
+        looped, expected = best_time(lambda: [looped_after_tax(*profile, accounts) for profile in sample], 1)
+        error = np.max(np.abs(result.after_tax_nominal[:args.loop_sample] - expected) / np.maximum(expected, 1.0))
+        print(f"accounts '{name}' ({len(accounts)} accounts) {args.profiles / seconds:12,.0f} profiles/s, "
+              f"Python loop {args.loop_sample / looped:10,.0f} profiles/s, max relative difference {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Closed-form summaries versus the (profiles x years) batch projection.
+
+Times closed_form_summary() against project_batch() on random profiles,
+and for a single profile against summarize(project()), and reports the
+largest relative difference of the final real capital. Also times
+years_to_fi() and money_weighted_return() on the same profiles.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_analytics --profiles 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from benchmarks.golden import DEFAULT_PROFILE
+from pension_calculator import project, project_batch, summarize
+from pension_calculator.analytics import closed_form_summary, money_weighted_return, years_to_fi
+
+
+def best_time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    closed, result = best_time(lambda: closed_form_summary(*profiles), args.repeat)
+    batch, expected = best_time(lambda: project_batch(*profiles), args.repeat)
+    error = np.max(np.abs(result.final_real / expected.final_real - 1))
+    print(f"{args.profiles:,} profiles: closed form {closed:.3f} s, batch {batch:.3f} s "
+          f"({batch / closed:.1f}x), max relative difference {error:.1e}")
+
+    single = [np.array([value]) for value in DEFAULT_PROFILE]
+    closed, _ = best_time(lambda: closed_form_summary(*single), args.repeat * 100)
+    loop, _ = best_time(lambda: summarize(project(*DEFAULT_PROFILE), DEFAULT_PROFILE[2]), args.repeat * 100)
+    print(f"sidebar defaults: closed form {closed * 1e6:.0f} us, project + summarize {loop * 1e6:.0f} us")
+
+    fi, _ = best_time(lambda: years_to_fi(*profiles[2:]), args.repeat)
+    print(f"{args.profiles:,} profiles: years_to_fi {fi:.3f} s")
+
+    # Deposits of every profile over a common 40-year horizon
+    n = min(args.profiles, 100000)
+    deposits = np.random.default_rng(0).uniform(0, 50000, (n, 41))
+    final_value = deposits.sum(axis=1) * 2.5
+    irr, _ = best_time(lambda: money_weighted_return(100000.0, deposits, final_value), args.repeat)
+    print(f"{n:,} plans x 40 years: money_weighted_return {irr:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
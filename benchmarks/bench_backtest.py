@@ -0,0 +1,91 @@
+"""Historical backtest: strided windows versus a loop over windows.
+
+Builds a synthetic yearly history (random stock, bond and inflation
+figures; only its length matters for timing), writes it with
+build_history() and compares
+
+  * opening it: memory-mapping the .npy versus parsing the CSV,
+  * backtest() over every window at once versus projecting each window in
+    a Python loop over copied slices of the history.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_backtest --years 150 --horizon 40
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pension_calculator.history import HISTORY_COLUMNS, backtest, build_history, load_history
+from pension_calculator.projection import accumulate, growth_factors
+
+# Sidebar defaults without the ages and rates
+PROFILE = (71000.0, 12833.0, 6.5, 6500.0)
+
+
+def looped_backtest(current_age, retirement_age, current_savings, monthly_income,
+                    income_growth_rate, monthly_expenses, history, stock_allocation=60.0):
+    """One projection per window, each on its own copy of the history."""
+    n_years = retirement_age - current_age
+    years = np.arange(n_years + 1)
+    annual_income = monthly_income * 12 * growth_factors(income_growth_rate, years)
+    share = stock_allocation / 100
+    rows = []
+    for start in range(len(history) - n_years + 1):
+        window = np.array(history[start:start + n_years])
+        returns = np.concatenate([[0.0], share * window[:, 1] + (1 - share) * window[:, 2]])
+        price_level = np.cumprod(np.concatenate([[1.0], 1 + window[:, 3] / 100]))
+        contributions = annual_income - monthly_expenses * 12 * price_level
+        rows.append(accumulate(current_savings, contributions, 1 + returns / 100) / price_level)
+    return np.array(rows)
+
+
+def best_time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=150, help='length of the synthetic history')
+    parser.add_argument('--horizon', type=int, default=40, help='years to retirement')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    history = np.column_stack([
+        1871 + np.arange(args.years),
+        rng.normal(9.0, 18.0, args.years),
+        rng.normal(4.5, 7.0, args.years),
+        rng.normal(3.0, 4.0, args.years),
+    ])
+    ages = (60 - args.horizon, 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'returns.csv')
+        np.savetxt(csv_path, history, delimiter=',', header=','.join(HISTORY_COLUMNS), comments='')
+        path = os.path.join(tmp, 'history.npy')
+        build_history(csv_path, path)
+
+        mapped, _ = best_time(lambda: load_history(path), args.repeat)
+        parsed, _ = best_time(lambda: np.loadtxt(csv_path, delimiter=',', skiprows=1), args.repeat)
+        print(f"open {args.years} years: memory map {mapped * 1e3:.3f} ms, CSV {parsed * 1e3:.3f} ms")
+
+        data = load_history(path)
+        strided, result = best_time(lambda: backtest(*ages, *PROFILE, data), args.repeat)
+        looped, expected = best_time(lambda: looped_backtest(*ages, *PROFILE, data), args.repeat)
+        error = np.max(np.abs(result.real_values / expected - 1))
+        windows = len(result.start_years)
+        print(f"{windows} windows of {args.horizon} years: strided {strided * 1e3:.3f} ms, "
+              f"loop {looped * 1e3:.3f} ms ({looped / strided:.1f}x), max relative difference {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
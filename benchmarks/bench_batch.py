@@ -0,0 +1,49 @@
+"""Throughput of the batch projection.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch --profiles 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from pension_calculator.batch import project_batch
+
+
+def random_profiles(n, seed=0):
+    """Profiles spread around the sidebar defaults, with ragged horizons."""
+    rng = np.random.default_rng(seed)
+    current_age = rng.integers(18, 65, n)
+    return (
+        current_age,
+        current_age + rng.integers(1, 50, n),
+        rng.uniform(0, 500000, n),
+        rng.uniform(2000, 30000, n),
+        rng.uniform(0, 10, n),
+        rng.uniform(1000, 20000, n),
+        rng.uniform(0, 15, n),
+        rng.uniform(0, 10, n),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        project_batch(*profiles)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{args.profiles:,} profiles in {best:.3f} s "
+          f"({args.profiles / best:,.0f} profiles/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Payload size and build time of the capital forecast figure.
+
+Compares the old chart (SVG `Scatter` traces with a marker on every point,
+Monte Carlo shown as individual paths) with the current one (WebGL
+`Scattergl` traces, LTTB-downsampled lines with markers and hover on the
+yearly values only, P5-P95 as a filled band) for yearly, monthly and daily
+steps. Reports the JSON size Streamlit sends to the browser and the time
+to build and serialize the figure; browser render time isn't measured.
+Run from the repository root:
+
+    python -m benchmarks.bench_chart --years 40
+"""
+import argparse
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from pension_calculator import project, project_steps, to_annual
+from pension_calculator.downsample import lttb
+
+CHART_MAX_POINTS = 1000
+
+# Sidebar defaults without the ages
+PROFILE = (71000.0, 12833.0, 6.5, 6500.0, 6.0, 3.5)
+
+
+def old_figure(path, yearly, simulation, drawn_paths):
+    fig = go.Figure()
+    for values, dash in ((path[1], None), (path[2], 'dash')):
+        fig.add_trace(go.Scatter(x=path[0], y=values, mode='lines+markers',
+                                 line=dict(width=3, dash=dash), marker=dict(size=6)))
+    for values in simulation[:drawn_paths]:
+        fig.add_trace(go.Scatter(x=yearly.ages, y=values, mode='lines', line=dict(width=1),
+                                 opacity=0.2, showlegend=False, hoverinfo='skip'))
+    fig.update_layout(hovermode='x unified', height=500)
+    return fig
+
+
+def new_figure(path, yearly, simulation, drawn_paths):
+    fig = go.Figure()
+    for values, yearly_values, dash in ((path[1], yearly.nominal_value, None), (path[2], yearly.real_value, 'dash')):
+        shown = lttb(path[0], values, CHART_MAX_POINTS)
+        fig.add_trace(go.Scattergl(x=path[0][shown], y=values[shown], mode='lines',
+                                   line=dict(width=3, dash=dash), hoverinfo='skip'))
+        fig.add_trace(go.Scattergl(x=yearly.ages, y=yearly_values, mode='markers',
+                                   marker=dict(size=6), showlegend=False))
+    low, high = np.percentile(simulation, [5, 95], axis=0)
+    fig.add_trace(go.Scattergl(x=yearly.ages, y=high, mode='lines', line=dict(width=0),
+                               showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scattergl(x=yearly.ages, y=low, mode='lines', line=dict(width=0),
+                               fill='tonexty', hoverinfo='skip'))
+    fig.update_layout(hovermode='x unified', height=500)
+    return fig
+
+
+def measure(build, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = build(*args).to_json()
+        best = min(best, time.perf_counter() - start)
+    return len(payload), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--paths', type=int, default=200, help='Monte Carlo paths the old chart draws')
+    args = parser.parse_args()
+
+    ages = (60 - args.years, 60)
+    forecast = project(*ages, *PROFILE)
+    # Random walks around the forecast stand in for individual Monte Carlo
+    # paths; only their number and length matter for the payload
+    rng = np.random.default_rng(0)
+    paths = forecast.real_value * np.exp(np.cumsum(rng.normal(0, 0.15, (args.paths, forecast.ages.size)), axis=1))
+
+    for steps_per_year, label in ((1, 'yearly'), (12, 'monthly'), (365, 'daily')):
+        steps = project_steps(*ages, *PROFILE, steps_per_year=steps_per_year)
+        yearly = to_annual(steps, ages[0], PROFILE[0], PROFILE[1], PROFILE[3])
+        path = (
+            np.concatenate([[ages[0]], steps.ages]),
+            np.concatenate([[PROFILE[0]], steps.nominal_value]),
+            np.concatenate([[PROFILE[0]], steps.real_value]),
+        )
+        for name, build in (('old', old_figure), ('new', new_figure)):
+            size, seconds = measure(build, path, yearly, paths, args.paths)
+            print(f"{label:<8} {name}: {size / 1024:9.1f} KiB, build + JSON {seconds * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Slider drags: IncrementalSimulation versus a fresh simulate() per rerun.
+
+Replays the reruns of dragging one sidebar slider at a time over the
+sidebar defaults, with the withdrawal phase up to the life expectancy, and
+times each drag with one IncrementalSimulation kept across its reruns (as
+main.py keeps it in the session) and with a fresh simulate() per rerun.
+Results are checked to be equal.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_incremental --paths 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.golden import DEFAULT_PROFILE, INPUT_NAMES
+from pension_calculator import IncrementalSimulation, simulate
+
+# Slider values visited by each drag, one rerun per value
+DRAGS = {
+    'retirement_age': [61, 62, 63, 64, 65, 64, 63, 62, 61, 60],
+    'life_expectancy': [86, 87, 88, 89, 90, 91, 92],
+    'annual_return': [6.1, 6.2, 6.3, 6.4, 6.5],
+    'inflation_rate': [3.6, 3.7, 3.8, 3.9, 4.0],
+    'monthly_expenses': [6600.0, 6700.0, 6800.0, 6900.0, 7000.0],
+    'current_savings': [72000.0, 73000.0, 74000.0, 75000.0, 76000.0],
+}
+
+
+def time_drag(run, inputs, name, values):
+    start = time.perf_counter()
+    results = [run(**dict(inputs, **{name: value})) for value in values]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--life-expectancy', type=int, default=85)
+    args = parser.parse_args()
+
+    inputs = dict(zip(INPUT_NAMES, DEFAULT_PROFILE), n_paths=args.paths, seed=0,
+                  life_expectancy=args.life_expectancy)
+    total_incremental = total_fresh = 0.0
+    for name, values in DRAGS.items():
+        simulation = IncrementalSimulation()
+        simulation.simulate(**inputs)  # the rerun before the drag starts
+        incremental, results = time_drag(simulation.simulate, inputs, name, values)
+        fresh, expected = time_drag(simulate, inputs, name, values)
+        equal = all(np.array_equal(a.real_bands, b.real_bands)
+                    and np.array_equal(a.retirement_real_bands, b.retirement_real_bands)
+                    for a, b in zip(results, expected))
+        total_incremental += incremental
+        total_fresh += fresh
+        print(f"{name:<17} {len(values):>2} reruns: incremental {incremental / len(values) * 1e3:7.2f} ms, "
+              f"fresh {fresh / len(values) * 1e3:7.2f} ms per rerun ({fresh / incremental:.1f}x)"
+              f"{'' if equal else '  RESULTS DIFFER'}")
+    print(f"all drags: incremental {total_incremental:.3f} s, fresh {total_fresh:.3f} s "
+          f"({total_fresh / total_incremental:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Latency of the Monte Carlo simulation at the sidebar defaults.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_montecarlo --paths 100000 --years 50
+"""
+import argparse
+import time
+
+from pension_calculator.montecarlo import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', type=int, default=100000)
+    parser.add_argument('--years', type=int, default=50)
+    parser.add_argument('--distribution', default='lognormal', choices=['normal', 'lognormal'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        simulate(
+            30, 30 + args.years, 71000, 12833, 6.5, 6500, 6.0, 3.5,
+            n_paths=args.paths, distribution=args.distribution, target=2000000, seed=0
+        )
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{args.paths:,} paths x {args.years} years in {best:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
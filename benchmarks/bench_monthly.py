@@ -0,0 +1,44 @@
+"""Throughput of the monthly/daily step engine on many long horizons.
+
+Times final_values_batch on random profiles with a fixed horizon (80 years
+by default) and reports profile-steps per second, next to the annual batch
+projection of the same profiles. Run from the repository root:
+
+    python -m benchmarks.bench_monthly --profiles 100000 --years 80
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from pension_calculator import final_values_batch, project_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=100000)
+    parser.add_argument('--years', type=int, default=80)
+    parser.add_argument('--steps-per-year', type=int, default=12)
+    args = parser.parse_args()
+
+    columns = list(random_profiles(args.profiles, seed=0))
+    columns[0] = np.full(args.profiles, 20)
+    columns[1] = columns[0] + args.years
+
+    start = time.perf_counter()
+    project_batch(*columns)
+    annual = time.perf_counter() - start
+
+    start = time.perf_counter()
+    final_values_batch(*columns, steps_per_year=args.steps_per_year)
+    stepped = time.perf_counter() - start
+
+    steps = args.profiles * args.years * args.steps_per_year
+    print(f"annual batch  {args.profiles:,} x {args.years} years: {annual:.2f} s")
+    print(f"step engine   {args.profiles:,} x {args.years * args.steps_per_year:,} steps: "
+          f"{stepped:.2f} s ({steps / stepped / 1e6:.0f}M profile-steps/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Scaling of the book-wide Monte Carlo with the number of worker processes.
+
+Runs simulate_book on the same random profiles with 1, 2, 4, ... workers up
+to the CPU count, reports the speed-up over one worker and checks that
+every run gives identical results. Run from the repository root:
+
+    python -m benchmarks.bench_parallel --profiles 512 --paths 2000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from pension_calculator.parallel import simulate_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=512)
+    parser.add_argument('--paths', type=int, default=2000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles, seed=0)
+    counts = sorted({1, args.max_workers, *(2 ** k for k in range(1, 8) if 2 ** k < args.max_workers)})
+
+    reference = None
+    for workers in counts:
+        start = time.perf_counter()
+        result = simulate_book(*profiles, n_paths=args.paths, workers=workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, single = result, elapsed
+        identical = all(np.array_equal(a, b, equal_nan=True) for a, b in zip(result[1:], reference[1:]))
+        print(f"{workers:>3} workers: {elapsed:6.2f} s, speed-up {single / elapsed:4.1f}x, "
+              f"{'identical' if identical else 'DIFFERENT'} results")
+
+
+if __name__ == '__main__':
+    main()
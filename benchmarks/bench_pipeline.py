@@ -0,0 +1,72 @@
+"""Throughput and peak memory of the streaming batch pipeline.
+
+Writes random profile files of increasing size to a temporary directory,
+then projects each one in a fresh process and reports rows/s and the peak
+resident memory of that process, which should stay flat as files grow.
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --rows 1000000 4000000 --format parquet
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from pension_calculator import PROFILE_COLUMNS
+
+RUN = """
+import resource, sys
+from pension_calculator.pipeline import run_pipeline
+stats = run_pipeline(sys.argv[1], sys.argv[2], sys.argv[3])
+print(stats.rows_per_second, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_profiles(path, rows, chunk_rows=1000000):
+    """Write `rows` random profiles in chunks, so the file can exceed memory."""
+    import pandas as pd
+
+    writer = None
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        frame = pd.DataFrame(dict(zip(PROFILE_COLUMNS, random_profiles(n, seed=start))))
+        frame.insert(0, 'id', np.arange(start, start + n))
+        if path.suffix == '.parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            writer = writer or pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        else:
+            frame.to_csv(path, mode='a', header=start == 0, index=False)
+    if writer is not None:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[250000, 1000000])
+    parser.add_argument('--format', choices=('csv', 'parquet'), default='parquet')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            source = Path(tmp) / f'profiles_{rows}.{args.format}'
+            target = Path(tmp) / f'results_{rows}.{args.format}'
+            write_profiles(source, rows)
+            output = subprocess.run(
+                [sys.executable, '-c', RUN, str(source), str(target), args.format],
+                capture_output=True, text=True, check=True
+            ).stdout
+            rate, peak_kib = output.split()
+            print(f"{rows:>11,} rows ({args.format}): {float(rate):>11,.0f} rows/s, "
+                  f"peak memory {int(peak_kib) / 1024:6.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
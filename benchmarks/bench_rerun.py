@@ -0,0 +1,50 @@
+"""Rerun latency of the Streamlit page, measured with Streamlit's AppTest.
+
+By default every rerun keeps the inputs unchanged, like a rerun triggered by
+a widget that doesn't affect the numbers; --languages switches the language
+selector instead (which also resets the sidebar widgets, as their labels are
+translated). Run from the repository root:
+
+    python -m benchmarks.bench_rerun --monte-carlo
+"""
+import argparse
+import itertools
+import statistics
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / 'main.py'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=str(MAIN_SCRIPT))
+    parser.add_argument('--reruns', type=int, default=20)
+    parser.add_argument('--monte-carlo', action='store_true',
+                        help='enable the Monte Carlo section before timing')
+    parser.add_argument('--languages', action='store_true',
+                        help='cycle through the languages on every rerun')
+    args = parser.parse_args()
+
+    app = AppTest.from_file(str(Path(args.script).resolve()), default_timeout=120).run()
+    if args.monte_carlo:
+        app.sidebar.checkbox[0].check().run()
+
+    timings = []
+    for language in itertools.islice(itertools.cycle(['pl', 'zh', 'en']), args.reruns):
+        start = time.perf_counter()
+        if args.languages:
+            app.selectbox[0].set_value(language)
+        app.run()
+        timings.append(time.perf_counter() - start)
+        if app.exception:
+            raise SystemExit(app.exception[0].value)
+
+    print(f"{args.reruns} reruns: median {statistics.median(timings) * 1000:.1f} ms, "
+          f"max {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Loading saved scenarios versus recomputing them.
+
+Saves --scenarios monthly-step scenarios into a temporary store, then
+times loading --compare of them (what the comparison view does) against
+recomputing their projections, and reports the size of the store. Run from
+the repository root:
+
+    python -m benchmarks.bench_scenarios --scenarios 200 --compare 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from pension_calculator import PROFILE_COLUMNS, project_monthly
+from pension_calculator.scenarios import ScenarioStore
+
+PROFILE = dict(zip(PROFILE_COLUMNS, (32, 60, 71000.0, 12833.0, 6.5, 6500.0, 6.0, 3.5)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', type=int, default=200)
+    parser.add_argument('--compare', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScenarioStore(os.path.join(tmp, 'scenarios.sqlite'), max_entries=args.scenarios)
+        inputs = [dict(PROFILE, annual_return=2 + i / 50, steps_per_year=12) for i in range(args.scenarios)]
+        keys = [store.save('benchmark', f'scenario {i}', profile, project_monthly(**profile))
+                for i, profile in enumerate(inputs)]
+
+        compared = keys[:args.compare]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            store.load('benchmark', compared)
+        loaded = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for profile in inputs[:args.compare]:
+                project_monthly(**profile)
+        recomputed = (time.perf_counter() - start) / args.repeat
+
+        size = os.path.getsize(store.path)
+    print(f"{args.compare} of {args.scenarios} scenarios: load {loaded * 1000:.2f} ms, "
+          f"recompute {recomputed * 1000:.2f} ms; store {size / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Time to evaluate a full return x inflation x income growth grid.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sensitivity --returns 150 --inflation 100 --growth 100
+"""
+import argparse
+import time
+
+import numpy as np
+
+from pension_calculator.sensitivity import sensitivity_grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--returns', type=int, default=150)
+    parser.add_argument('--inflation', type=int, default=100)
+    parser.add_argument('--growth', type=int, default=100)
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    axes = (np.linspace(0, 15, args.returns), np.linspace(0, 10, args.inflation), np.linspace(0, 10, args.growth))
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        sensitivity_grid(25, 25 + args.years, 71000, 12833, 6500, *axes)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{args.returns}x{args.inflation}x{args.growth} grid, {args.years} years in {best * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
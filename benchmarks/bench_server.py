@@ -0,0 +1,85 @@
+"""Load test of the HTTP API: latency percentiles and requests per second.
+
+Starts `python -m pension_calculator serve` in a subprocess, then opens
+--connections keep-alive connections from an asyncio client that each send
+/project requests for random profiles back to back. Every profile is
+different, so the response cache never hits unless --repeat is given. The
+server is run twice: with micro-batching and with batches of one request.
+Run from the repository root:
+
+    python -m benchmarks.bench_server --connections 64 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_batch import random_profiles
+from pension_calculator import PROFILE_COLUMNS
+
+
+def start_server(*options):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'pension_calculator', 'serve', '--port', '0', *options],
+        stdout=subprocess.PIPE, text=True
+    )
+    port = int(process.stdout.readline().rsplit(':', 1)[1])
+    return process, port
+
+
+async def client(port, bodies, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for body in bodies:
+        start = time.perf_counter()
+        writer.write(
+            f"POST /project HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load(port, bodies, connections):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, bodies[i::connections], latencies) for i in range(connections)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--repeat', action='store_true', help='send the same profile every time (cache hits)')
+    args = parser.parse_args()
+
+    profiles = np.column_stack(random_profiles(1 if args.repeat else args.requests, seed=0))
+    bodies = [
+        json.dumps(dict(zip(PROFILE_COLUMNS, profiles[i % len(profiles)].tolist()))).encode()
+        for i in range(args.requests)
+    ]
+
+    for label, options in (('micro-batching', []), ('no batching', ['--max-batch-size', '1'])):
+        process, port = start_server(*options)
+        try:
+            latencies, elapsed = asyncio.run(load(port, bodies, args.connections))
+        finally:
+            process.terminate()
+            process.wait()
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{label:<15} {args.requests:,} requests over {args.connections} connections: "
+              f"{args.requests / elapsed:8,.0f} req/s, p50 {p50:6.2f} ms, p99 {p99:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
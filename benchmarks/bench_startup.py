@@ -0,0 +1,51 @@
+"""Cold start of the Streamlit page: first render in a fresh interpreter.
+
+Each sample starts a new Python process and first runs an empty script
+through Streamlit's AppTest, so Streamlit's own startup is paid up front.
+It then times the first run of the page, which includes importing
+everything the script needs. Run from the repository root:
+
+    python -m benchmarks.bench_startup --samples 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / 'main.py'
+
+FIRST_RENDER = """
+import logging, time
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+AppTest.from_string('import streamlit as st', default_timeout=120).run()
+start = time.perf_counter()
+app = AppTest.from_file({script!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+assert not app.exception, app.exception
+print(elapsed)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=str(MAIN_SCRIPT))
+    parser.add_argument('--samples', type=int, default=5)
+    args = parser.parse_args()
+
+    code = FIRST_RENDER.format(script=args.script)
+    timings = []
+    for _ in range(args.samples):
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            cwd=Path(args.script).resolve().parent
+        ).stdout
+        timings.append(float(output.split()[-1]))
+
+    print(f"first render over {args.samples} fresh processes: "
+          f"median {statistics.median(timings) * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Cost of preparing the detailed data table for the browser.
+
+Compares the old approach (five Series.apply passes turning every value into
+a "1,234 USD" string) with sending the numeric frame and letting the column
+config format it. Reports preparation + Arrow serialization time and the
+payload size. Run from the repository root:
+
+    python -m benchmarks.bench_table --rows 10000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit import dataframe_util
+
+from pension_calculator.translations import translations
+
+MONEY_COLUMNS = (
+    'annual_income_col',
+    'annual_expenses_col',
+    'annual_contribution_col',
+    'nominal_value_col',
+    'real_value_col',
+)
+
+
+def string_formatted(df, t):
+    df_display = df.copy()
+    for key in MONEY_COLUMNS:
+        df_display[t[key]] = df_display[t[key]].apply(lambda x: f"{x:,.0f} {t['currency']}")
+    return df_display
+
+
+def numeric(df, t):
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    t = translations['en']
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({t['age_col']: np.arange(args.rows)})
+    for key in MONEY_COLUMNS:
+        df[t[key]] = rng.uniform(0, 1e7, args.rows)
+
+    for prepare in (string_formatted, numeric):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            payload = dataframe_util.convert_pandas_df_to_arrow_bytes(prepare(df, t))
+            best = min(best, time.perf_counter() - start)
+        print(f"{prepare.__name__:<17} {args.rows:,} rows: {best * 1000:7.1f} ms, {len(payload) / 1024:8.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""The original year-by-year projection loop of main.py, kept as the reference.
+
+This is the calculation the page did before it was vectorized, with the
+Streamlit and DataFrame parts removed. benchmarks.golden checks the engine
+against it; don't "fix" or speed it up. reference_steps() and
+reference_withdrawals() are the same kind of plain loop for the monthly/daily
+engine and the withdrawal strategies, written step by step from the rules in
+pension_calculator.monthly and pension_calculator.decumulation.
+"""
+
+
+def reference_projection(current_age, retirement_age, current_savings, monthly_income,
+                         income_growth_rate, monthly_expenses, annual_return, inflation_rate):
+    """Yearly ages, income, expenses, contributions, nominal and real values."""
+    years_to_retirement = retirement_age - current_age
+
+    years = []
+    nominal_values = []
+    real_values = []
+    annual_contributions_list = []
+    annual_income_list = []
+    annual_expenses_list = []
+
+    current_value = current_savings
+
+    for year in range(years_to_retirement + 1):
+        age = current_age + year
+        years.append(age)
+
+        # Calculate income and expenses for given year
+        annual_income = monthly_income * 12 * ((1 + income_growth_rate/100) ** year)
+        annual_expenses = monthly_expenses * 12 * ((1 + inflation_rate/100) ** year)
+        annual_contribution = annual_income - annual_expenses
+
+        annual_income_list.append(annual_income)
+        annual_expenses_list.append(annual_expenses)
+        annual_contributions_list.append(annual_contribution)
+
+        if year > 0 and annual_contribution > 0:
+            # Apply investment return and add annual contributions
+            current_value = (current_value + annual_contribution) * (1 + annual_return/100)
+        elif year > 0:
+            # If no surplus, only investment return
+            current_value = current_value * (1 + annual_return/100)
+
+        nominal_values.append(current_value)
+        # Real value (adjusted for inflation)
+        real_value = current_value / ((1 + inflation_rate/100) ** year)
+        real_values.append(real_value)
+
+    return (years, annual_income_list, annual_expenses_list, annual_contributions_list,
+            nominal_values, real_values)
+
+
+def reference_summary(current_savings, annual_contributions_list, nominal_values, real_values):
+    """Summary metrics as the page computed them, with the 4% rule."""
+    final_nominal = nominal_values[-1]
+    final_real = real_values[-1]
+    total_contributions = current_savings + sum(annual_contributions_list[1:])  # Skip year 0
+    investment_gain = final_nominal - total_contributions
+
+    # Average annual contribution (from years with positive contribution)
+    positive_contributions = [c for c in annual_contributions_list[1:] if c > 0]
+    avg_annual_contribution = sum(positive_contributions) / len(positive_contributions) if positive_contributions else 0
+
+    return {
+        'final_nominal': final_nominal,
+        'final_real': final_real,
+        'total_contributions': total_contributions,
+        'investment_gain': investment_gain,
+        'avg_annual_contribution': avg_annual_contribution,
+        'monthly_pension_nominal': (final_nominal * 0.04) / 12,
+        'monthly_pension_real': (final_real * 0.04) / 12,
+    }
+
+
+def reference_steps(current_age, retirement_age, current_savings, monthly_income,
+                    income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                    steps_per_year, first_raise_step=None):
+    """Step ages, income, expenses, contributions, nominal and real values."""
+    if first_raise_step is None:
+        first_raise_step = steps_per_year
+    step_return = (1 + annual_return/100) ** (1/steps_per_year) - 1
+    step_inflation = (1 + inflation_rate/100) ** (1/steps_per_year) - 1
+
+    ages = []
+    income_list = []
+    expenses_list = []
+    contributions_list = []
+    nominal_values = []
+    real_values = []
+
+    income = monthly_income * 12 / steps_per_year
+    price_level = 1.0
+    current_value = current_savings
+
+    for step in range((retirement_age - current_age) * steps_per_year):
+        # Yearly raise, the first one at first_raise_step
+        if step >= first_raise_step and (step - first_raise_step) % steps_per_year == 0:
+            income = income * (1 + income_growth_rate/100)
+        # Expenses at the price level of the start of the step
+        expenses = monthly_expenses * 12 / steps_per_year * price_level
+        contribution = income - expenses
+
+        # The step's return on what was there, then the surplus is invested
+        current_value = current_value * (1 + step_return)
+        if contribution > 0:
+            current_value = current_value + contribution
+        price_level = price_level * (1 + step_inflation)
+
+        ages.append(current_age + (step + 1) / steps_per_year)
+        income_list.append(income)
+        expenses_list.append(expenses)
+        contributions_list.append(contribution)
+        nominal_values.append(current_value)
+        real_values.append(current_value / price_level)
+
+    return ages, income_list, expenses_list, contributions_list, nominal_values, real_values
+
+
+def reference_withdrawals(initial_balance, retirement_age, annual_returns, inflation_rates, strategy,
+                          withdrawal_rate=0.04, price_level=1.0, vpw_real_return=0.03,
+                          guardrail_band=0.2, guardrail_adjustment=0.1):
+    """Yearly balances, real balances, withdrawals and the depletion age (or None) of one path.
+
+    `annual_returns` and `inflation_rates` are lists of percentages, one per
+    year after retirement.
+    """
+    years = len(annual_returns)
+    balance = initial_balance
+    prices = price_level
+    spending = withdrawal_rate * initial_balance
+
+    balances = [balance]
+    real_balances = [balance / prices]
+    withdrawals = []
+
+    for year in range(years):
+        if strategy == 'constant_real':
+            # The first withdrawal, raised with last year's inflation
+            if year > 0:
+                spending = spending * (1 + inflation_rates[year - 1]/100)
+            planned = spending
+        elif strategy == 'fixed_percentage':
+            planned = withdrawal_rate * balance
+        elif strategy == 'vpw':
+            # Annuity over the remaining years, paid at the start of each
+            remaining = years - year
+            if vpw_real_return == 0:
+                rate = 1 / remaining
+            else:
+                rate = vpw_real_return / ((1 + vpw_real_return) * (1 - (1 + vpw_real_return) ** -remaining))
+            planned = rate * balance
+        elif strategy == 'guardrails':
+            if year > 0:
+                spending = spending * (1 + inflation_rates[year - 1]/100)
+                rate = spending / balance if balance > 0 else float('inf')
+                if rate > withdrawal_rate * (1 + guardrail_band):
+                    spending = spending * (1 - guardrail_adjustment)
+                elif rate < withdrawal_rate * (1 - guardrail_band):
+                    spending = spending * (1 + guardrail_adjustment)
+            planned = spending
+        else:
+            raise ValueError(strategy)
+
+        withdrawal = min(planned, balance)
+        balance = (balance - withdrawal) * (1 + annual_returns[year]/100)
+        prices = prices * (1 + inflation_rates[year]/100)
+
+        withdrawals.append(withdrawal)
+        balances.append(balance)
+        real_balances.append(balance / prices)
+
+    depleted = [year for year, value in enumerate(balances) if value <= 0]
+    depletion_age = retirement_age + depleted[0] if depleted else None
+    return balances, real_balances, withdrawals, depletion_age
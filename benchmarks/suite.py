@@ -0,0 +1,220 @@
+"""Benchmark suite with JSON results and regression flagging.
+
+Times the calculation and render paths: single projections at 1, 40 and 80
+years, batch projections of 1k/100k/1M profiles, Monte Carlo at 1k/10k/100k
+paths, building the detailed data table for the browser and building the
+forecast figure. The golden-value checks of benchmarks.golden run first and
+the suite stops if they fail.
+
+Each case is timed like timeit: calls are looped until a sample takes at
+least --min-time, and --repeat samples are taken; the per-call median and
+minimum are reported. Results are written to JSON with the environment, so
+two runs can be compared; with --compare, cases whose median is more than
+--threshold slower than the baseline are flagged and the exit status is 1.
+Run from the repository root:
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --compare before.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import golden
+from benchmarks.bench_batch import random_profiles
+from pension_calculator import project, project_batch, simulate, summarize
+
+DEFAULT_PROFILE = golden.DEFAULT_PROFILE
+
+
+def _horizon(years):
+    current_age = 20 if years == 80 else DEFAULT_PROFILE[1] - years
+    return (current_age, current_age + years) + DEFAULT_PROFILE[2:]
+
+
+def case_project(years):
+    profile = _horizon(years)
+    return lambda: summarize(project(*profile), profile[2])
+
+
+def case_batch(n):
+    profiles = random_profiles(n, seed=0)
+    return lambda: project_batch(*profiles)
+
+
+def case_montecarlo(n_paths):
+    return lambda: simulate(*DEFAULT_PROFILE, n_paths=n_paths, seed=0)
+
+
+def case_table(years):
+    """The detailed data table as main.py builds it, serialized for the browser."""
+    import pandas as pd
+    from streamlit import dataframe_util
+
+    from pension_calculator.translations import translations
+
+    t = translations['en']
+    projection = project(*_horizon(years))
+
+    def run():
+        df = pd.DataFrame({
+            t['age_col']: projection.ages,
+            t['annual_income_col']: projection.annual_income,
+            t['annual_expenses_col']: projection.annual_expenses,
+            t['annual_contribution_col']: projection.annual_contribution,
+            t['nominal_value_col']: projection.nominal_value,
+            t['real_value_col']: projection.real_value
+        })
+        return dataframe_util.convert_pandas_df_to_arrow_bytes(df)
+    return run
+
+
+def case_figure(years):
+    """The forecast chart's two traces, built and serialized to JSON."""
+    import plotly.graph_objects as go
+
+    projection = project(*_horizon(years))
+
+    def run():
+        fig = go.Figure()
+        for values, dash in ((projection.nominal_value, None), (projection.real_value, 'dash')):
+            fig.add_trace(go.Scatter(
+                x=projection.ages,
+                y=values,
+                mode='lines+markers',
+                line=dict(width=3, dash=dash),
+                marker=dict(size=6),
+            ))
+        fig.update_layout(hovermode='x unified', height=500)
+        return fig.to_json()
+    return run
+
+
+CASES = {
+    'project[1y]': (case_project, 1),
+    'project[40y]': (case_project, 40),
+    'project[80y]': (case_project, 80),
+    'batch[1k]': (case_batch, 1000),
+    'batch[100k]': (case_batch, 100000),
+    'batch[1M]': (case_batch, 1000000),
+    'montecarlo[1k]': (case_montecarlo, 1000),
+    'montecarlo[10k]': (case_montecarlo, 10000),
+    'montecarlo[100k]': (case_montecarlo, 100000),
+    'table[40y]': (case_table, 40),
+    'table[80y]': (case_table, 80),
+    'figure[40y]': (case_figure, 40),
+    'figure[80y]': (case_figure, 80),
+}
+
+
+def measure(run, repeat, min_time):
+    """Per-call seconds of `repeat` samples, each looping until `min_time`."""
+    run()  # warm-up: imports, caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - start) / number)
+    return number, samples
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change against `baseline`; return the names of regressed cases."""
+    regressed = []
+    for name, result in results.items():
+        before = baseline.get('cases', {}).get(name)
+        if before is None:
+            continue
+        ratio = result['median'] / before['median']
+        flag = ratio > 1 + threshold
+        if flag:
+            regressed.append(name)
+        print(f"  {name:<18} {before['median'] * 1000:10.3f} -> {result['median'] * 1000:10.3f} ms "
+              f"({ratio - 1:+.0%}){'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', '--filter', help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per sample')
+    parser.add_argument('--output', '-o', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown flagged as a regression')
+    parser.add_argument('--skip-golden', action='store_true')
+    args = parser.parse_args()
+
+    if not args.skip_golden:
+        failed = [check for check, error in golden.run_checks() if error > 1e-9]
+        if failed:
+            print(f"Golden-value checks failed: {', '.join(failed)}")
+            sys.exit(1)
+        print("Golden-value checks passed")
+
+    results = {}
+    for name, (factory, size) in CASES.items():
+        if args.filter and args.filter not in name:
+            continue
+        number, samples = measure(factory(size), args.repeat, args.min_time)
+        results[name] = {
+            'median': statistics.median(samples),
+            'min': min(samples),
+            'samples': samples,
+            'loops': number,
+        }
+        print(f"{name:<18} median {results[name]['median'] * 1000:10.3f} ms, "
+              f"min {results[name]['min'] * 1000:10.3f} ms ({args.repeat} x {number} loops)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'cases': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} (commit {baseline.get('environment', {}).get('commit')}):")
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"{len(regressed)} regression(s) over {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,569 +1,1071 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
 import numpy as np
+import os
+import uuid
 
-# Translations dictionary
-translations = {
-    'en': {
-        'page_title': 'Retirement Calculator',
-        'page_icon': '📈',
-        'main_title': '📈 Retirement Calculator',
-        'sidebar_options': '⚙️ Options',
-        'language_select': 'Select Language:',
-        'current_age': 'Enter your current age:',
-        'retirement_age': 'Enter the age you plan to retire:',
-        'income_params': '💰 Income Parameters',
-        'current_savings': 'Current savings (USD):',
-        'current_savings_help': 'Amount you already have saved',
-        'monthly_income': 'Current monthly net income (USD):',
-        'monthly_income_help': 'Monthly income including bonuses, tax refunds, etc.',
-        'income_growth': 'Expected income growth (% annually):',
-        'income_growth_help': 'Average annual income growth (e.g., promotions, wage inflation)',
-        'expense_params': '🏠 Expense Parameters',
-        'monthly_expenses': 'Current monthly expenses (USD):',
-        'monthly_expenses_help': 'All monthly living costs',
-        'investment_params': '📈 Investment Parameters',
-        'annual_return': 'Expected annual return (%):',
-        'annual_return_help': 'Average annual return on investments',
-        'inflation_rate': 'Inflation rate (%):',
-        'inflation_help': 'Expected average annual inflation (expense growth)',
-        'capital_forecast': '📊 Capital Growth Forecast',
-        'monthly_surplus': '💰 **Current monthly surplus for savings:**',
-        'age_col': 'Age',
-        'annual_income_col': 'Annual Income',
-        'annual_expenses_col': 'Annual Expenses',
-        'annual_contribution_col': 'Annual Contribution',
-        'nominal_value_col': 'Nominal Value',
-        'real_value_col': 'Real Value',
-        'detailed_data': '📋 Detailed Data',
-        'summary': '📈 Summary',
-        'retirement_capital': 'Retirement Capital',
-        'real_value': 'Real Value',
-        'total_contributions': 'Total Contributions',
-        'avg_annual_contribution': 'Average Annual Contribution',
-        'investment_gain': 'Investment Gain',
-        'additional_info': '💡 Additional Information',
-        'retirement_year_info': '**In retirement year ({} years old):**',
-        'income_label': 'Income',
-        'expenses_label': 'Expenses',
-        'surplus_label': 'Surplus',
-        'monthly_pension_4pct': '**Monthly pension (4% rule):**',
-        'current_purchasing_power': '**This equals today:**',
-        'expense_coverage': '**Coverage of current expenses:**',
-        'doubling_time': '**Capital doubling time:**',
-        'retirement_tips': '💡 Retirement Tips',
-        'rule_4pct_title': '🎯 4% Rule',
-        'rule_4pct_desc': 'Safe annual withdrawal is 4% of accumulated capital. This means you need 25x your annual expenses.',
-        'diversification_title': '📊 Diversification',
-        'diversification_desc': 'Spread investments across different asset classes: stocks, bonds, real estate, commodities.',
-        'time_money_title': '⏰ Time is Money',
-        'time_money_desc': 'The earlier you start, the more you benefit from compound interest. Every year matters!',
-        'error_age': '⚠️ Retirement age must be higher than current age!',
-        'error_no_surplus': '⚠️ Current expenses exceed income! No surplus for savings.',
-        'nominal_value_chart': 'Nominal Value',
-        'real_value_chart': 'Real Value (after inflation)',
-        'chart_title': 'Retirement Capital Growth ({} years)',
-        'chart_age': 'Age',
-        'chart_value': 'Value (USD)',
-        'chart_hover_age': 'Age',
-        'chart_hover_value': 'Value',
-        'chart_hover_real_value': 'Real Value',
-        'currency': 'USD',
-        'years_suffix': 'years',
-        'purchasing_power': 'purchasing power'
-    },
-    'pl': {
-        'page_title': 'Kalkulator emerytalny',
-        'page_icon': '📈',
-        'main_title': '📈 Kalkulator emerytalny',
-        'sidebar_options': '⚙️ Opcje',
-        'language_select': 'Wybierz język:',
-        'current_age': 'Podaj swój obecny wiek:',
-        'retirement_age': 'Podaj wiek, w którym planujesz przejść na emeryturę:',
-        'income_params': '💰 Parametry dochodowe',
-        'current_savings': 'Obecne oszczędności (PLN):',
-        'current_savings_help': 'Kwota, którą już masz zaoszczędzoną',
-        'monthly_income': 'Obecne miesięczne wynagrodzenie netto (PLN):',
-        'monthly_income_help': 'Miesięczne wynagrodzenie uwzględniające premie, zwroty podatku itp.',
-        'income_growth': 'Prognozowany wzrost wynagrodzenia (% rocznie):',
-        'income_growth_help': 'Średni roczny wzrost wynagrodzenia (np. awanse, inflacja płac)',
-        'expense_params': '🏠 Parametry wydatków',
-        'monthly_expenses': 'Obecne miesięczne wydatki (PLN):',
-        'monthly_expenses_help': 'Wszystkie miesięczne koszty życia',
-        'investment_params': '📈 Parametry inwestycyjne',
-        'annual_return': 'Oczekiwany roczny zwrot (%):',
-        'annual_return_help': 'Średni roczny zwrot z inwestycji',
-        'inflation_rate': 'Stopa inflacji (%):',
-        'inflation_help': 'Oczekiwana średnia roczna inflacja (wzrost wydatków)',
-        'capital_forecast': '📊 Prognoza wzrostu kapitału',
-        'monthly_surplus': '💰 **Obecna miesięczna nadwyżka do oszczędzania:**',
-        'age_col': 'Wiek',
-        'annual_income_col': 'Roczny dochód',
-        'annual_expenses_col': 'Roczne wydatki',
-        'annual_contribution_col': 'Roczna wpłata',
-        'nominal_value_col': 'Wartość nominalna',
-        'real_value_col': 'Wartość realna',
-        'detailed_data': '📋 Szczegółowe dane',
-        'summary': '📈 Podsumowanie',
-        'retirement_capital': 'Kapitał na emeryturze',
-        'real_value': 'Wartość realna',
-        'total_contributions': 'Całkowite wpłaty',
-        'avg_annual_contribution': 'Średnia roczna wpłata',
-        'investment_gain': 'Zysk z inwestycji',
-        'additional_info': '💡 Dodatkowe informacje',
-        'retirement_year_info': '**W roku emerytury ({} lat):**',
-        'income_label': 'Dochód',
-        'expenses_label': 'Wydatki',
-        'surplus_label': 'Nadwyżka',
-        'monthly_pension_4pct': '**Miesięczna emerytura (4% reguła):**',
-        'current_purchasing_power': '**To odpowiada dzisiaj:**',
-        'expense_coverage': '**Pokrycie obecnych wydatków:**',
-        'doubling_time': '**Czas podwojenia kapitału:**',
-        'retirement_tips': '💡 Porady emerytalne',
-        'rule_4pct_title': '🎯 Zasada 4%',
-        'rule_4pct_desc': 'Bezpieczna roczna wypłata to 4% zgromadzonego kapitału. To oznacza, że potrzebujesz 25x swoich rocznych wydatków.',
-        'diversification_title': '📊 Dywersyfikacja',
-        'diversification_desc': 'Rozłóż inwestycje między różne klasy aktywów: akcje, obligacje, nieruchomości, surowce.',
-        'time_money_title': '⏰ Czas to pieniądz',
-        'time_money_desc': 'Im wcześniej zaczniesz, tym więcej skorzystasz z procentu składanego. Każdy rok ma znaczenie!',
-        'error_age': '⚠️ Wiek przejścia na emeryturę musi być wyższy niż obecny wiek!',
-        'error_no_surplus': '⚠️ Obecne wydatki przewyższają dochody! Nie ma nadwyżki do oszczędzania.',
-        'nominal_value_chart': 'Wartość nominalna',
-        'real_value_chart': 'Wartość realna (po inflacji)',
-        'chart_title': 'Wzrost kapitału emerytalnego ({} lat)',
-        'chart_age': 'Wiek',
-        'chart_value': 'Wartość (PLN)',
-        'chart_hover_age': 'Wiek',
-        'chart_hover_value': 'Wartość',
-        'chart_hover_real_value': 'Wartość realna',
-        'currency': 'PLN',
-        'years_suffix': 'lat',
-        'purchasing_power': 'siły nabywczej'
-    },
-    'zh': {
-        'page_title': '退休计算器',
-        'page_icon': '📈',
-        'main_title': '📈 退休计算器',
-        'sidebar_options': '⚙️ 选项',
-        'language_select': '选择语言:',
-        'current_age': '请输入您的当前年龄:',
-        'retirement_age': '请输入您计划退休的年龄:',
-        'income_params': '💰 收入参数',
-        'current_savings': '当前储蓄 (CNY):',
-        'current_savings_help': '您已经储蓄的金额',
-        'monthly_income': '当前月净收入 (CNY):',
-        'monthly_income_help': '月收入包括奖金、退税等',
-        'income_growth': '预期收入增长率 (% 每年):',
-        'income_growth_help': '平均年收入增长率（如升职、工资通胀）',
-        'expense_params': '🏠 支出参数',
-        'monthly_expenses': '当前月支出 (CNY):',
-        'monthly_expenses_help': '所有月生活费用',
-        'investment_params': '📈 投资参数',
-        'annual_return': '预期年回报率 (%):',
-        'annual_return_help': '投资的平均年回报率',
-        'inflation_rate': '通胀率 (%):',
-        'inflation_help': '预期平均年通胀率（支出增长）',
-        'capital_forecast': '📊 资本增长预测',
-        'monthly_surplus': '💰 **当前月储蓄余额:**',
-        'age_col': '年龄',
-        'annual_income_col': '年收入',
-        'annual_expenses_col': '年支出',
-        'annual_contribution_col': '年投入',
-        'nominal_value_col': '名义价值',
-        'real_value_col': '实际价值',
-        'detailed_data': '📋 详细数据',
-        'summary': '📈 摘要',
-        'retirement_capital': '退休资本',
-        'real_value': '实际价值',
-        'total_contributions': '总投入',
-        'avg_annual_contribution': '平均年投入',
-        'investment_gain': '投资收益',
-        'additional_info': '💡 附加信息',
-        'retirement_year_info': '**在退休年份（{}岁）:**',
-        'income_label': '收入',
-        'expenses_label': '支出',
-        'surplus_label': '余额',
-        'monthly_pension_4pct': '**月退休金（4%规则）:**',
-        'current_purchasing_power': '**相当于今天:**',
-        'expense_coverage': '**当前支出覆盖率:**',
-        'doubling_time': '**资本翻倍时间:**',
-        'retirement_tips': '💡 退休建议',
-        'rule_4pct_title': '🎯 4%规则',
-        'rule_4pct_desc': '安全的年提取率是累积资本的4%。这意味着您需要25倍的年支出。',
-        'diversification_title': '📊 多元化',
-        'diversification_desc': '将投资分散到不同的资产类别：股票、债券、房地产、大宗商品。',
-        'time_money_title': '⏰ 时间就是金钱',
-        'time_money_desc': '越早开始，就越能从复利中受益。每一年都很重要！',
-        'error_age': '⚠️ 退休年龄必须高于当前年龄！',
-        'error_no_surplus': '⚠️ 当前支出超过收入！没有储蓄余额。',
-        'nominal_value_chart': '名义价值',
-        'real_value_chart': '实际价值（扣除通胀）',
-        'chart_title': '退休资本增长（{}年）',
-        'chart_age': '年龄',
-        'chart_value': '价值 (CNY)',
-        'chart_hover_age': '年龄',
-        'chart_hover_value': '价值',
-        'chart_hover_real_value': '实际价值',
-        'currency': 'CNY',
-        'years_suffix': '年',
-        'purchasing_power': '购买力'
-    }
-}
-
-# Language selection
-language = st.selectbox(
-    'Select Language / Wybierz język / 选择语言:',
-    options=['en', 'pl', 'zh'],
-    format_func=lambda x: {'en': 'English', 'pl': 'Polski', 'zh': '中文'}[x],
-    index=0
+from pension_calculator import (
+    IncrementalSimulation,
+    earliest_retirement_age,
+    growth_factors,
+    project,
+    project_steps,
+    required_expenses,
+    required_return,
+    sensitivity_grid,
+    simulate,
+    summarize,
+    to_annual,
+    tornado,
+    withdraw,
 )
+from pension_calculator.accounts import TAX_PRESETS, project_accounts
+from pension_calculator.analytics import MAX_FI_YEARS, doubling_time, money_weighted_return, savings_rates, years_to_fi
+from pension_calculator.downsample import lttb
+from pension_calculator.history import DEFAULT_PATH as HISTORY_DEFAULT_PATH, backtest, load_history
+from pension_calculator.scenarios import DEFAULT_PATH as SCENARIO_DEFAULT_PATH, ScenarioStore
+from pension_calculator.timing import RenderTimer
+from pension_calculator.translations import LANGUAGE_NAMES, default_values, translations
+
+# Numeric results are cached across reruns and sessions, keyed on the inputs
+# only; everything language dependent is built on top of them on each rerun.
+CACHE_MAX_ENTRIES = int(os.environ.get('PENSION_CACHE_MAX_ENTRIES', '256'))
+CACHE_TTL = float(os.environ['PENSION_CACHE_TTL']) if os.environ.get('PENSION_CACHE_TTL') else None  # seconds
+
+# Opt-in timing of the render stages, shown in the sidebar: PENSION_DEBUG=1 or
+# ?debug=1 in the URL. cProfile dumps per rerun are only written when the
+# server sets PENSION_PROFILE_DIR, never from a URL parameter.
+PROFILE_DIR = os.environ.get('PENSION_PROFILE_DIR')
+DEBUG_TIMING = os.environ.get('PENSION_DEBUG') == '1' or bool(PROFILE_DIR)
+
+# Yearly stock/bond/inflation history for backtests, built with
+# `python -m pension_calculator history`; the backtest is off without it
+HISTORY_PATH = os.environ.get('PENSION_HISTORY_PATH', HISTORY_DEFAULT_PATH)
+
+# Monte Carlo runs up to this many paths reuse the arrays of the session's
+# previous rerun (IncrementalSimulation); larger runs go through the cache.
+# Each session then holds five (years x paths) float64 arrays; over the
+# longest horizon of the sidebar (age 18 to 110, 93 rows) that is at most
+# 37 MB per session at 10,000 paths. Lower it on shared servers
+INCREMENTAL_MAX_PATHS = int(os.environ.get('PENSION_INCREMENTAL_MAX_PATHS', '10000'))
+
+# Rows of the detailed data table sent to the browser at once
+TABLE_PAGE_SIZE = 500
+
+# Longer series are downsampled (LTTB) before they are drawn
+CHART_MAX_POINTS = 1000
+
+# Saved scenarios drawn over the current one at most
+MAX_COMPARED_SCENARIOS = 5
+
+# Rates covered by the sensitivity grid, matching the slider ranges
+SENSITIVITY_RETURNS = np.round(np.arange(0, 150.5) / 10, 1)
+SENSITIVITY_INFLATION = np.round(np.arange(0, 100.5) / 10, 1)
+SENSITIVITY_INCOME_GROWTH = np.round(np.arange(0, 100.5) / 10, 1)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_projection(current_age, retirement_age, current_savings, monthly_income,
+                      income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                      steps_per_year=1):
+    """Yearly projection and summary, plus the step-by-step path (or None)."""
+    inputs = (current_age, retirement_age, current_savings, monthly_income,
+              income_growth_rate, monthly_expenses, annual_return, inflation_rate)
+    if steps_per_year == 1:
+        projection = project(*inputs)
+        path = None
+    else:
+        # Monthly/daily compounding; the yearly rows are aggregated from the steps
+        steps = project_steps(*inputs, steps_per_year=steps_per_year)
+        projection = to_annual(steps, current_age, current_savings, monthly_income, monthly_expenses)
+        path = (
+            np.concatenate([[current_age], steps.ages]),
+            np.concatenate([[current_savings], steps.nominal_value]),
+            np.concatenate([[current_savings], steps.real_value]),
+        )
+    return projection, summarize(projection, current_savings), path
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_sensitivity_grid(*args):
+    return sensitivity_grid(*args)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_withdrawals(*args, **kwargs):
+    return withdraw(*args, **kwargs)
+
 
-# Get current language translations
-t = translations[language]
-
-# Default values based on language/region
-default_values = {
-    'en': {
-        'current_savings': 71000,
-        'monthly_income': 12833,
-        'monthly_expenses': 6500,
-        'income_growth': 6.5,
-        'annual_return': 6.0,
-        'inflation_rate': 3.5
-    },
-    'pl': {
-        'current_savings': 71000,
-        'monthly_income': 12833,
-        'monthly_expenses': 6500,
-        'income_growth': 6.5,
-        'annual_return': 6.0,
-        'inflation_rate': 3.5
-    },
-    'zh': {
-        'current_savings': 71000,
-        'monthly_income': 12833,
-        'monthly_expenses': 6500,
-        'income_growth': 6.5,
-        'annual_return': 6.0,
-        'inflation_rate': 3.5
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_simulation(*args, **kwargs):
+    return simulate(*args, **kwargs)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_accounts(*args, preset):
+    return project_accounts(*args, accounts=TAX_PRESETS[preset])
+
+
+@st.cache_resource(show_spinner=False)
+def history_data(path, modified):
+    """The memory-mapped dataset, mapped again when its modification time changes."""
+    return load_history(path)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_backtest(path, modified, *args, **kwargs):
+    return backtest(*args, history=history_data(path, modified), **kwargs)
+
+
+@st.cache_resource(show_spinner=False)
+def scenario_store():
+    return ScenarioStore(os.environ.get('PENSION_SCENARIO_DB', SCENARIO_DEFAULT_PATH))
+
+
+def scenario_owner():
+    """Whose scenarios this session sees in the shared store.
+
+    Signed-in users (st.login) keep their scenarios across sessions; without
+    sign-in they belong to the browser session and can't be reopened later.
+    """
+    if st.user.get('is_logged_in'):
+        return f"user:{st.user.get('sub') or st.user.get('email')}"
+    if 'scenario_owner' not in st.session_state:
+        st.session_state.scenario_owner = f"session:{uuid.uuid4().hex}"
+    return st.session_state.scenario_owner
+
+
+def money_columns(columns, currency):
+    """Column config showing whole amounts in the browser's locale, with the currency in the header."""
+    return {
+        column: st.column_config.NumberColumn(f"{column} ({currency})", format='localized', step=1)
+        for column in columns
     }
-}
 
-defaults = default_values[language]
 
-# Page configuration
-st.set_page_config(
-    page_title=t['page_title'],
-    page_icon=t['page_icon'],
-    layout="wide"
-)
+timer = RenderTimer(DEBUG_TIMING or st.query_params.get('debug') == '1', profile_dir=PROFILE_DIR)
 
-# Main title
-st.title(t['main_title'])
-st.markdown("---")
+try:
+    # Language selection
+    language = st.selectbox(
+        'Select Language / Wybierz język / 选择语言:',
+        options=['en', 'pl', 'zh'],
+        format_func=lambda x: LANGUAGE_NAMES[x],
+        index=0
+    )
 
-# Sidebar with options
-st.sidebar.header(t['sidebar_options'])
+    # Get current language translations
+    t = translations[language]
+    defaults = default_values[language]
 
-# Current age selection
-current_age = st.sidebar.selectbox(
-    t['current_age'],
-    options=list(range(18, 100)),
-    index=14  # default 32 years old
-)
+    # Page configuration
+    st.set_page_config(
+        page_title=t['page_title'],
+        page_icon=t['page_icon'],
+        layout="wide"
+    )
 
-# Retirement age selection
-retirement_age = st.sidebar.selectbox(
-    t['retirement_age'],
-    options=list(range(50, 80)),
-    index=10  # default 65 years old
-)
+    # Main title
+    st.title(t['main_title'])
+    st.markdown("---")
 
-# Additional parameters in sidebar
-st.sidebar.markdown("---")
-st.sidebar.subheader(t['income_params'])
+    # Sidebar with options
+    st.sidebar.header(t['sidebar_options'])
 
-current_savings = st.sidebar.number_input(
-    t['current_savings'],
-    min_value=0,
-    value=defaults['current_savings'],
-    step=500,
-    help=t['current_savings_help']
-)
+    # Current age selection
+    current_age = st.sidebar.selectbox(
+        t['current_age'],
+        options=list(range(18, 100)),
+        index=14  # default 32 years old
+    )
 
-monthly_income = st.sidebar.number_input(
-    t['monthly_income'],
-    min_value=0,
-    value=defaults['monthly_income'],
-    step=500,
-    help=t['monthly_income_help']
-)
+    # Retirement age selection
+    retirement_age = st.sidebar.selectbox(
+        t['retirement_age'],
+        options=list(range(50, 80)),
+        index=10  # default 65 years old
+    )
 
-income_growth_rate = st.sidebar.slider(
-    t['income_growth'],
-    min_value=0.0,
-    max_value=10.0,
-    value=defaults['income_growth'],
-    step=0.1,
-    help=t['income_growth_help']
-)
+    # Additional parameters in sidebar
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['income_params'])
 
-st.sidebar.markdown("---")
-st.sidebar.subheader(t['expense_params'])
+    current_savings = st.sidebar.number_input(
+        t['current_savings'],
+        min_value=0,
+        value=defaults['current_savings'],
+        step=500,
+        help=t['current_savings_help']
+    )
 
-monthly_expenses = st.sidebar.number_input(
-    t['monthly_expenses'],
-    min_value=0,
-    value=defaults['monthly_expenses'],
-    step=500,
-    help=t['monthly_expenses_help']
-)
+    monthly_income = st.sidebar.number_input(
+        t['monthly_income'],
+        min_value=0,
+        value=defaults['monthly_income'],
+        step=500,
+        help=t['monthly_income_help']
+    )
 
-st.sidebar.markdown("---")
-st.sidebar.subheader(t['investment_params'])
+    income_growth_rate = st.sidebar.slider(
+        t['income_growth'],
+        min_value=0.0,
+        max_value=10.0,
+        value=defaults['income_growth'],
+        step=0.1,
+        help=t['income_growth_help']
+    )
 
-annual_return = st.sidebar.slider(
-    t['annual_return'],
-    min_value=0.0,
-    max_value=15.0,
-    value=defaults['annual_return'],
-    step=0.1,
-    help=t['annual_return_help']
-)
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['expense_params'])
 
-inflation_rate = st.sidebar.slider(
-    t['inflation_rate'],
-    min_value=0.0,
-    max_value=10.0,
-    value=defaults['inflation_rate'],
-    step=0.1,
-    help=t['inflation_help']
-)
+    monthly_expenses = st.sidebar.number_input(
+        t['monthly_expenses'],
+        min_value=0,
+        value=defaults['monthly_expenses'],
+        step=500,
+        help=t['monthly_expenses_help']
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['investment_params'])
+
+    annual_return = st.sidebar.slider(
+        t['annual_return'],
+        min_value=0.0,
+        max_value=15.0,
+        value=defaults['annual_return'],
+        step=0.1,
+        help=t['annual_return_help']
+    )
+
+    inflation_rate = st.sidebar.slider(
+        t['inflation_rate'],
+        min_value=0.0,
+        max_value=10.0,
+        value=defaults['inflation_rate'],
+        step=0.1,
+        help=t['inflation_help']
+    )
+
+    steps_per_year = st.sidebar.radio(
+        t['time_step'],
+        options=[1, 12, 365],
+        format_func=lambda x: t[f'time_step_{x}'],
+        horizontal=True,
+        help=t['time_step_help']
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['retirement_phase'])
+
+    life_expectancy = st.sidebar.slider(
+        t['life_expectancy'],
+        min_value=retirement_age + 1,
+        max_value=110,
+        value=max(90, retirement_age + 1),
+        step=1,
+        help=t['life_expectancy_help']
+    )
+
+    withdrawal_strategy = st.sidebar.selectbox(
+        t['withdrawal_strategy'],
+        options=['constant_real', 'fixed_percentage', 'guardrails', 'vpw'],
+        format_func=lambda x: t[f'strategy_{x}'],
+        help=t['withdrawal_strategy_help']
+    )
+
+    withdrawal_rate = st.sidebar.slider(
+        t['withdrawal_rate'],
+        min_value=1.0,
+        max_value=10.0,
+        value=4.0,
+        step=0.1,
+        help=t['withdrawal_rate_help']
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['tax_params'])
+
+    # The accounts and limits of the country of the selected language, in its currency
+    tax_enabled = st.sidebar.checkbox(
+        t['tax_enable'],
+        value=False,
+        help=t['tax_enable_help']
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['monte_carlo_params'])
+
+    monte_carlo_enabled = st.sidebar.checkbox(
+        t['monte_carlo_enable'],
+        value=False,
+        help=t['monte_carlo_enable_help']
+    )
+
+    if monte_carlo_enabled:
+        return_volatility = st.sidebar.slider(
+            t['return_volatility'],
+            min_value=0.0,
+            max_value=30.0,
+            value=15.0,
+            step=0.5,
+            help=t['return_volatility_help']
+        )
+
+        inflation_volatility = st.sidebar.slider(
+            t['inflation_volatility'],
+            min_value=0.0,
+            max_value=5.0,
+            value=1.5,
+            step=0.1,
+            help=t['inflation_volatility_help']
+        )
+
+        simulation_paths = st.sidebar.selectbox(
+            t['simulation_paths'],
+            options=[1000, 10000, 100000],
+            index=1,
+            format_func=lambda x: f"{x:,}"
+        )
+
+        distribution = st.sidebar.radio(
+            t['distribution'],
+            options=['lognormal', 'normal'],
+            format_func=lambda x: t[f'distribution_{x}']
+        )
+
+        target_capital = st.sidebar.number_input(
+            t['target_capital'],
+            min_value=0,
+            value=monthly_expenses * 12 * 25,  # 4% rule on today's expenses
+            step=10000,
+            help=t['target_capital_help']
+        )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['backtest_params'])
+
+    history_available = os.path.exists(HISTORY_PATH)
+    backtest_enabled = st.sidebar.checkbox(
+        t['backtest_enable'],
+        value=False,
+        disabled=not history_available,
+        help=t['backtest_enable_help'] if history_available else t['backtest_missing'].format(HISTORY_PATH)
+    )
+
+    if backtest_enabled:
+        stock_allocation = st.sidebar.slider(
+            t['stock_allocation'],
+            min_value=0,
+            max_value=100,
+            value=60,
+            step=5,
+            help=t['stock_allocation_help']
+        )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(t['scenarios'])
+
+    scenario_name = st.sidebar.text_input(
+        t['scenario_name'],
+        value=t['scenario_default_name'].format(retirement_age, annual_return)
+    )
+    save_scenario = st.sidebar.button(t['scenario_save'], help=t['scenario_save_help'])
+
+    timer.lap('inputs')
+    timer.context.update(language=language, monte_carlo=monte_carlo_enabled, steps_per_year=steps_per_year)
 
-# Calculations
-years_to_retirement = retirement_age - current_age
+    # Calculations
+    years_to_retirement = retirement_age - current_age
 
-if years_to_retirement <= 0:
-    st.error(t['error_age'])
-else:
-    # Columns for main content
-    col1, col2 = st.columns([2, 1])
+    if years_to_retirement <= 0:
+        st.error(t['error_age'])
+    else:
+        # Columns for main content
+        col1, col2 = st.columns([2, 1])
     
-    with col1:
-        st.subheader(t['capital_forecast'])
-        
-        # Check if there's surplus for savings
-        current_monthly_surplus = monthly_income - monthly_expenses
-        
-        if current_monthly_surplus <= 0:
-            st.error(t['error_no_surplus'])
-            st.stop()
-        
-        # Display current surplus
-        st.info(f"{t['monthly_surplus']} {current_monthly_surplus:,.0f} {t['currency']}")
-        
-        # Calculations for each year
-        years = []
-        nominal_values = []
-        real_values = []
-        annual_contributions_list = []
-        annual_income_list = []
-        annual_expenses_list = []
+        with col1:
+            st.subheader(t['capital_forecast'])
         
-        current_value = current_savings
+            # Check if there's surplus for savings
+            current_monthly_surplus = monthly_income - monthly_expenses
         
-        for year in range(years_to_retirement + 1):
-            age = current_age + year
-            years.append(age)
-            
-            # Calculate income and expenses for given year
-            annual_income = monthly_income * 12 * ((1 + income_growth_rate/100) ** year)
-            annual_expenses = monthly_expenses * 12 * ((1 + inflation_rate/100) ** year)
-            annual_contribution = annual_income - annual_expenses
-            
-            annual_income_list.append(annual_income)
-            annual_expenses_list.append(annual_expenses)
-            annual_contributions_list.append(annual_contribution)
-            
-            if year > 0 and annual_contribution > 0:
-                # Apply investment return and add annual contributions
-                current_value = (current_value + annual_contribution) * (1 + annual_return/100)
-            elif year > 0:
-                # If no surplus, only investment return
-                current_value = current_value * (1 + annual_return/100)
-            
-            nominal_values.append(current_value)
-            # Real value (adjusted for inflation)
-            real_value = current_value / ((1 + inflation_rate/100) ** year)
-            real_values.append(real_value)
+            if current_monthly_surplus <= 0:
+                st.error(t['error_no_surplus'])
+                st.stop()
         
-        # Create DataFrame
-        df = pd.DataFrame({
-            t['age_col']: years,
-            t['annual_income_col']: annual_income_list,
-            t['annual_expenses_col']: annual_expenses_list,
-            t['annual_contribution_col']: annual_contributions_list,
-            t['nominal_value_col']: nominal_values,
-            t['real_value_col']: real_values
-        })
+            # Display current surplus
+            st.info(f"{t['monthly_surplus']} {current_monthly_surplus:,.0f} {t['currency']}")
         
-        # Plotly chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=df[t['age_col']],
-            y=df[t['nominal_value_col']],
-            mode='lines+markers',
-            name=t['nominal_value_chart'],
-            line=dict(color='#1f77b4', width=3),
-            marker=dict(size=6),
-            hovertemplate=f'{t["chart_hover_age"]}: %{{x}}<br>{t["chart_hover_value"]}: %{{y:,.0f}} {t["currency"]}<extra></extra>'
-        ))
+            # Calculations for the whole horizon
+            projection, summary, path = cached_projection(
+                current_age,
+                retirement_age,
+                current_savings,
+                monthly_income,
+                income_growth_rate,
+                monthly_expenses,
+                annual_return,
+                inflation_rate,
+                steps_per_year
+            )
+            timer.lap('projection')
+
+            if save_scenario:
+                scenario_store().save(scenario_owner(), scenario_name, dict(
+                    current_age=current_age,
+                    retirement_age=retirement_age,
+                    current_savings=current_savings,
+                    monthly_income=monthly_income,
+                    income_growth_rate=income_growth_rate,
+                    monthly_expenses=monthly_expenses,
+                    annual_return=annual_return,
+                    inflation_rate=inflation_rate,
+                    steps_per_year=steps_per_year
+                ), projection)
+                st.sidebar.success(t['scenario_saved'].format(scenario_name))
+
+            # Rendering libraries are only loaded once there is a chart and table to draw
+            import pandas as pd
+            import plotly.graph_objects as go
+            timer.lap('imports')
+
+            # Create DataFrame
+            df = pd.DataFrame({
+                t['age_col']: projection.ages,
+                t['annual_income_col']: projection.annual_income,
+                t['annual_expenses_col']: projection.annual_expenses,
+                t['annual_contribution_col']: projection.annual_contribution,
+                t['nominal_value_col']: projection.nominal_value,
+                t['real_value_col']: projection.real_value
+            })
+            timer.lap('dataframe')
+
+            # Monte Carlo paths around the deterministic forecast
+            if monte_carlo_enabled:
+                if simulation_paths <= INCREMENTAL_MAX_PATHS:
+                    if 'simulation' not in st.session_state:
+                        st.session_state.simulation = IncrementalSimulation()
+                    run_simulation = st.session_state.simulation.simulate
+                else:
+                    run_simulation = cached_simulation
+                simulation = run_simulation(
+                    current_age,
+                    retirement_age,
+                    current_savings,
+                    monthly_income,
+                    income_growth_rate,
+                    monthly_expenses,
+                    annual_return,
+                    inflation_rate,
+                    return_volatility=return_volatility,
+                    inflation_volatility=inflation_volatility,
+                    n_paths=simulation_paths,
+                    distribution=distribution,
+                    target=target_capital,
+                    seed=0,
+                    life_expectancy=life_expectancy,
+                    strategy=withdrawal_strategy,
+                    withdrawal_rate=withdrawal_rate / 100
+                )
+                timer.lap('monte_carlo')
+
+            # The plan over every historical period of the same length; success
+            # means the real capital funds today's expenses at the withdrawal rate
+            backtest_result = None
+            if backtest_enabled:
+                history_modified = os.path.getmtime(HISTORY_PATH)
+                history_years = len(history_data(HISTORY_PATH, history_modified))
+                backtest_target = monthly_expenses * 12 / (withdrawal_rate / 100)
+                if years_to_retirement > history_years:
+                    st.warning(t['backtest_too_long'].format(history_years))
+                else:
+                    backtest_result = cached_backtest(
+                        HISTORY_PATH,
+                        history_modified,
+                        current_age,
+                        retirement_age,
+                        current_savings,
+                        monthly_income,
+                        income_growth_rate,
+                        monthly_expenses,
+                        stock_allocation=stock_allocation,
+                        target=backtest_target
+                    )
+                timer.lap('backtest')
+
+            # The same surplus split over the preset's accounts, after taxes
+            if tax_enabled:
+                accounts = cached_accounts(
+                    current_age,
+                    retirement_age,
+                    current_savings,
+                    monthly_income,
+                    income_growth_rate,
+                    monthly_expenses,
+                    annual_return,
+                    inflation_rate,
+                    preset=defaults['tax_preset']
+                )
+                timer.lap('accounts')
+
+            # Withdrawals from the retirement capital up to the life expectancy
+            retirement = cached_withdrawals(
+                summary.final_nominal,
+                retirement_age,
+                life_expectancy,
+                annual_return,
+                inflation_rate,
+                strategy=withdrawal_strategy,
+                withdrawal_rate=withdrawal_rate / 100,
+                price_level=growth_factors(inflation_rate, years_to_retirement)
+            )
+            timer.lap('withdrawals')
         
-        fig.add_trace(go.Scatter(
-            x=df[t['age_col']],
-            y=df[t['real_value_col']],
-            mode='lines+markers',
-            name=t['real_value_chart'],
-            line=dict(color='#ff7f0e', width=3, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate=f'{t["chart_hover_age"]}: %{{x}}<br>{t["chart_hover_real_value"]}: %{{y:,.0f}} {t["currency"]}<extra></extra>'
-        ))
+            # Plotly chart, drawn with WebGL traces
+            fig = go.Figure()
+            hover_value = f'{t["chart_hover_age"]}: %{{x}}<br>{t["chart_hover_value"]}: %{{y:,.0f}} {t["currency"]}<extra></extra>'
+            hover_real_value = f'{t["chart_hover_age"]}: %{{x}}<br>{t["chart_hover_real_value"]}: %{{y:,.0f}} {t["currency"]}<extra></extra>'
+
+            for column, path_index, name, line, hovertemplate in [
+                (t['nominal_value_col'], 1, t['nominal_value_chart'],
+                 dict(color='#1f77b4', width=3), hover_value),
+                (t['real_value_col'], 2, t['real_value_chart'],
+                 dict(color='#ff7f0e', width=3, dash='dash'), hover_real_value)
+            ]:
+                if path is None:
+                    fig.add_trace(go.Scattergl(
+                        x=df[t['age_col']],
+                        y=df[column],
+                        mode='lines+markers',
+                        name=name,
+                        line=line,
+                        marker=dict(size=6),
+                        hovertemplate=hovertemplate
+                    ))
+                    continue
+                # Monthly/daily path as a downsampled line; hover and markers
+                # stay on the exact yearly values
+                shown = lttb(path[0], path[path_index], CHART_MAX_POINTS)
+                fig.add_trace(go.Scattergl(
+                    x=path[0][shown],
+                    y=path[path_index][shown],
+                    mode='lines',
+                    name=name,
+                    legendgroup=name,
+                    line=line,
+                    hoverinfo='skip'
+                ))
+                fig.add_trace(go.Scattergl(
+                    x=df[t['age_col']],
+                    y=df[column],
+                    mode='markers',
+                    name=name,
+                    legendgroup=name,
+                    showlegend=False,
+                    marker=dict(size=6, color=line['color']),
+                    hovertemplate=hovertemplate
+                ))
+
+            fig.add_trace(go.Scattergl(
+                x=retirement.ages,
+                y=retirement.balance[0],
+                mode='lines',
+                name=t['retirement_nominal_chart'],
+                line=dict(color='#1f77b4', width=2, dash='dot'),
+                hovertemplate=hover_value
+            ))
+
+            fig.add_trace(go.Scattergl(
+                x=retirement.ages,
+                y=retirement.real_balance[0],
+                mode='lines',
+                name=t['retirement_real_chart'],
+                line=dict(color='#ff7f0e', width=2, dash='dot'),
+                hovertemplate=hover_real_value
+            ))
+
+            if monte_carlo_enabled:
+                # P5-P95 bands as filled areas between the outer percentiles,
+                # continued through the retirement phase
+                band_ages = np.concatenate([simulation.ages, simulation.retirement_ages[1:]])
+                for bands, retirement_bands, name, color in [
+                    (simulation.nominal_bands, simulation.retirement_nominal_bands,
+                     t['mc_nominal_band_chart'], 'rgba(31, 119, 180, 0.15)'),
+                    (simulation.real_bands, simulation.retirement_real_bands,
+                     t['mc_real_band_chart'], 'rgba(255, 127, 14, 0.15)')
+                ]:
+                    bands = np.concatenate([bands, retirement_bands[:, 1:]], axis=1)
+                    fig.add_trace(go.Scattergl(
+                        x=band_ages,
+                        y=bands[-1],
+                        mode='lines',
+                        line=dict(width=0),
+                        legendgroup=name,
+                        showlegend=False,
+                        hoverinfo='skip'
+                    ))
+                    fig.add_trace(go.Scattergl(
+                        x=band_ages,
+                        y=bands[0],
+                        mode='lines',
+                        line=dict(width=0),
+                        fill='tonexty',
+                        fillcolor=color,
+                        name=name,
+                        legendgroup=name,
+                        hoverinfo='skip'
+                    ))
+
+            if tax_enabled:
+                fig.add_trace(go.Scattergl(
+                    x=accounts.ages,
+                    y=accounts.after_tax_real,
+                    mode='lines',
+                    name=t['after_tax_real_chart'],
+                    line=dict(color='#9467bd', width=2, dash='dash'),
+                    hovertemplate=hover_real_value
+                ))
+
+            if backtest_result is not None:
+                for window, label, color in [
+                    (backtest_result.worst_window, 'backtest_worst_chart', '#d62728'),
+                    (backtest_result.best_window, 'backtest_best_chart', '#2ca02c')
+                ]:
+                    start_year = backtest_result.start_years[window]
+                    fig.add_trace(go.Scattergl(
+                        x=backtest_result.ages,
+                        y=backtest_result.real_values[window],
+                        mode='lines',
+                        name=t[label].format(f"{start_year}–{start_year + years_to_retirement - 1}"),
+                        line=dict(color=color, width=2, dash='dashdot'),
+                        hovertemplate=hover_real_value
+                    ))
         
-        fig.update_layout(
-            title=t['chart_title'].format(years_to_retirement),
-            xaxis_title=t['chart_age'],
-            yaxis_title=t['chart_value'],
-            hovermode='x unified',
-            height=500,
-            showlegend=True,
-            legend=dict(
-                yanchor="top",
-                y=0.99,
-                xanchor="left",
-                x=0.01
+            fig.update_layout(
+                title=t['chart_title'].format(years_to_retirement),
+                xaxis_title=t['chart_age'],
+                yaxis_title=t['chart_value'],
+                hovermode='x unified',
+                height=500,
+                showlegend=True,
+                legend=dict(
+                    yanchor="top",
+                    y=0.99,
+                    xanchor="left",
+                    x=0.01
+                )
             )
-        )
         
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Data table
-        st.subheader(t['detailed_data'])
+            timer.lap('figure')
+            st.plotly_chart(fig, use_container_width=True)
+            timer.lap('chart_serialization')
+
+            # Sensitivity of the real capital to the rate assumptions
+            st.subheader(t['sensitivity'])
+            heatmap_tab, tornado_tab = st.tabs([t['sensitivity_heatmap_tab'], t['sensitivity_tornado_tab']])
+
+            with heatmap_tab:
+                # Only the slice at the current income growth is drawn
+                heatmap_growth = SENSITIVITY_INCOME_GROWTH[np.abs(SENSITIVITY_INCOME_GROWTH - income_growth_rate).argmin()]
+                grid = cached_sensitivity_grid(
+                    current_age,
+                    retirement_age,
+                    current_savings,
+                    monthly_income,
+                    monthly_expenses,
+                    SENSITIVITY_RETURNS,
+                    SENSITIVITY_INFLATION,
+                    [heatmap_growth]
+                )
+                timer.lap('sensitivity_grid')
+
+                heatmap = go.Figure(go.Heatmap(
+                    x=SENSITIVITY_INFLATION,
+                    y=SENSITIVITY_RETURNS,
+                    z=grid[:, :, 0],
+                    colorscale='Viridis',
+                    hovertemplate=f'{t["heatmap_inflation"]}: %{{x}}<br>{t["heatmap_return"]}: %{{y}}<br>{t["chart_hover_real_value"]}: %{{z:,.0f}} {t["currency"]}<extra></extra>'
+                ))
+                heatmap.add_trace(go.Scatter(
+                    x=[inflation_rate],
+                    y=[annual_return],
+                    mode='markers',
+                    marker=dict(color='white', size=12, symbol='x'),
+                    name=t['current_inputs'],
+                    hoverinfo='skip'
+                ))
+                heatmap.update_layout(
+                    title=t['heatmap_title'].format(heatmap_growth),
+                    xaxis_title=t['heatmap_inflation'],
+                    yaxis_title=t['heatmap_return'],
+                    height=450
+                )
+                st.plotly_chart(heatmap, use_container_width=True)
+                timer.lap('heatmap')
+
+            with tornado_tab:
+                bars = tornado(
+                    current_age,
+                    retirement_age,
+                    current_savings,
+                    monthly_income,
+                    income_growth_rate,
+                    monthly_expenses,
+                    annual_return,
+                    inflation_rate
+                )
+                labels = [t[f'param_{bar.parameter}'] for bar in bars][::-1]
+
+                tornado_fig = go.Figure()
+                for side, name, color in [('low', t['tornado_lower'], '#ff7f0e'), ('high', t['tornado_higher'], '#1f77b4')]:
+                    tornado_fig.add_trace(go.Bar(
+                        y=labels,
+                        x=[getattr(bar, side) - summary.final_real for bar in bars][::-1],
+                        orientation='h',
+                        name=name,
+                        marker_color=color,
+                        hovertemplate=f'%{{y}}: %{{x:+,.0f}} {t["currency"]}<extra></extra>'
+                    ))
+                tornado_fig.update_layout(
+                    title=t['tornado_title'],
+                    xaxis_title=t['chart_value'],
+                    barmode='overlay',
+                    height=400
+                )
+                st.plotly_chart(tornado_fig, use_container_width=True)
+                timer.lap('tornado')
         
-        # Format values in table
-        df_display = df.copy()
-        df_display[t['annual_income_col']] = df_display[t['annual_income_col']].apply(lambda x: f"{x:,.0f} {t['currency']}")
-        df_display[t['annual_expenses_col']] = df_display[t['annual_expenses_col']].apply(lambda x: f"{x:,.0f} {t['currency']}")
-        df_display[t['annual_contribution_col']] = df_display[t['annual_contribution_col']].apply(lambda x: f"{x:,.0f} {t['currency']}")
-        df_display[t['nominal_value_col']] = df_display[t['nominal_value_col']].apply(lambda x: f"{x:,.0f} {t['currency']}")
-        df_display[t['real_value_col']] = df_display[t['real_value_col']].apply(lambda x: f"{x:,.0f} {t['currency']}")
+            # Data table
+            st.subheader(t['detailed_data'])
         
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+            # Values stay numeric; the browser formats them with the column config
+            column_config = money_columns([
+                t['annual_income_col'],
+                t['annual_expenses_col'],
+                t['annual_contribution_col'],
+                t['nominal_value_col'],
+                t['real_value_col']
+            ], t['currency'])
+
+            # Long tables are sent to the browser one page at a time
+            df_display = df
+            if len(df) > TABLE_PAGE_SIZE:
+                page_count = -(-len(df) // TABLE_PAGE_SIZE)
+                page = st.number_input(t['table_page'].format(page_count), min_value=1, max_value=page_count, value=1)
+                df_display = df.iloc[(page - 1) * TABLE_PAGE_SIZE:page * TABLE_PAGE_SIZE]
+
+            st.dataframe(df_display, use_container_width=True, hide_index=True, column_config=column_config)
+            timer.lap('table')
+
+            # Saved scenarios over the current one; their arrays come from the store
+            st.subheader(t['scenario_compare'])
+            saved_names = dict(scenario_store().names(scenario_owner()))
+            compared = st.multiselect(
+                t['scenario_compare_select'],
+                options=list(saved_names),
+                format_func=saved_names.get,
+                max_selections=MAX_COMPARED_SCENARIOS,
+                placeholder=t['scenario_none'] if not saved_names else t['scenario_compare_placeholder']
+            )
+            if compared:
+                scenarios = scenario_store().load(scenario_owner(), compared)
+                comparison = go.Figure()
+                # Every row at the withdrawal rate of the slider
+                current_summary = summarize(projection, current_savings, withdrawal_rate / 100)
+                comparison_rows = {
+                    t['scenario_name']: [t['scenario_current']],
+                    t['scenario_retirement_age']: [retirement_age],
+                    t['retirement_capital']: [current_summary.final_nominal],
+                    t['real_value']: [current_summary.final_real],
+                    t['scenario_pension_real']: [current_summary.monthly_pension_real],
+                }
+                for name, ages, real_value, line in [
+                    (t['scenario_current'], projection.ages, projection.real_value, dict(color='#ff7f0e', width=3))
+                ] + [
+                    (scenario.name, scenario.projection.ages, scenario.projection.real_value, dict(width=2, dash='dot'))
+                    for scenario in scenarios
+                ]:
+                    comparison.add_trace(go.Scattergl(
+                        x=ages,
+                        y=real_value,
+                        mode='lines',
+                        name=name,
+                        line=line,
+                        hovertemplate=f'{name}<br>{t["chart_hover_age"]}: %{{x}}<br>{t["chart_hover_real_value"]}: %{{y:,.0f}} {t["currency"]}<extra></extra>'
+                    ))
+                for scenario in scenarios:
+                    scenario_summary = summarize(scenario.projection, scenario.inputs['current_savings'], withdrawal_rate / 100)
+                    comparison_rows[t['scenario_name']].append(scenario.name)
+                    comparison_rows[t['scenario_retirement_age']].append(scenario.inputs['retirement_age'])
+                    comparison_rows[t['retirement_capital']].append(scenario_summary.final_nominal)
+                    comparison_rows[t['real_value']].append(scenario_summary.final_real)
+                    comparison_rows[t['scenario_pension_real']].append(scenario_summary.monthly_pension_real)
+                comparison.update_layout(
+                    title=t['scenario_chart_title'],
+                    xaxis_title=t['chart_age'],
+                    yaxis_title=t['chart_value'],
+                    height=450
+                )
+                st.plotly_chart(comparison, use_container_width=True)
+                st.dataframe(
+                    comparison_rows,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config=money_columns(
+                        [t['retirement_capital'], t['real_value'], t['scenario_pension_real']], t['currency']
+                    )
+                )
+            timer.lap('scenarios')
     
-    with col2:
-        st.subheader(t['summary'])
+        with col2:
+            st.subheader(t['summary'])
         
-        final_nominal = nominal_values[-1]
-        final_real = real_values[-1]
-        total_contributions = current_savings + sum(annual_contributions_list[1:])  # Skip year 0
-        investment_gain = final_nominal - total_contributions
+            final_nominal = summary.final_nominal
+            final_real = summary.final_real
+            total_contributions = summary.total_contributions
+            investment_gain = summary.investment_gain
+            avg_annual_contribution = summary.avg_annual_contribution
         
-        # Average annual contribution (from years with positive contribution)
-        positive_contributions = [c for c in annual_contributions_list[1:] if c > 0]
-        avg_annual_contribution = sum(positive_contributions) / len(positive_contributions) if positive_contributions else 0
+            # Metrics
+            st.metric(
+                t['retirement_capital'],
+                f"{final_nominal:,.0f} {t['currency']}",
+                help="Wartość nominalna kapitału" if language == 'pl' else "Nominal capital value" if language == 'en' else "名义资本价值"
+            )
         
-        # Metrics
-        st.metric(
-            t['retirement_capital'],
-            f"{final_nominal:,.0f} {t['currency']}",
-            help="Wartość nominalna kapitału" if language == 'pl' else "Nominal capital value" if language == 'en' else "名义资本价值"
-        )
+            st.metric(
+                t['real_value'],
+                f"{final_real:,.0f} {t['currency']}",
+                help="Wartość skorygowana o inflację" if language == 'pl' else "Value adjusted for inflation" if language == 'en' else "通胀调整后的价值"
+            )
         
-        st.metric(
-            t['real_value'],
-            f"{final_real:,.0f} {t['currency']}",
-            help="Wartość skorygowana o inflację" if language == 'pl' else "Value adjusted for inflation" if language == 'en' else "通胀调整后的价值"
-        )
+            st.metric(
+                t['total_contributions'],
+                f"{total_contributions:,.0f} {t['currency']}",
+                help="Suma wszystkich wpłat przez lata" if language == 'pl' else "Sum of all contributions over the years" if language == 'en' else "多年来所有投入的总和"
+            )
         
-        st.metric(
-            t['total_contributions'],
-            f"{total_contributions:,.0f} {t['currency']}",
-            help="Suma wszystkich wpłat przez lata" if language == 'pl' else "Sum of all contributions over the years" if language == 'en' else "多年来所有投入的总和"
-        )
+            st.metric(
+                t['avg_annual_contribution'],
+                f"{avg_annual_contribution:,.0f} {t['currency']}",
+                help="Średnia z lat z dodatnią nadwyżką" if language == 'pl' else "Average from years with positive surplus" if language == 'en' else "有正余额年份的平均值"
+            )
         
-        st.metric(
-            t['avg_annual_contribution'],
-            f"{avg_annual_contribution:,.0f} {t['currency']}",
-            help="Średnia z lat z dodatnią nadwyżką" if language == 'pl' else "Average from years with positive surplus" if language == 'en' else "有正余额年份的平均值"
-        )
+            st.metric(
+                t['investment_gain'],
+                f"{investment_gain:,.0f} {t['currency']}",
+                help="Różnica między kapitałem a wpłatami" if language == 'pl' else "Difference between capital and contributions" if language == 'en' else "资本与投入之间的差额"
+            )
         
-        st.metric(
-            t['investment_gain'],
-            f"{investment_gain:,.0f} {t['currency']}",
-            help="Różnica między kapitałem a wpłatami" if language == 'pl' else "Difference between capital and contributions" if language == 'en' else "资本与投入之间的差额"
-        )
+            if tax_enabled:
+                st.markdown("---")
+                st.subheader(t['tax_results'])
+
+                st.metric(
+                    t['after_tax_capital'],
+                    f"{accounts.after_tax_nominal[-1]:,.0f} {t['currency']}",
+                    help=t['after_tax_capital_help']
+                )
+                st.metric(
+                    t['after_tax_real'],
+                    f"{accounts.after_tax_real[-1]:,.0f} {t['currency']}",
+                    help=t['after_tax_real_help']
+                )
+                after_tax_return = money_weighted_return(current_savings, accounts.saved, accounts.after_tax_nominal[-1])
+                if not np.isnan(after_tax_return):
+                    st.metric(t['after_tax_return'], f"{after_tax_return:.2f}%", help=t['after_tax_return_help'])
+                st.dataframe(
+                    {
+                        t['account_col']: [t[f'account_{account.kind}'] for account in accounts.accounts],
+                        t['account_cap_col']: [None if np.isinf(account.annual_cap) else account.annual_cap
+                                               for account in accounts.accounts],
+                        t['account_deposits_col']: accounts.deposits.sum(axis=1),
+                        t['account_balance_col']: accounts.balances[:, -1],
+                        t['account_after_tax_col']: accounts.balances[:, -1] * [
+                            1 - account.withdrawal_tax_rate for account in accounts.accounts
+                        ],
+                    },
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config=money_columns([t['account_cap_col'], t['account_deposits_col'],
+                                                 t['account_balance_col'], t['account_after_tax_col']],
+                                                t['currency'])
+                )
+
+            if monte_carlo_enabled:
+                st.markdown("---")
+                st.subheader(t['mc_results'])
+
+                nominal_percentiles = ' / '.join(f"{x:,.0f}" for x in simulation.nominal_bands[:, -1])
+                real_percentiles = ' / '.join(f"{x:,.0f}" for x in simulation.real_bands[:, -1])
+                st.info(f"{t['mc_percentiles']}\n{nominal_percentiles} {t['currency']}")
+                st.info(f"{t['mc_real_percentiles']}\n{real_percentiles} {t['currency']}")
+                st.info(f"{t['mc_success_probability']}\n{simulation.success_probability:.1%} "
+                        f"({target_capital:,.0f} {t['currency']})")
+                st.info(f"{t['mc_depletion_probability']}\n{simulation.depletion_probability:.1%}")
+
+            if backtest_result is not None:
+                st.markdown("---")
+                st.subheader(t['backtest_results'])
+
+                periods = len(backtest_result.start_years)
+                funded = int(round(backtest_result.success_rate * periods))
+                st.info(f"{t['backtest_success_rate']}\n{backtest_result.success_rate:.1%} "
+                        f"({t['backtest_periods'].format(funded, periods, backtest_target, t['currency'])})")
+                for window, label in [(backtest_result.worst_window, 'backtest_worst'),
+                                      (backtest_result.best_window, 'backtest_best')]:
+                    start_year = backtest_result.start_years[window]
+                    st.info(f"{t[label]}\n{start_year}–{start_year + years_to_retirement - 1}: "
+                            f"{backtest_result.final_real[window]:,.0f} {t['currency']}")
         
-        # Additional information
-        st.markdown("---")
-        st.subheader(t['additional_info'])
+            # Additional information
+            st.markdown("---")
+            st.subheader(t['additional_info'])
         
-        # Last contribution in retirement year
-        final_contribution = annual_contributions_list[-1]
-        final_income = annual_income_list[-1]
-        final_expenses = annual_expenses_list[-1]
+            # Last contribution in retirement year
+            final_contribution = projection.annual_contribution[-1]
+            final_income = projection.annual_income[-1]
+            final_expenses = projection.annual_expenses[-1]
         
-        st.info(f"{t['retirement_year_info'].format(retirement_age)}\n"
-                f"{t['income_label']}: {final_income:,.0f} {t['currency']}\n"
-                f"{t['expenses_label']}: {final_expenses:,.0f} {t['currency']}\n"
-                f"{t['surplus_label']}: {final_contribution:,.0f} {t['currency']}")
+            st.info(f"{t['retirement_year_info'].format(retirement_age)}\n"
+                    f"{t['income_label']}: {final_income:,.0f} {t['currency']}\n"
+                    f"{t['expenses_label']}: {final_expenses:,.0f} {t['currency']}\n"
+                    f"{t['surplus_label']}: {final_contribution:,.0f} {t['currency']}")
         
-        # Monthly pension (4% rule) - from nominal value
-        monthly_pension_nominal = (final_nominal * 0.04) / 12
-        # Monthly pension in real value (today's purchasing power)
-        monthly_pension_real = (final_real * 0.04) / 12
+            # Monthly pension (4% rule) - from nominal value
+            monthly_pension_nominal = summary.monthly_pension_nominal
+            # Monthly pension in real value (today's purchasing power)
+            monthly_pension_real = summary.monthly_pension_real
         
-        st.info(f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (w cenach z {current_age + years_to_retirement} roku)" if language == 'pl' 
-                else f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (in {current_age + years_to_retirement} year prices)" if language == 'en'
-                else f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (以{current_age + years_to_retirement}年价格计算)")
+            st.info(f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (w cenach z {current_age + years_to_retirement} roku)" if language == 'pl' 
+                    else f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (in {current_age + years_to_retirement} year prices)" if language == 'en'
+                    else f"{t['monthly_pension_4pct']}\n{monthly_pension_nominal:,.0f} {t['currency']} (以{current_age + years_to_retirement}年价格计算)")
         
-        # Comparison with today's purchasing power
-        st.info(f"{t['current_purchasing_power']}\n{monthly_pension_real:,.0f} {t['currency']} {t['purchasing_power']}")
+            # Comparison with today's purchasing power
+            st.info(f"{t['current_purchasing_power']}\n{monthly_pension_real:,.0f} {t['currency']} {t['purchasing_power']}")
         
-        # Comparison with current expenses
-        pension_coverage = (monthly_pension_real / monthly_expenses) * 100
-        st.info(f"{t['expense_coverage']}\n{pension_coverage:.1f}% ({monthly_pension_real:,.0f} {t['currency']} vs {monthly_expenses:,.0f} {t['currency']})")
+            # Comparison with current expenses
+            pension_coverage = (monthly_pension_real / monthly_expenses) * 100
+            st.info(f"{t['expense_coverage']}\n{pension_coverage:.1f}% ({monthly_pension_real:,.0f} {t['currency']} vs {monthly_expenses:,.0f} {t['currency']})")
         
-        # Capital doubling time
-        if annual_return > 0:
-            doubling_time = 72 / annual_return
-            st.info(f"{t['doubling_time']}\n{doubling_time:.1f} {t['years_suffix']}")
+            # Retirement phase with the chosen withdrawal strategy
+            depletion_age = retirement.depletion_age[0]
+            if np.isnan(depletion_age) or depletion_age >= life_expectancy:
+                st.info(f"{t['capital_lasts'].format(life_expectancy)}\n"
+                        f"{t['remaining_balance'].format(life_expectancy)} "
+                        f"{retirement.remaining_balance[0]:,.0f} {t['currency']} "
+                        f"({retirement.remaining_real_balance[0]:,.0f} {t['currency']} {t['purchasing_power']})")
+            else:
+                st.warning(f"{t['depletion_age']}\n{depletion_age:.0f}")
+
+            # Share of income saved, today and in the retirement year
+            first_rate, last_rate = savings_rates(monthly_income, income_growth_rate, monthly_expenses,
+                                                  inflation_rate, [0, years_to_retirement])
+            st.info(f"{t['savings_rate']}\n{t['savings_rate_value'].format(first_rate, last_rate)}")
+
+            # Years until withdrawals at the chosen rate cover that year's expenses
+            fi_years = years_to_fi(current_savings, monthly_income, income_growth_rate, monthly_expenses,
+                                   annual_return, inflation_rate, withdrawal_rate=withdrawal_rate / 100)[0]
+            st.info(f"{t['years_to_fi']}\n"
+                    + (t['years_to_fi_never'].format(MAX_FI_YEARS) if np.isnan(fi_years)
+                       else t['years_to_fi_value'].format(fi_years, current_age + fi_years)))
+
+            # Capital doubling time
+            if annual_return > 0:
+                st.info(f"{t['doubling_time']}\n{doubling_time(annual_return):.1f} {t['years_suffix']}")
 
-# Additional section with tips
-st.markdown("---")
-st.subheader(t['retirement_tips'])
+            timer.lap('summary')
 
-col1, col2, col3 = st.columns(3)
+            # Goal seek for a target monthly pension
+            st.markdown("---")
+            st.subheader(t['goal_seek'])
 
-with col1:
-    st.markdown(f"""
+            target_pension = st.number_input(
+                t['target_pension'],
+                min_value=0,
+                value=monthly_expenses,
+                step=500,
+                help=t['target_pension_help']
+            )
+            target_real = st.checkbox(t['target_pension_real'], value=True)
+
+            goal_inputs = dict(
+                current_age=current_age,
+                current_savings=current_savings,
+                monthly_income=monthly_income,
+                income_growth_rate=income_growth_rate,
+                inflation_rate=inflation_rate,
+                real=target_real,
+                withdrawal_rate=withdrawal_rate / 100
+            )
+
+            max_expenses = required_expenses(
+                target_pension, retirement_age=retirement_age, annual_return=annual_return, **goal_inputs
+            )
+            if max_expenses is None:
+                expenses_text = t['goal_unreachable']
+            elif np.isinf(max_expenses):
+                expenses_text = t['goal_met_by_savings']
+            else:
+                expenses_text = f"{max_expenses:,.0f} {t['currency']}"
+                if max_expenses < monthly_expenses:
+                    expense_cut = f"{monthly_expenses - max_expenses:,.0f} {t['currency']}"
+                    expenses_text += f" ({t['expense_cut'].format(expense_cut)})"
+            st.info(f"{t['max_monthly_expenses']}\n{expenses_text}")
+
+            return_needed = required_return(
+                target_pension, retirement_age=retirement_age, monthly_expenses=monthly_expenses, **goal_inputs
+            )
+            st.info(f"{t['required_return']}\n"
+                    + (t['goal_unreachable'] if return_needed is None else f"{return_needed:.2f}%"))
+
+            earliest_age = earliest_retirement_age(
+                target_pension, monthly_expenses=monthly_expenses, annual_return=annual_return, **goal_inputs
+            )
+            st.info(f"{t['earliest_retirement']}\n"
+                    + (t['goal_unreachable'] if earliest_age is None else f"{earliest_age}"))
+            timer.lap('goal_seek')
+
+    # Additional section with tips
+    st.markdown("---")
+    st.subheader(t['retirement_tips'])
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown(f"""
     **{t['rule_4pct_title']}**
     
     {t['rule_4pct_desc']}
     """)
 
-with col2:
-    st.markdown(f"""
+    with col2:
+        st.markdown(f"""
     **{t['diversification_title']}**
     
     {t['diversification_desc']}
     """)
 
-with col3:
-    st.markdown(f"""
+    with col3:
+        st.markdown(f"""
     **{t['time_money_title']}**
     
     {t['time_money_desc']}
     """)
+    timer.lap('tips')
+finally:
+    # However the rerun ends (st.stop(), an error, a newer rerun), so the
+    # profiler is never left enabled
+    timer.finish()
+
+# Timing breakdown of this rerun
+if timer.enabled:
+    with st.sidebar.expander(t['debug_timing'], expanded=True):
+        st.dataframe(
+            {t['debug_stage']: list(timer.laps), 'ms': [seconds * 1000 for seconds in timer.laps.values()]},
+            hide_index=True,
+            column_config={'ms': st.column_config.NumberColumn(format="%.1f")}
+        )
+        st.caption(t['debug_total'].format(timer.total * 1000))
+        if timer.profile_path:
+            st.caption(t['debug_profile'].format(timer.profile_path))
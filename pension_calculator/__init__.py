@@ -0,0 +1,93 @@
+"""Retirement calculator engine used by the Streamlit app in main.py."""
+from .accounts import (
+    TAX_PRESETS,
+    Account,
+    AccountBatchResult,
+    AccountProjection,
+    project_accounts,
+    project_accounts_batch,
+)
+from .analytics import (
+    MAX_FI_YEARS,
+    closed_form_summary,
+    doubling_time,
+    money_weighted_return,
+    savings_rates,
+    years_to_fi,
+)
+from .batch import PROFILE_COLUMNS, BatchResult, project_batch, project_frame
+from .decumulation import STRATEGIES, DecumulationResult, withdraw
+from .history import HISTORY_COLUMNS, BacktestResult, backtest, build_history, load_history
+from .incremental import IncrementalSimulation
+from .montecarlo import MonteCarloResult, simulate
+from .monthly import StepProjection, final_values_batch, project_monthly, project_steps, to_annual
+from .parallel import BookResult, simulate_book
+from .pipeline import PipelineStats, read_profile_chunks, run_pipeline
+from .projection import (
+    SAFE_WITHDRAWAL_RATE,
+    Projection,
+    Summary,
+    accumulate,
+    growth_factors,
+    project,
+    summarize,
+)
+from .scenarios import Scenario, ScenarioStore, scenario_key
+from .sensitivity import TornadoBar, sensitivity_grid, tornado
+from .solver import earliest_retirement_age, required_expenses, required_return
+
+__all__ = [
+    'HISTORY_COLUMNS',
+    'MAX_FI_YEARS',
+    'PROFILE_COLUMNS',
+    'STRATEGIES',
+    'TAX_PRESETS',
+    'Account',
+    'AccountBatchResult',
+    'AccountProjection',
+    'BacktestResult',
+    'BatchResult',
+    'BookResult',
+    'DecumulationResult',
+    'IncrementalSimulation',
+    'MonteCarloResult',
+    'PipelineStats',
+    'SAFE_WITHDRAWAL_RATE',
+    'Projection',
+    'Scenario',
+    'ScenarioStore',
+    'StepProjection',
+    'Summary',
+    'TornadoBar',
+    'accumulate',
+    'backtest',
+    'build_history',
+    'closed_form_summary',
+    'doubling_time',
+    'earliest_retirement_age',
+    'final_values_batch',
+    'growth_factors',
+    'load_history',
+    'money_weighted_return',
+    'project',
+    'project_accounts',
+    'project_accounts_batch',
+    'project_batch',
+    'project_frame',
+    'project_monthly',
+    'project_steps',
+    'read_profile_chunks',
+    'required_expenses',
+    'required_return',
+    'run_pipeline',
+    'savings_rates',
+    'scenario_key',
+    'sensitivity_grid',
+    'simulate',
+    'simulate_book',
+    'summarize',
+    'to_annual',
+    'tornado',
+    'withdraw',
+    'years_to_fi',
+]
@@ -0,0 +1,201 @@
+"""Contributions split over tax-advantaged and taxable accounts.
+
+project() invests the whole surplus in one untaxed pot. Here the surplus of
+every year fills the accounts of a preset in order, each up to its annual
+cap (in today's money, indexed with inflation); whatever is left after the
+last account with a cap goes to the uncapped one, or is not invested if
+there is none. An Account is described by four numbers:
+
+  * annual_cap: the most that can be deposited per year,
+  * deduction_rate: tax relief on deposits, so saving x of the surplus
+    deposits x / (1 - deduction_rate) (tax-deferred accounts),
+  * return_tax_rate: share of every year's return lost to tax (taxable
+    accounts, as if gains were realised yearly),
+  * withdrawal_tax_rate: tax on the balance when it is paid out.
+
+Current savings start in the first uncapped account, or in the last one
+when every account has a cap (caps limit deposits, not what is already
+saved). Accounts are evaluated together as (accounts x profiles x years)
+arrays with the closed form of accumulate(); the only Python loop is over
+the few accounts when splitting the surplus, so batches of profiles stay
+vectorized.
+
+TAX_PRESETS approximate the 2025 rules of the country of each language of
+the app, with a typical marginal income tax rate; they are a starting point
+for the projection, not tax advice.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .batch import _as_profile_arrays
+from .projection import growth_factors
+
+Account = namedtuple('Account', [
+    'kind',
+    'annual_cap',
+    'deduction_rate',
+    'return_tax_rate',
+    'withdrawal_tax_rate',
+])
+
+ACCOUNT_KINDS = ('taxable', 'tax_deferred', 'tax_free')
+
+TAX_PRESETS = {
+    # 401(k) at a 22% bracket, Roth IRA, brokerage account at 15% capital gains tax
+    'us': (
+        Account('tax_deferred', 23500.0, 0.22, 0.0, 0.22),
+        Account('tax_free', 7000.0, 0.0, 0.0, 0.0),
+        Account('taxable', np.inf, 0.0, 0.15, 0.0),
+    ),
+    # IKZE at the 12% PIT rate with 10% flat tax on payout, IKE, 19% "Belka" tax
+    'pl': (
+        Account('tax_deferred', 10407.6, 0.12, 0.0, 0.10),
+        Account('tax_free', 26019.0, 0.0, 0.0, 0.0),
+        Account('taxable', np.inf, 0.0, 0.19, 0.0),
+    ),
+    # Private pension scheme at a 10% bracket with 3% tax on payout; no tax on
+    # individual share gains
+    'cn': (
+        Account('tax_deferred', 12000.0, 0.10, 0.0, 0.03),
+        Account('taxable', np.inf, 0.0, 0.0, 0.0),
+    ),
+}
+
+# Profiles per chunk in project_accounts_batch(); the temporaries are
+# (accounts x profiles x years)
+DEFAULT_CHUNK_SIZE = 8192
+
+AccountProjection = namedtuple('AccountProjection', [
+    'ages',
+    'accounts',
+    'deposits',
+    'saved',
+    'balances',
+    'after_tax_nominal',
+    'after_tax_real',
+])
+
+AccountBatchResult = namedtuple('AccountBatchResult', [
+    'final_balances',
+    'total_deposits',
+    'after_tax_nominal',
+    'after_tax_real',
+])
+
+
+def _account_values(years, horizon, savings, income, income_growth, expenses,
+                    annual_return, inflation, accounts):
+    """Deposits and balances of every account, (accounts x profiles x years).
+
+    Profile inputs are 1-D arrays. Years past a profile's horizon neither
+    deposit nor grow, so the last column holds every profile's final values.
+    Also returns the (profiles x years) price level, frozen the same way.
+    """
+    active = years <= horizon[:, np.newaxis]
+    price_level = growth_factors(inflation[:, np.newaxis], np.minimum(years, horizon[:, np.newaxis]))
+    surplus = (income * 12)[:, np.newaxis] * growth_factors(income_growth[:, np.newaxis], years)
+    surplus -= (expenses * 12)[:, np.newaxis] * price_level
+    remaining = np.where(active, np.maximum(surplus, 0), 0.0)
+
+    # Fill the accounts in order; caps are in today's money
+    deposits = np.empty((len(accounts),) + remaining.shape)
+    for i, account in enumerate(accounts):
+        kept = 1 - account.deduction_rate
+        paid = np.minimum(remaining, account.annual_cap * kept * price_level)
+        remaining -= paid
+        deposits[i] = paid / kept
+    deposits[..., 0] = 0.0  # Year 0 is never invested
+
+    starting = np.zeros((len(accounts), savings.size))
+    uncapped = [i for i, account in enumerate(accounts) if np.isinf(account.annual_cap)]
+    starting[uncapped[0] if uncapped else -1] = savings
+
+    # Closed form of accumulate(): V[t] = P[t] * (S + sum_{k<=t} d[k] / P[k-1])
+    net_return = np.array([1 - account.return_tax_rate for account in accounts])[:, np.newaxis, np.newaxis]
+    growth = np.where(active, 1 + annual_return[:, np.newaxis] / 100 * net_return, 1.0)
+    growth[..., 0] = 1.0
+    cumulative = np.cumprod(growth, axis=-1)
+    invested = deposits.copy()
+    invested[..., 1:] /= cumulative[..., :-1]
+    balances = cumulative * (starting[..., np.newaxis] + np.cumsum(invested, axis=-1))
+    return deposits, balances, price_level
+
+
+def _after_tax(balances, accounts):
+    # Sum over the accounts of what is left after the withdrawal tax
+    kept = np.array([1 - account.withdrawal_tax_rate for account in accounts])
+    return np.tensordot(kept, balances, axes=1)
+
+
+def project_accounts(current_age, retirement_age, current_savings, monthly_income,
+                     income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                     accounts=TAX_PRESETS['us']):
+    """Project deposits and balances of every account up to retirement.
+
+    Same inputs as project(), plus the accounts filled in order. Returns an
+    AccountProjection with (accounts x years) deposits and nominal balances,
+    what the saver put in each year (the deposits less their tax relief)
+    and the yearly total after withdrawal taxes, nominal and in today's
+    prices.
+    """
+    horizon = max(retirement_age - current_age, 0)
+    years = np.arange(horizon + 1)
+    profile = _as_profile_arrays((current_savings, monthly_income, income_growth_rate,
+                                  monthly_expenses, annual_return, inflation_rate))
+    deposits, balances, price_level = _account_values(years, np.array([horizon]), *profile, accounts)
+    after_tax = _after_tax(balances[:, 0], accounts)
+    kept = np.array([1 - account.deduction_rate for account in accounts])
+    return AccountProjection(
+        ages=current_age + years,
+        accounts=tuple(accounts),
+        deposits=deposits[:, 0],
+        saved=np.tensordot(kept, deposits[:, 0], axes=1),
+        balances=balances[:, 0],
+        after_tax_nominal=after_tax,
+        after_tax_real=after_tax / price_level[0],
+    )
+
+
+def project_accounts_batch(current_age, retirement_age, current_savings, monthly_income,
+                           income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                           accounts=TAX_PRESETS['us'], chunk_size=DEFAULT_CHUNK_SIZE):
+    """Project N profiles given as columnar arrays (scalars broadcast).
+
+    Returns an AccountBatchResult with the final (profiles x accounts)
+    balances and total deposits, and the final capital after withdrawal
+    taxes, nominal and real. Profiles are chunked and padded by horizon
+    like project_batch().
+    """
+    (current_age, retirement_age, savings, income, income_growth,
+     expenses, annual_return, inflation) = _as_profile_arrays((
+        current_age, retirement_age, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    horizon = np.maximum(retirement_age - current_age, 0).astype(int)
+    n = horizon.size
+
+    final_balances = np.empty((n, len(accounts)))
+    total_deposits = np.empty((n, len(accounts)))
+    final_price_level = np.empty(n)
+
+    # Sort by horizon so each chunk pads to a similar length
+    order = np.argsort(horizon, kind='stable')
+    for start in range(0, n, chunk_size):
+        idx = order[start:start + chunk_size]
+        years = np.arange(horizon[idx[-1]] + 1)
+        deposits, balances, price_level = _account_values(
+            years, horizon[idx], savings[idx], income[idx], income_growth[idx],
+            expenses[idx], annual_return[idx], inflation[idx], accounts
+        )
+        final_balances[idx] = balances[..., -1].T
+        total_deposits[idx] = deposits.sum(axis=-1).T
+        final_price_level[idx] = price_level[:, -1]
+
+    after_tax = _after_tax(final_balances.T, accounts)
+    return AccountBatchResult(
+        final_balances=final_balances,
+        total_deposits=total_deposits,
+        after_tax_nominal=after_tax,
+        after_tax_real=after_tax / final_price_level,
+    )
@@ -0,0 +1,208 @@
+"""Summary metrics in closed form, for one profile or many.
+
+With constant rates every yearly amount of project() is a geometric series:
+the contribution of year k is 12 * income * a^k - 12 * expenses * b^k with
+a, b the income growth and inflation factors, so totals over any run of
+years are sums of powers. closed_form_summary() evaluates the summary of
+project_batch() from those sums, with no years axis at all. The difference
+of income and expenses divided by b^k is monotonic in k, so the years with
+a surplus (the only ones invested) are one run at the start or the end of
+the horizon, found from where the two series cross.
+
+Sums of powers are taken as q^first * expm1(n log q) / expm1(log q) and
+rates enter as log1p(rate), which stays accurate when q is close to 1
+(income growing about as fast as inflation, returns near zero), where
+(q^n - 1) / (q - 1) loses most of its digits.
+
+Metrics without a closed form are vectorized reductions over (profiles x
+years) arrays: the years until the capital covers the expenses under the
+withdrawal rate, and the money-weighted return (IRR) of any series of
+deposits, solved with Newton's method for all rows at once.
+"""
+import numpy as np
+
+from .batch import DEFAULT_CHUNK_SIZE, BatchResult, _as_profile_arrays
+from .projection import SAFE_WITHDRAWAL_RATE, accumulate, growth_factors
+
+# Years searched by years_to_fi()
+MAX_FI_YEARS = 100
+
+# Newton iterations of money_weighted_return(); it converges in a few
+MAX_ITERATIONS = 50
+
+
+def _power_sum(log_ratio, first, last):
+    """Sum of exp(k * log_ratio) for k = first..last, 0 for empty runs."""
+    count = np.maximum(last - first + 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio_sum = np.where(log_ratio == 0, count, np.expm1(count * log_ratio) / np.expm1(log_ratio))
+    return np.exp(first * log_ratio) * ratio_sum
+
+
+def _surplus_years(horizon, income, income_growth, expenses, inflation):
+    """First and last year in 1..horizon with a positive contribution.
+
+    first > last when there is none. The run is found from where
+    income * a^k and expenses * b^k cross, then checked against the
+    contributions of project() on either side of its ends.
+    """
+    def positive(year):
+        return (income * 12 * growth_factors(income_growth, year)
+                - expenses * 12 * growth_factors(inflation, year)) > 0
+
+    first_positive = positive(np.ones_like(horizon)) & (horizon >= 1)
+    last_positive = positive(horizon) & (horizon >= 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing = np.log(expenses / income) / (np.log1p(income_growth / 100) - np.log1p(inflation / 100))
+    crossing = np.nan_to_num(crossing, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Surplus turning into a deficit: the run ends before the crossing
+    last = np.clip(np.ceil(crossing) - 1, 1, np.maximum(horizon - 1, 1))
+    last = np.where(positive(last + 1), last + 1, last)
+    last = np.where(positive(last), last, last - 1)
+    # Deficit turning into a surplus: the run starts after the crossing
+    first = np.clip(np.floor(crossing) + 1, np.minimum(horizon, 2), np.maximum(horizon, 1))
+    first = np.where(positive(first - 1) & (first > 1), first - 1, first)
+    first = np.where(positive(first), first, first + 1)
+
+    first = np.where(first_positive | ~last_positive, 1, first)
+    last = np.where(last_positive, horizon, np.where(first_positive, last, 0))
+    return first, last
+
+
+def closed_form_summary(current_age, retirement_age, current_savings, monthly_income,
+                        income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                        withdrawal_rate=SAFE_WITHDRAWAL_RATE):
+    """Same inputs and BatchResult as project_batch(), from geometric sums.
+
+    Costs a few array operations per profile, whatever the horizon.
+    """
+    (current_age, retirement_age, savings, income, income_growth,
+     expenses, annual_return, inflation) = _as_profile_arrays((
+        current_age, retirement_age, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    horizon = np.maximum(retirement_age - current_age, 0)
+    log_income = np.log1p(income_growth / 100)
+    log_inflation = np.log1p(inflation / 100)
+    log_return = np.log1p(annual_return / 100)
+
+    total_contributions = savings + 12 * (income * _power_sum(log_income, 1, horizon)
+                                          - expenses * _power_sum(log_inflation, 1, horizon))
+    first, last = _surplus_years(horizon, income, income_growth, expenses, inflation)
+    count = np.maximum(last - first + 1, 0)
+    positive_sum = 12 * (income * _power_sum(log_income, first, last)
+                         - expenses * _power_sum(log_inflation, first, last))
+
+    # V[T] = S * g^T + sum_k max(c[k], 0) * g^(T - k + 1)
+    discounted = 12 * (income * _power_sum(log_income - log_return, first, last)
+                       - expenses * _power_sum(log_inflation - log_return, first, last))
+    final_nominal = np.exp(horizon * log_return) * savings + np.exp((horizon + 1) * log_return) * discounted
+    final_real = final_nominal / np.exp(horizon * log_inflation)
+
+    return BatchResult(
+        final_nominal=final_nominal,
+        final_real=final_real,
+        total_contributions=total_contributions,
+        investment_gain=final_nominal - total_contributions,
+        avg_annual_contribution=np.divide(positive_sum, count, out=np.zeros_like(positive_sum),
+                                          where=count > 0),
+        monthly_pension_nominal=final_nominal * withdrawal_rate / 12,
+        monthly_pension_real=final_real * withdrawal_rate / 12,
+    )
+
+
+def doubling_time(annual_return):
+    """Years for capital to double at `annual_return` percent, log(2) / log(1 + r).
+
+    math.inf (as a float64) where the return isn't positive.
+    """
+    annual_return = np.asarray(annual_return, dtype=float)
+    with np.errstate(divide='ignore'):
+        years = np.log(2) / np.log1p(annual_return / 100)
+    return np.where(annual_return > 0, years, np.inf)[()]
+
+
+def savings_rates(monthly_income, income_growth_rate, monthly_expenses, inflation_rate, years):
+    """Share of income left after expenses in each of `years`, 1 - expenses / income.
+
+    Profile inputs broadcast against each other; with arrays of N profiles
+    the result is (N x years). Negative where expenses exceed income, NaN
+    where the income isn't positive.
+    """
+    income, income_growth, expenses, inflation = [
+        np.asarray(a, dtype=float)[..., np.newaxis]
+        for a in (monthly_income, income_growth_rate, monthly_expenses, inflation_rate)
+    ]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # expenses / income * (b / a)^t, as one exponent
+        log_ratio = np.log(expenses / income) + np.asarray(years) * (np.log1p(inflation / 100)
+                                                                     - np.log1p(income_growth / 100))
+        return np.where(income > 0, -np.expm1(log_ratio), np.nan)
+
+
+def years_to_fi(current_savings, monthly_income, income_growth_rate, monthly_expenses,
+                annual_return, inflation_rate, withdrawal_rate=SAFE_WITHDRAWAL_RATE,
+                max_years=MAX_FI_YEARS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Years until the capital covers that year's expenses under `withdrawal_rate`.
+
+    The capital follows project() with no retirement age, so year t is the
+    final value of a plan retiring t years from now; the first t with
+    capital * withdrawal_rate >= annual expenses is returned, or NaN when
+    it isn't reached within `max_years`. Profile inputs broadcast; returns
+    one float per profile. Profiles are evaluated `chunk_size` at a time.
+    """
+    savings, income, income_growth, expenses, annual_return, inflation = _as_profile_arrays((
+        current_savings, monthly_income, income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    years = np.arange(max_years + 1)
+    result = np.empty(savings.size)
+    for start in range(0, savings.size, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        annual_expenses = (expenses[chunk] * 12)[:, np.newaxis] * growth_factors(inflation[chunk, np.newaxis], years)
+        contributions = (income[chunk] * 12)[:, np.newaxis] * growth_factors(income_growth[chunk, np.newaxis], years)
+        contributions -= annual_expenses
+        capital = accumulate(savings[chunk], contributions, 1 + annual_return[chunk, np.newaxis] / 100)
+
+        covered = capital * withdrawal_rate >= annual_expenses
+        result[chunk] = np.where(covered.any(axis=1), np.argmax(covered, axis=1), np.nan)
+    return result
+
+
+def money_weighted_return(current_savings, contributions, final_value,
+                          tolerance=1e-12, max_iterations=MAX_ITERATIONS):
+    """Internal rate of return (%) of a plan, along the last axis.
+
+    Deposits follow accumulate(): `current_savings` at the start, the
+    positive part of contributions[..., k] at the start of year k for
+    k >= 1, and `final_value` at the end of the last year. This is the
+    constant return that turns those deposits into `final_value`, so for
+    project() it gives back the annual return. NaN without deposits or
+    with a final value that isn't positive.
+    """
+    contributions = np.asarray(contributions, dtype=float)
+    n_years = contributions.shape[-1] - 1
+    deposits = np.maximum(contributions[..., 1:], 0)
+    deposits[..., 0] += current_savings
+    final_value = np.asarray(final_value, dtype=float)
+    # Years each deposit grows, n_years .. 1
+    durations = n_years - np.arange(n_years)
+
+    # Newton's method on x = log(1 + r) for f(x) = sum(d * e^(w x)) - V,
+    # which is convex and increasing. Starting from the return of a single
+    # deposit of the total at the mean duration, f(x) >= 0 (Jensen), so
+    # the iterates decrease monotonically to the root.
+    total = deposits.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duration = (deposits * durations).sum(axis=-1) / total
+        x = np.log(final_value / total) / duration
+        valid = np.isfinite(x) & (final_value > 0)
+        x = np.where(valid, x, 0.0)
+        for _ in range(max_iterations):
+            grown = deposits * np.exp(durations * x[..., np.newaxis])
+            step = (grown.sum(axis=-1) - final_value) / (grown * durations).sum(axis=-1)
+            step = np.where(valid, step, 0.0)
+            x = x - step
+            if np.all(np.abs(step) <= tolerance):
+                break
+    return np.where(valid, np.expm1(x) * 100, np.nan)[()]
@@ -0,0 +1,140 @@
+"""Vectorized projection of many client profiles at once.
+
+Every profile uses the same inputs as the sidebar in main.py. Profiles are
+grouped by horizon and evaluated chunk by chunk as (profiles x years) arrays,
+padded to the longest horizon in the chunk and masked beyond each profile's
+own retirement year, so there is no Python loop over profiles or years.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .projection import SAFE_WITHDRAWAL_RATE
+
+# Input columns, in the order used by project() and the sidebar
+PROFILE_COLUMNS = (
+    'current_age',
+    'retirement_age',
+    'current_savings',
+    'monthly_income',
+    'income_growth_rate',
+    'monthly_expenses',
+    'annual_return',
+    'inflation_rate',
+)
+
+# Profiles per chunk; bounds the (profiles x years) temporaries to a few MB
+DEFAULT_CHUNK_SIZE = 32768
+
+BatchResult = namedtuple('BatchResult', [
+    'final_nominal',
+    'final_real',
+    'total_contributions',
+    'investment_gain',
+    'avg_annual_contribution',
+    'monthly_pension_nominal',
+    'monthly_pension_real',
+])
+
+
+def _as_profile_arrays(columns):
+    # Broadcast scalars and sequences to one float array per input column
+    arrays = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in columns])
+    return [np.ravel(a) for a in arrays]
+
+
+def _project_chunk(horizon, savings, income, income_growth, expenses, annual_return, inflation):
+    """Final values for one chunk of profiles; all inputs are 1-D arrays."""
+    years = np.arange(1, int(horizon.max()) + 1, dtype=float)
+    active = years <= horizon[:, np.newaxis]
+
+    log_income = np.log1p(income_growth / 100)[:, np.newaxis]
+    log_inflation = np.log1p(inflation / 100)[:, np.newaxis]
+    log_return = np.log1p(annual_return / 100)[:, np.newaxis]
+
+    # Contribution of every year 1..horizon; year 0 is never invested
+    contribution = np.exp(years * log_income)
+    contribution *= (income * 12)[:, np.newaxis]
+    contribution -= (expenses * 12)[:, np.newaxis] * np.exp(years * log_inflation)
+    contribution[~active] = 0.0
+
+    total_contributions = savings + contribution.sum(axis=1)
+    positive = contribution > 0
+    positive_count = positive.sum(axis=1)
+    np.maximum(contribution, 0, out=contribution)
+    positive_sum = contribution.sum(axis=1)
+
+    # V[T] = S * g^T + sum_k max(c[k], 0) * g^(T - k + 1)
+    contribution *= np.exp(-years * log_return)
+    final_growth = np.exp(horizon * log_return[:, 0])
+    final_nominal = final_growth * (savings + np.exp(log_return[:, 0]) * contribution.sum(axis=1))
+    final_real = final_nominal / np.exp(horizon * log_inflation[:, 0])
+
+    avg_annual_contribution = np.divide(
+        positive_sum, positive_count,
+        out=np.zeros_like(positive_sum), where=positive_count > 0
+    )
+    return final_nominal, final_real, total_contributions, avg_annual_contribution
+
+
+def project_batch(current_age, retirement_age, current_savings, monthly_income,
+                  income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                  withdrawal_rate=SAFE_WITHDRAWAL_RATE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Project N profiles given as columnar arrays (scalars broadcast).
+
+    Returns a BatchResult of length-N arrays holding the same summary values
+    that main.py shows for a single profile.
+    """
+    (current_age, retirement_age, savings, income, income_growth,
+     expenses, annual_return, inflation) = _as_profile_arrays((
+        current_age, retirement_age, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    horizon = np.maximum(retirement_age - current_age, 0)
+    n = horizon.size
+
+    final_nominal = np.empty(n)
+    final_real = np.empty(n)
+    total_contributions = np.empty(n)
+    avg_annual_contribution = np.empty(n)
+
+    # Sort by horizon so each chunk pads to a similar length
+    order = np.argsort(horizon, kind='stable')
+    for start in range(0, n, chunk_size):
+        idx = order[start:start + chunk_size]
+        if horizon[idx[-1]] == 0:
+            # Already retired: capital stays at current savings
+            final_nominal[idx] = final_real[idx] = total_contributions[idx] = savings[idx]
+            avg_annual_contribution[idx] = 0.0
+            continue
+        (final_nominal[idx], final_real[idx],
+         total_contributions[idx], avg_annual_contribution[idx]) = _project_chunk(
+            horizon[idx], savings[idx], income[idx], income_growth[idx],
+            expenses[idx], annual_return[idx], inflation[idx]
+        )
+
+    return BatchResult(
+        final_nominal=final_nominal,
+        final_real=final_real,
+        total_contributions=total_contributions,
+        investment_gain=final_nominal - total_contributions,
+        avg_annual_contribution=avg_annual_contribution,
+        monthly_pension_nominal=final_nominal * withdrawal_rate / 12,
+        monthly_pension_real=final_real * withdrawal_rate / 12,
+    )
+
+
+def project_frame(profiles, withdrawal_rate=SAFE_WITHDRAWAL_RATE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Project every row of a DataFrame with PROFILE_COLUMNS.
+
+    Returns a DataFrame with the same index and one column per BatchResult
+    field.
+    """
+    import pandas as pd
+
+    result = project_batch(
+        *(profiles[column].to_numpy() for column in PROFILE_COLUMNS),
+        withdrawal_rate=withdrawal_rate,
+        chunk_size=chunk_size
+    )
+    return pd.DataFrame(result._asdict(), index=profiles.index)
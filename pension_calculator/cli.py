@@ -0,0 +1,279 @@
+"""Command-line interface: the calculator without the Streamlit UI.
+
+    python -m pension_calculator project --current-age 32 --retirement-age 60 --output table.csv
+    python -m pension_calculator batch profiles.csv --output results.parquet
+    python -m pension_calculator montecarlo profiles.csv --paths 10000 --workers 8 -o book.csv
+    python -m pension_calculator serve --port 8000
+    python -m pension_calculator history
+    python -m pension_calculator history returns.csv
+
+Only numpy is imported for a single projection; pandas and pyarrow are
+loaded when a profile file is read or Parquet is written. `batch` streams
+the profile file chunk by chunk, so files larger than memory work too.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from .accounts import TAX_PRESETS
+from .batch import PROFILE_COLUMNS
+from .history import DEFAULT_PATH as HISTORY_PATH, HISTORY_COLUMNS, SHILLER_URL, build_history
+from .parallel import simulate_book
+from .pipeline import DEFAULT_CHUNK_ROWS, run_pipeline
+from .projection import SAFE_WITHDRAWAL_RATE, project, summarize
+
+FORMATS = ('csv', 'json', 'parquet')
+
+# Sidebar defaults of main.py
+DEFAULTS = {
+    'current_age': 32,
+    'retirement_age': 60,
+    'current_savings': 71000.0,
+    'monthly_income': 12833.0,
+    'income_growth_rate': 6.5,
+    'monthly_expenses': 6500.0,
+    'annual_return': 6.0,
+    'inflation_rate': 3.5,
+}
+
+TABLE_COLUMNS = (
+    'age',
+    'annual_income',
+    'annual_expenses',
+    'annual_contribution',
+    'nominal_value',
+    'real_value',
+)
+
+
+def _output_format(path, requested):
+    if requested:
+        return requested
+    suffix = Path(path).suffix.lower().lstrip('.')
+    if suffix not in FORMATS:
+        raise SystemExit(f"Can't tell the output format of {path}; use --format {{{','.join(FORMATS)}}}")
+    return suffix
+
+
+def _write_text(columns, f, output_format):
+    names = list(columns)
+    rows = zip(*(columns[name].tolist() for name in names))
+    if output_format == 'csv':
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(rows)
+    else:
+        json.dump([dict(zip(names, row)) for row in rows], f, indent=2)
+
+
+def _write_columns(columns, path, output_format):
+    """Write a dict of equally long columns as CSV, JSON records or Parquet.
+
+    Text formats go to stdout when `path` is None.
+    """
+    if output_format == 'parquet':
+        if path is None:
+            raise SystemExit("Parquet output needs --output")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Writing Parquet requires pyarrow (pip install pyarrow)")
+        pq.write_table(pa.table(columns), path)
+    elif path is None:
+        _write_text(columns, sys.stdout, output_format)
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            _write_text(columns, f, output_format)
+
+
+def _read_profiles(path):
+    import pandas as pd
+
+    suffix = Path(path).suffix.lower()
+    if suffix == '.parquet':
+        profiles = pd.read_parquet(path)
+    elif suffix == '.json':
+        profiles = pd.read_json(path)
+    else:
+        profiles = pd.read_csv(path)
+    missing = [column for column in PROFILE_COLUMNS if column not in profiles]
+    if missing:
+        raise SystemExit(f"{path} is missing columns: {', '.join(missing)}")
+    return profiles
+
+
+def _add_profile_arguments(parser):
+    for name, default in DEFAULTS.items():
+        parser.add_argument(
+            '--' + name.replace('_', '-'),
+            type=type(default),
+            default=default,
+            help=f"default: {default}"
+        )
+
+
+def run_project(args):
+    inputs = {name: getattr(args, name) for name in DEFAULTS}
+    if inputs['retirement_age'] <= inputs['current_age']:
+        raise SystemExit("Retirement age must be higher than current age")
+    output_format = _output_format(args.output, args.format) if args.output else None
+
+    projection = project(**inputs)
+    summary = summarize(projection, inputs['current_savings'], withdrawal_rate=args.withdrawal_rate)
+
+    for name, value in summary._asdict().items():
+        print(f"{name.replace('_', ' ').capitalize():<26} {value:>16,.0f}")
+
+    if args.output:
+        table = dict(zip(TABLE_COLUMNS, projection))
+        _write_columns(table, args.output, output_format)
+
+
+def _report_progress(stats):
+    print(f"\r{stats.rows:,} profiles, {stats.rows_per_second:,.0f} rows/s", end='', file=sys.stderr, flush=True)
+
+
+def run_batch(args):
+    output_format = _output_format(args.output, args.format) if args.output else args.format or 'csv'
+    stats = run_pipeline(
+        args.profiles,
+        args.output,
+        output_format,
+        withdrawal_rate=args.withdrawal_rate,
+        chunk_rows=args.chunk_rows,
+        progress=None if args.quiet else _report_progress,
+        tax_preset=args.tax_preset
+    )
+    if stats.chunks and not args.quiet:
+        print(file=sys.stderr)
+    print(f"Projected {stats.rows:,} profiles in {stats.seconds:.1f} s ({stats.rows_per_second:,.0f} rows/s)",
+          file=sys.stderr)
+
+
+def run_montecarlo(args):
+    profiles = _read_profiles(args.profiles)
+    result = simulate_book(
+        *(profiles[column].to_numpy() for column in PROFILE_COLUMNS),
+        seed=args.seed,
+        workers=args.workers,
+        n_paths=args.paths,
+        return_volatility=args.return_volatility,
+        inflation_volatility=args.inflation_volatility,
+        target=args.target,
+        life_expectancy=args.life_expectancy,
+        withdrawal_rate=args.withdrawal_rate
+    )
+    columns = {'id': profiles['id'].to_numpy()} if 'id' in profiles else {}
+    for q, band in zip(result.percentiles, result.final_real_bands.T):
+        columns[f'final_real_p{q:g}'] = band
+    if args.target is not None:
+        columns['success_probability'] = result.success_probability
+    if args.life_expectancy is not None:
+        columns['depletion_probability'] = result.depletion_probability
+
+    output_format = _output_format(args.output, args.format) if args.output else args.format or 'csv'
+    _write_columns(columns, args.output, output_format)
+    book = ', '.join(f"P{q:g} {value:,.0f}" for q, value in zip(result.percentiles, result.book_bands))
+    print(f"Simulated {len(profiles):,} profiles x {args.paths:,} paths; final real capital {book}",
+          file=sys.stderr)
+
+
+def run_serve(args):
+    from .server import run
+
+    run(args.host, args.port, batch_window=args.batch_window / 1000,
+        max_batch_size=args.max_batch_size, cache_max_entries=args.cache_entries)
+
+
+def _download(url, path):
+    import urllib.error
+    import urllib.request
+
+    print(f"Downloading {url}", file=sys.stderr)
+    try:
+        urllib.request.urlretrieve(url, path)
+    except (urllib.error.URLError, OSError) as e:
+        raise SystemExit(f"Can't download {url} ({e}). Without network access, save that file elsewhere "
+                         f"and run: python -m pension_calculator history shiller.csv --shiller")
+
+
+def run_history(args):
+    if args.returns is None:
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'shiller.csv')
+            _download(SHILLER_URL, source)
+            history = build_history(source, args.output, shiller=True)
+    else:
+        history = build_history(args.returns, args.output, shiller=args.shiller)
+    print(f"Wrote {len(history)} years ({history[0, 0]:.0f}-{history[-1, 0]:.0f}) to {args.output}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m pension_calculator', description='Retirement calculator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    project_parser = commands.add_parser('project', help='project a single profile')
+    _add_profile_arguments(project_parser)
+    project_parser.set_defaults(handler=run_project)
+
+    batch_parser = commands.add_parser('batch', help='project every profile of a CSV/JSON/Parquet file')
+    batch_parser.add_argument('profiles', help=f"file with columns {', '.join(PROFILE_COLUMNS)} (and optional id)")
+    batch_parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='profiles read and written at a time')
+    batch_parser.add_argument('--quiet', '-q', action='store_true', help='no progress output')
+    batch_parser.add_argument('--tax-preset', choices=sorted(TAX_PRESETS),
+                              help='add account balances and after-tax capital under these tax rules')
+    batch_parser.set_defaults(handler=run_batch)
+
+    montecarlo_parser = commands.add_parser('montecarlo', help='Monte Carlo for every profile of a file, in parallel')
+    montecarlo_parser.add_argument('profiles', help=f"file with columns {', '.join(PROFILE_COLUMNS)} (and optional id)")
+    montecarlo_parser.add_argument('--paths', type=int, default=10000, help='paths per profile')
+    montecarlo_parser.add_argument('--seed', type=int, default=0)
+    montecarlo_parser.add_argument('--workers', type=int, help='worker processes (default: number of CPUs)')
+    montecarlo_parser.add_argument('--return-volatility', type=float, default=15.0)
+    montecarlo_parser.add_argument('--inflation-volatility', type=float, default=1.5)
+    montecarlo_parser.add_argument('--target', type=float, help='real capital target for the success probability')
+    montecarlo_parser.add_argument('--life-expectancy', type=int, help='simulate withdrawals up to this age')
+    montecarlo_parser.set_defaults(handler=run_montecarlo)
+
+    serve_parser = commands.add_parser('serve', help='serve the HTTP JSON API')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--batch-window', type=float, default=0.0,
+                              help='ms to wait for more /project requests to batch together')
+    serve_parser.add_argument('--max-batch-size', type=int, default=4096)
+    serve_parser.add_argument('--cache-entries', type=int, default=4096, help='LRU response cache size (0 disables)')
+    serve_parser.set_defaults(handler=run_serve)
+
+    history_parser = commands.add_parser(
+        'history', help='build the historical returns dataset used for backtests',
+        description=f"Build the dataset used for backtests. Without a CSV, download Robert Shiller's monthly "
+                    f"data since 1871 from {SHILLER_URL} (needs network access) and derive yearly stock, "
+                    f"bond and inflation rates from it."
+    )
+    history_parser.add_argument('returns', nargs='?',
+                                help=f"CSV with columns {', '.join(HISTORY_COLUMNS)} (percent); "
+                                     f"downloads Shiller's monthly data when omitted")
+    history_parser.add_argument('--shiller', action='store_true',
+                                help=f"the CSV is a saved copy of {SHILLER_URL}")
+    history_parser.add_argument('--output', '-o', default=HISTORY_PATH, help='dataset to write (default: %(default)s)')
+    history_parser.set_defaults(handler=run_history)
+
+    for sub in (project_parser, batch_parser, montecarlo_parser):
+        sub.add_argument('--withdrawal-rate', type=float, default=SAFE_WITHDRAWAL_RATE)
+        sub.add_argument('--output', '-o', help='write the yearly table / results to this file')
+        sub.add_argument('--format', choices=FORMATS, help='output format (default: from the file extension)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Withdrawal phase from the retirement age up to the life expectancy.
+
+Every strategy works on (paths x years) arrays: the deterministic forecast is
+a single path, Monte Carlo passes one row per simulated path. Withdrawals
+are taken at the start of each year and the rest grows with that year's
+return, B[t] = (B[t-1] - W[t]) * g[t], never dropping below zero.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .projection import SAFE_WITHDRAWAL_RATE
+
+STRATEGIES = ('constant_real', 'fixed_percentage', 'guardrails', 'vpw')
+
+# Real return assumed when sizing variable percentage withdrawals
+VPW_REAL_RETURN = 0.03
+
+# Guardrails: adjust spending when the current withdrawal rate leaves the band
+# of +-20% around the initial rate, by 10% each time
+GUARDRAIL_BAND = 0.2
+GUARDRAIL_ADJUSTMENT = 0.1
+
+DecumulationResult = namedtuple('DecumulationResult', [
+    'ages',
+    'balance',
+    'real_balance',
+    'withdrawal',
+    'depletion_age',
+    'remaining_balance',
+    'remaining_real_balance',
+])
+
+
+def _prepend(values, first):
+    # Shift a (paths x years) array one year right, filling year 0 with `first`
+    return np.concatenate([np.broadcast_to(first, values.shape[:-1] + (1,)), values], axis=-1)
+
+
+def _constant_real(initial, growth, inflation, withdrawal_rate, **_):
+    # Fixed share of the starting capital, indexed with inflation every year.
+    # Planned withdrawals don't depend on the balance, so the recurrence unrolls
+    # to B[t] = P[t] * (B[0] - sum_{k<=t} W[k] / P[k-1]) until it turns negative.
+    planned = withdrawal_rate * initial[:, np.newaxis] * _prepend(np.cumprod(inflation, axis=1), 1.0)[:, :-1]
+    cumulative = np.cumprod(growth, axis=1)
+    remaining = initial[:, np.newaxis] - np.cumsum(planned / _prepend(cumulative, 1.0)[:, :-1], axis=1)
+    return planned, cumulative * np.maximum(remaining, 0)
+
+
+def _proportional(initial, growth, rates):
+    # Withdraw rates[t] of the balance every year: B[t] = B[t-1] * (1 - r[t]) * g[t]
+    balance = initial[:, np.newaxis] * np.cumprod((1 - rates) * growth, axis=1)
+    planned = rates * _prepend(balance, initial[:, np.newaxis])[:, :-1]
+    return planned, balance
+
+
+def _fixed_percentage(initial, growth, inflation, withdrawal_rate, **_):
+    return _proportional(initial, growth, np.full(growth.shape[-1], withdrawal_rate))
+
+
+def _vpw(initial, growth, inflation, withdrawal_rate, vpw_real_return=VPW_REAL_RETURN, **_):
+    # Rate of an annuity paid at the start of each of the remaining years, so
+    # the last year withdraws everything that is left
+    remaining_years = np.arange(growth.shape[-1], 0, -1)
+    if vpw_real_return == 0:
+        rates = 1 / remaining_years
+    else:
+        discount = -np.expm1(-remaining_years * np.log1p(vpw_real_return))
+        rates = vpw_real_return / ((1 + vpw_real_return) * discount)
+    return _proportional(initial, growth, rates)
+
+
+def _guardrails(initial, growth, inflation, withdrawal_rate,
+                guardrail_band=GUARDRAIL_BAND, guardrail_adjustment=GUARDRAIL_ADJUSTMENT, **_):
+    # Spending depends on last year's balance, so this one steps through the
+    # years; every step is still vectorized across paths.
+    planned = np.empty_like(growth)
+    balance = np.empty_like(growth)
+    upper = withdrawal_rate * (1 + guardrail_band)
+    lower = withdrawal_rate * (1 - guardrail_band)
+
+    current = initial.copy()
+    spending = withdrawal_rate * initial
+    for year in range(growth.shape[-1]):
+        if year > 0:
+            spending = spending * inflation[:, year - 1]
+            rate = np.divide(spending, current, out=np.full_like(current, np.inf), where=current > 0)
+            spending = np.where(rate > upper, spending * (1 - guardrail_adjustment),
+                                np.where(rate < lower, spending * (1 + guardrail_adjustment), spending))
+        planned[:, year] = spending
+        current = np.maximum(current - spending, 0) * growth[:, year]
+        balance[:, year] = current
+    return planned, balance
+
+
+_STRATEGY_FUNCTIONS = {
+    'constant_real': _constant_real,
+    'fixed_percentage': _fixed_percentage,
+    'guardrails': _guardrails,
+    'vpw': _vpw,
+}
+
+
+def withdraw(initial_balance, retirement_age, life_expectancy, annual_return, inflation_rate,
+             strategy='constant_real', withdrawal_rate=SAFE_WITHDRAWAL_RATE, price_level=1.0, **options):
+    """Simulate withdrawals from the capital at retirement.
+
+    `initial_balance` is a scalar or one value per path; `annual_return` and
+    `inflation_rate` are percentages, either scalars or (paths x years)
+    arrays for the years after retirement. `price_level` is the price level
+    at retirement relative to today, so real values are in today's money.
+    Extra keyword options are passed to the strategy (vpw_real_return,
+    guardrail_band, guardrail_adjustment).
+
+    Returns a DecumulationResult whose arrays have one row per path; the
+    depletion age is NaN for paths that never run out of money.
+    """
+    if strategy not in _STRATEGY_FUNCTIONS:
+        raise ValueError(f"Unknown withdrawal strategy: {strategy!r}")
+
+    initial = np.atleast_1d(np.asarray(initial_balance, dtype=float))
+    years = max(life_expectancy - retirement_age, 0)
+    shape = np.broadcast_shapes(initial.shape + (years,), np.shape(annual_return), np.shape(inflation_rate))
+    initial = np.broadcast_to(initial, shape[:-1])
+    growth = 1 + np.broadcast_to(np.asarray(annual_return, dtype=float), shape) / 100
+    inflation = 1 + np.broadcast_to(np.asarray(inflation_rate, dtype=float), shape) / 100
+
+    planned, balance = _STRATEGY_FUNCTIONS[strategy](
+        initial, growth, inflation, withdrawal_rate=withdrawal_rate, **options
+    )
+    balance = _prepend(balance, initial[:, np.newaxis])
+    # A path can't withdraw more than it has left
+    withdrawal = np.minimum(planned, balance[:, :-1])
+
+    prices = np.asarray(price_level, dtype=float)[..., np.newaxis] * _prepend(np.cumprod(inflation, axis=1), 1.0)
+    real_balance = balance / prices
+
+    depleted = balance <= 0
+    depletion_age = np.where(depleted.any(axis=1), retirement_age + depleted.argmax(axis=1), np.nan)
+
+    return DecumulationResult(
+        ages=retirement_age + np.arange(years + 1),
+        balance=balance,
+        real_balance=real_balance,
+        withdrawal=withdrawal,
+        depletion_age=depletion_age,
+        remaining_balance=balance[:, -1],
+        remaining_real_balance=real_balance[:, -1],
+    )
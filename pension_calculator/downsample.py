@@ -0,0 +1,46 @@
+"""Downsampling of long series for charts.
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013) keeps the first and last
+points and, from every bucket in between, the point that forms the largest
+triangle with the point kept from the previous bucket and the average of
+the next bucket. The result keeps the visual shape of the series, peaks
+included, and only contains original points, so values shown on hover are
+exact.
+"""
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """Indices of the `n_out` points of (x, y) to draw, in increasing order.
+
+    Series that already have at most `n_out` points are returned whole.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets over the points between the first and the last one
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    sizes = np.diff(edges)
+    averages_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    averages_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # The "next bucket" of the last bucket is the last point
+    averages_x = np.append(averages_x[1:], x[-1])
+    averages_y = np.append(averages_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    kept = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas; the factor doesn't change the argmax
+        areas = np.abs(
+            (x[kept] - averages_x[bucket]) * (y[start:end] - y[kept])
+            - (x[kept] - x[start:end]) * (averages_y[bucket] - y[kept])
+        )
+        kept = start + int(np.argmax(areas))
+        indices[bucket + 1] = kept
+    return indices
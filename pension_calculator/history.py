@@ -0,0 +1,192 @@
+"""Backtests of the savings plan over historical market data.
+
+The dataset is a single float64 .npy array with one row per calendar year
+and the columns of HISTORY_COLUMNS: the year, the total return of stocks
+and of bonds and the inflation over that year, all in percent. It is opened
+with np.load(mmap_mode='r'), so nothing is parsed and processes serving the
+app share the file through the page cache. build_history() writes it from a
+CSV with those columns, or with `shiller=True` from the monthly data of
+Robert Shiller since 1871 (SHILLER_URL, a CSV republication of his
+ie_data.xls): stocks are the S&P composite with dividends reinvested
+monthly, bonds a 10-year Treasury bought at the January yield and sold as
+a 9-year one a year later, inflation the January-to-January CPI change.
+No dataset ships with the package; `python -m pension_calculator history`
+downloads Shiller's data and builds it. The app looks for it at
+DEFAULT_PATH unless PENSION_HISTORY_PATH points elsewhere.
+
+backtest() runs the plan over every run of consecutive historical years as
+long as the accumulation phase, all windows at once. The windows are
+strided views into the yearly series (sliding_window_view), and price
+levels come from one cumulative sum of log inflation, so no per-window
+copies of the history are made before the (windows x years) capital arrays
+themselves.
+"""
+import csv
+import os
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .montecarlo import MIN_RATE
+from .projection import accumulate, growth_factors
+
+HISTORY_COLUMNS = ('year', 'stocks', 'bonds', 'inflation')
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'history.npy')
+
+SHILLER_URL = 'https://raw.githubusercontent.com/datasets/s-and-p-500/main/data/data.csv'
+
+# Columns of SHILLER_URL used: month, price and dividend per share (annual
+# rate), CPI and 10-year Treasury yield (%)
+SHILLER_COLUMNS = ('date', 'sp500', 'dividend', 'consumer price index', 'long interest rate')
+
+# Maturity of the bonds in the Shiller dataset
+BOND_YEARS = 10
+
+BacktestResult = namedtuple('BacktestResult', [
+    'ages',
+    'start_years',
+    'nominal_values',
+    'real_values',
+    'final_nominal',
+    'final_real',
+    'success_rate',
+    'worst_window',
+    'best_window',
+])
+
+
+def _check_history(history):
+    if history.ndim != 2 or history.shape[1] != len(HISTORY_COLUMNS) or not len(history):
+        raise ValueError(f"history must be a (years, {len(HISTORY_COLUMNS)}) array of {', '.join(HISTORY_COLUMNS)}")
+    if np.any(np.diff(history[:, 0]) != 1):
+        raise ValueError("history years must be consecutive")
+
+
+def _read_shiller(csv_path):
+    """Yearly HISTORY_COLUMNS rows from Shiller's monthly data.
+
+    Uses the run of complete months from the first one; year Y needs the
+    months of Y and January of Y + 1.
+    """
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        missing = [column for column in SHILLER_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"{csv_path}: missing columns {', '.join(missing)}")
+        indices = [header.index(column) for column in SHILLER_COLUMNS]
+        monthly = {}
+        for row in reader:
+            date, *values = [row[i].strip() for i in indices]
+            if all(values):
+                year, month = date.split('-')[:2]
+                monthly[int(year) * 12 + int(month) - 1] = [float(value) for value in values]
+
+    months = sorted(monthly)
+    complete = next((i for i, month in enumerate(months) if month != months[0] + i), len(months))
+    first_january = -months[0] % 12
+    n_years = max((complete - first_january - 1) // 12, 0)
+    if not n_years:
+        raise ValueError(f"{csv_path}: no complete year of monthly data")
+    price, dividend, cpi, bond_yield = np.array(
+        [monthly[month] for month in months[first_january:first_january + 12 * n_years + 1]]
+    ).T
+
+    # Dividends are annual rates, one twelfth paid and reinvested each month
+    stocks = np.prod(((price[1:] + dividend[:-1] / 12) / price[:-1]).reshape(n_years, 12), axis=1) - 1
+    january_cpi, january_yield = cpi[::12], bond_yield[::12] / 100
+    inflation = january_cpi[1:] / january_cpi[:-1] - 1
+    bought, sold = january_yield[:-1], january_yield[1:]
+    # Price of the bond a year later: its remaining coupons and principal at the new yield
+    remaining = (1 + sold) ** -(BOND_YEARS - 1)
+    bonds = bought + bought / sold * (1 - remaining) + remaining - 1
+
+    years = (months[0] + first_january) // 12 + np.arange(n_years)
+    return np.column_stack([years, stocks * 100, bonds * 100, inflation * 100])
+
+
+def build_history(csv_path, path=DEFAULT_PATH, shiller=False):
+    """Convert a CSV into the dataset at `path`.
+
+    The CSV has a header row and HISTORY_COLUMNS, or with `shiller` the
+    monthly columns of SHILLER_URL.
+    """
+    if shiller:
+        history = _read_shiller(csv_path)
+    else:
+        with open(csv_path, newline='') as f:
+            header = [name.strip().lower() for name in f.readline().split(',')]
+            missing = [column for column in HISTORY_COLUMNS if column not in header]
+            if missing:
+                raise ValueError(f"{csv_path}: missing columns {', '.join(missing)}")
+            history = np.loadtxt(f, delimiter=',', ndmin=2, usecols=[header.index(c) for c in HISTORY_COLUMNS])
+        history = history[np.argsort(history[:, 0])]
+    _check_history(history)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Written next to the target and renamed, so readers never map a partial file
+    partial = f"{path}.partial.npy"
+    np.save(partial, np.ascontiguousarray(history, dtype='<f8'), allow_pickle=False)
+    os.replace(partial, path)
+    return history
+
+
+def load_history(path=DEFAULT_PATH):
+    """Memory-map the dataset at `path`."""
+    history = np.load(path, mmap_mode='r', allow_pickle=False)
+    _check_history(history)
+    return history
+
+
+def backtest(current_age, retirement_age, current_savings, monthly_income,
+             income_growth_rate, monthly_expenses, history, stock_allocation=60.0, target=None):
+    """Run the plan over every historical window of the accumulation length.
+
+    The portfolio holds `stock_allocation` percent stocks and the rest bonds,
+    rebalanced every year. Income grows at the deterministic rate, expenses
+    with the window's realised inflation, and contributions follow project().
+    Returns a BacktestResult with one row of nominal and real capital per
+    window (labelled by the first historical year it uses), the share of
+    windows whose final real capital reaches `target` (None without a
+    target) and the row indices of the worst and best windows by final real
+    capital.
+    """
+    history = np.asarray(history, dtype=float)
+    _check_history(history)
+    n_years = max(retirement_age - current_age, 0)
+    if n_years > len(history):
+        raise ValueError(f"history has {len(history)} years, the plan needs {n_years}")
+
+    share = stock_allocation / 100
+    returns = np.maximum(share * history[:, 1] + (1 - share) * history[:, 2], MIN_RATE)
+    inflation = np.maximum(history[:, 3], MIN_RATE)
+
+    # Row s is [placeholder, growth of years s .. s+n-1]; accumulate()
+    # ignores the growth of year 0, so the placeholder never matters
+    growth = sliding_window_view(np.concatenate([[1.0], 1 + returns / 100]), n_years + 1)
+    # Price level relative to the window's first year, from prefix sums
+    log_prices = np.concatenate([[0.0], np.cumsum(np.log1p(inflation / 100))])
+    price_level = np.exp(sliding_window_view(log_prices, n_years + 1) - log_prices[:len(growth), np.newaxis])
+
+    years = np.arange(n_years + 1)
+    annual_income = monthly_income * 12 * growth_factors(income_growth_rate, years)
+    contributions = annual_income - monthly_expenses * 12 * price_level
+    nominal = accumulate(current_savings, contributions, growth)
+    real = nominal / price_level
+
+    final_real = real[:, -1]
+    return BacktestResult(
+        ages=current_age + years,
+        start_years=(history[0, 0] + np.arange(len(growth))).astype(int),
+        nominal_values=nominal,
+        real_values=real,
+        final_nominal=nominal[:, -1],
+        final_real=final_real,
+        success_rate=float(np.mean(final_real >= target)) if target is not None else None,
+        worst_window=int(np.argmin(final_real)),
+        best_window=int(np.argmax(final_real)),
+    )
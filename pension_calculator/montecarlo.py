@@ -0,0 +1,222 @@
+"""Monte Carlo simulation of the capital projection.
+
+Yearly investment returns and inflation are drawn at random for every path,
+while income keeps growing at the deterministic rate. Contributions follow
+the same rule as project(): expenses grow with the path's realised
+inflation and only the positive surplus is invested. Optionally every path
+continues past retirement with one of the withdrawal strategies from
+decumulation.py. Paths are simulated in chunks of (paths x years) arrays so
+memory for the random draws and temporaries stays bounded.
+
+Every year counted from today draws from its own random streams, one for
+returns and one for inflation (spawn keys (stream, year) under the seed),
+and the withdrawal years simply continue after the retirement age. A
+path's draws for a year therefore don't depend on the horizon, the life
+expectancy or the chunk size: moving the retirement age only moves the
+boundary between saving and withdrawing. incremental.py relies on this to
+reuse the draws of earlier reruns.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .decumulation import withdraw
+from .projection import SAFE_WITHDRAWAL_RATE, accumulate, growth_factors
+
+DISTRIBUTIONS = ('normal', 'lognormal', 'bootstrap')
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Paths per chunk of random draws
+DEFAULT_PATH_CHUNK = 8192
+
+# Yearly returns and inflation are clipped above -100% so capital stays positive
+MIN_RATE = -99.0
+
+# Random streams of every year, see the module docstring
+RETURN_STREAM = 0
+INFLATION_STREAM = 1
+
+MonteCarloResult = namedtuple('MonteCarloResult', [
+    'ages',
+    'percentiles',
+    'nominal_bands',
+    'real_bands',
+    'final_nominal',
+    'final_real',
+    'success_probability',
+    'retirement_ages',
+    'retirement_nominal_bands',
+    'retirement_real_bands',
+    'depletion_probability',
+], defaults=(None, None, None, None))
+
+
+def normal_rates(draws, mean, volatility, distribution='lognormal'):
+    """Yearly rates in percent from standard normal `draws`.
+
+    'normal' takes the rate itself as normally distributed; 'lognormal'
+    takes log(1 + rate) so that 1 + rate has the requested mean and standard
+    deviation.
+    """
+    if distribution == 'normal':
+        rates = mean + volatility * draws
+    elif distribution == 'lognormal':
+        gross = 1 + mean / 100
+        sigma2 = np.log1p((volatility / 100 / gross) ** 2)
+        rates = np.expm1(np.log(gross) - sigma2 / 2 + np.sqrt(sigma2) * draws) * 100
+    else:
+        raise ValueError(f"Unknown distribution: {distribution!r}")
+    return np.maximum(rates, MIN_RATE)
+
+
+def year_generators(seed, stream, first, last):
+    """Generators of `stream` for the years first .. last - 1 after today.
+
+    `seed` is anything np.random.default_rng() accepts.
+    """
+    seed_seq = np.random.default_rng(seed).bit_generator.seed_seq
+    return [
+        np.random.default_rng(np.random.SeedSequence(
+            seed_seq.entropy, spawn_key=seed_seq.spawn_key + (stream, year), pool_size=seed_seq.pool_size
+        ))
+        for year in range(first, last)
+    ]
+
+
+def draw_years(generators, n_paths, distribution, history=None):
+    """(years x n_paths) draws, one row per year generator.
+
+    Standard normals, or for 'bootstrap' the rows of `history` to resample.
+    Drawing the paths in several calls continues each year's stream, so
+    the rows equal one call for all the paths.
+    """
+    if distribution == 'bootstrap':
+        rows = [rng.integers(0, len(history), n_paths) for rng in generators]
+    else:
+        rows = [rng.standard_normal(n_paths) for rng in generators]
+    return np.array(rows).reshape(len(generators), n_paths)
+
+
+def rates_from_draws(return_draws, inflation_draws, annual_return, inflation_rate, return_volatility,
+                     inflation_volatility, distribution, history):
+    """Yearly returns and inflation in percent from draw_years() output.
+
+    Bootstrap resamples whole years of `history`, so it only uses the
+    return draws.
+    """
+    if distribution == 'bootstrap':
+        history = np.asarray(history, dtype=float)
+        return (np.maximum(history[return_draws, 0], MIN_RATE),
+                np.maximum(history[return_draws, 1], MIN_RATE))
+    return (normal_rates(return_draws, annual_return, return_volatility, distribution),
+            normal_rates(inflation_draws, inflation_rate, inflation_volatility, distribution))
+
+
+def check_options(distribution, history):
+    """Raise ValueError for an unknown distribution or a missing or malformed history."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution!r}")
+    if distribution == 'bootstrap':
+        if history is None:
+            raise ValueError("Bootstrap simulation needs a history of returns and inflation")
+        history = np.asarray(history)
+        if history.ndim != 2 or history.shape[1] != 2 or not len(history):
+            raise ValueError("history must be a (years, 2) array of return and inflation")
+
+
+def simulate(current_age, retirement_age, current_savings, monthly_income,
+             income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+             return_volatility=15.0, inflation_volatility=1.5, n_paths=10000,
+             distribution='lognormal', history=None, percentiles=DEFAULT_PERCENTILES,
+             target=None, seed=None, chunk_size=DEFAULT_PATH_CHUNK, life_expectancy=None,
+             strategy='constant_real', withdrawal_rate=SAFE_WITHDRAWAL_RATE):
+    """Simulate `n_paths` capital paths up to retirement.
+
+    Returns a MonteCarloResult with yearly percentile bands (one row per
+    entry of `percentiles`) of nominal and real capital, the final values of
+    every path and the share of paths whose final real capital reaches
+    `target` (None when no target is given).
+
+    With a `life_expectancy`, every path continues with withdrawals under
+    `strategy`; the result then also holds percentile bands of the balance
+    after retirement and the share of paths that run out of money before
+    the life expectancy. Those years draw from the streams of the years
+    after the accumulation ones, so the accumulation bands don't change
+    when the withdrawal phase is added.
+    """
+    check_options(distribution, history)
+
+    # Resolved once, so every year stream shares the entropy even without a seed
+    seed = np.random.default_rng(seed).bit_generator.seed_seq
+    years = np.arange(max(retirement_age - current_age, 0) + 1)
+    annual_income = monthly_income * 12 * growth_factors(income_growth_rate, years)
+    retirement_years = max(life_expectancy - retirement_age, 0) if life_expectancy is not None else None
+    drawn_years = years.size + (retirement_years or 0)
+    return_generators = year_generators(seed, RETURN_STREAM, 1, drawn_years)
+    inflation_generators = [] if distribution == 'bootstrap' else year_generators(seed, INFLATION_STREAM, 1, drawn_years)
+
+    # Stored year-major so percentiles partition contiguous rows
+    nominal = np.empty((years.size, n_paths))
+    real = np.empty((years.size, n_paths))
+    if retirement_years is not None:
+        retirement_nominal = np.empty((retirement_years + 1, n_paths))
+        retirement_real = np.empty((retirement_years + 1, n_paths))
+        depleted = 0
+
+    rates = (annual_return, inflation_rate, return_volatility, inflation_volatility, distribution, history)
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        # (years x paths) rates of the years after today, withdrawal years last
+        returns, inflation = rates_from_draws(
+            draw_years(return_generators, size, distribution, history),
+            draw_years(inflation_generators, size, distribution, history),
+            *rates
+        )
+
+        # Year 0 is today: no growth yet and today's prices
+        growth = np.ones((size, years.size))
+        growth[:, 1:] = 1 + returns[:years.size - 1].T / 100
+        price_level = np.ones((size, years.size))
+        price_level[:, 1:] = 1 + inflation[:years.size - 1].T / 100
+        price_level = np.cumprod(price_level, axis=1)
+
+        contributions = annual_income - monthly_expenses * 12 * price_level
+        chunk = slice(start, start + size)
+        values = accumulate(current_savings, contributions, growth)
+        nominal[:, chunk] = values.T
+        real[:, chunk] = (values / price_level).T
+
+        if retirement_years is not None:
+            retirement = withdraw(
+                values[:, -1], retirement_age, life_expectancy,
+                returns[years.size - 1:].T, inflation[years.size - 1:].T,
+                strategy=strategy, withdrawal_rate=withdrawal_rate, price_level=price_level[:, -1]
+            )
+            retirement_nominal[:, chunk] = retirement.balance.T
+            retirement_real[:, chunk] = retirement.real_balance.T
+            depleted += int(np.sum(retirement.depletion_age < life_expectancy))
+
+    success_probability = None
+    if target is not None:
+        success_probability = float(np.mean(real[-1] >= target))
+
+    retirement_fields = {}
+    if retirement_years is not None:
+        retirement_fields = dict(
+            retirement_ages=retirement_age + np.arange(retirement_years + 1),
+            retirement_nominal_bands=np.percentile(retirement_nominal, percentiles, axis=1),
+            retirement_real_bands=np.percentile(retirement_real, percentiles, axis=1),
+            depletion_probability=depleted / n_paths,
+        )
+
+    return MonteCarloResult(
+        ages=current_age + years,
+        percentiles=tuple(percentiles),
+        nominal_bands=np.percentile(nominal, percentiles, axis=1),
+        real_bands=np.percentile(real, percentiles, axis=1),
+        final_nominal=nominal[-1].copy(),
+        final_real=real[-1].copy(),
+        success_probability=success_probability,
+        **retirement_fields
+    )
@@ -0,0 +1,169 @@
+"""Projection with monthly (or daily) time steps and exact compounding.
+
+Unlike the annual projection, contributions are invested at the end of the
+month they are saved in and only earn returns from then on. Each step
+compounds with the step-equivalent of the annual return, (1 + r)^(1/n) - 1.
+Prices rise every step with the step-equivalent of the inflation rate, and
+income is raised once a year, one year after the start unless
+`first_raise_step` moves the raise to another point of the year.
+
+The recurrence V[s] = V[s-1] * g + c[s] is unrolled to
+V[s] = g^s * (S + sum_{k<=s} max(c[k], 0) * g^-k), so every step of every
+profile is computed with cumulative sums instead of a loop over months.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .batch import DEFAULT_CHUNK_SIZE, _as_profile_arrays
+from .projection import Projection
+
+MONTHLY = 12
+DAILY = 365
+
+StepProjection = namedtuple('StepProjection', [
+    'ages',
+    'income',
+    'expenses',
+    'contribution',
+    'nominal_value',
+    'real_value',
+    'steps_per_year',
+])
+
+
+def _step_flows(steps, steps_per_year, first_raise_step, monthly_income, income_growth_rate,
+                monthly_expenses, inflation_rate):
+    """Income and expenses of every step; rates broadcast against `steps`."""
+    raises = np.maximum((steps - first_raise_step) // steps_per_year + 1, 0)
+    income = monthly_income * 12 / steps_per_year * np.exp(raises * np.log1p(income_growth_rate / 100))
+    # Price level at the start of every step
+    expenses = monthly_expenses * 12 / steps_per_year * np.exp(steps / steps_per_year * np.log1p(inflation_rate / 100))
+    return income, expenses
+
+
+def project_steps(current_age, retirement_age, current_savings, monthly_income,
+                  income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                  steps_per_year=MONTHLY, first_raise_step=None):
+    """Project one profile step by step up to retirement.
+
+    Returns a StepProjection with one entry per step; ages and values are
+    taken at the end of each step.
+    """
+    if first_raise_step is None:
+        first_raise_step = steps_per_year
+    horizon = max(retirement_age - current_age, 0)
+    steps = np.arange(horizon * steps_per_year)
+
+    income, expenses = _step_flows(
+        steps, steps_per_year, first_raise_step, monthly_income,
+        income_growth_rate, monthly_expenses, inflation_rate
+    )
+    contribution = income - expenses
+
+    # g^(s+1) at the end of step s
+    log_growth = np.log1p(annual_return / 100) / steps_per_year
+    growth = np.exp((steps + 1) * log_growth)
+    nominal_value = growth * (current_savings + np.cumsum(np.maximum(contribution, 0) / growth))
+    real_value = nominal_value / np.exp((steps + 1) / steps_per_year * np.log1p(inflation_rate / 100))
+
+    return StepProjection(
+        ages=current_age + (steps + 1) / steps_per_year,
+        income=income,
+        expenses=expenses,
+        contribution=contribution,
+        nominal_value=nominal_value,
+        real_value=real_value,
+        steps_per_year=steps_per_year,
+    )
+
+
+def to_annual(step_projection, current_age, current_savings, monthly_income, monthly_expenses):
+    """Aggregate a StepProjection into the yearly rows of a Projection.
+
+    Row 0 is today, as in project(); every later row sums the income,
+    expenses and contributions of its year and holds the value at its end.
+    """
+    n = step_projection.steps_per_year
+
+    def yearly(values, reduce):
+        return reduce(values.reshape(-1, n), axis=1)
+
+    def year_end(values, today):
+        return np.concatenate([[today], values[n - 1::n]])
+
+    income = yearly(step_projection.income, np.sum)
+    expenses = yearly(step_projection.expenses, np.sum)
+    contribution = yearly(step_projection.contribution, np.sum)
+
+    return Projection(
+        ages=current_age + np.arange(income.size + 1),
+        annual_income=np.concatenate([[monthly_income * 12], income]),
+        annual_expenses=np.concatenate([[monthly_expenses * 12], expenses]),
+        annual_contribution=np.concatenate([[(monthly_income - monthly_expenses) * 12], contribution]),
+        nominal_value=year_end(step_projection.nominal_value, current_savings),
+        real_value=year_end(step_projection.real_value, current_savings),
+    )
+
+
+def project_monthly(current_age, retirement_age, current_savings, monthly_income,
+                    income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                    steps_per_year=MONTHLY, first_raise_step=None):
+    """Yearly Projection computed from the step-by-step engine."""
+    steps = project_steps(
+        current_age, retirement_age, current_savings, monthly_income, income_growth_rate,
+        monthly_expenses, annual_return, inflation_rate,
+        steps_per_year=steps_per_year, first_raise_step=first_raise_step
+    )
+    return to_annual(steps, current_age, current_savings, monthly_income, monthly_expenses)
+
+
+def final_values_batch(current_age, retirement_age, current_savings, monthly_income,
+                       income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                       steps_per_year=MONTHLY, first_raise_step=None, chunk_size=None):
+    """Final nominal and real capital of N profiles with step compounding.
+
+    Only the final values are needed, V[N] = g^N * (S + sum_k max(c[k], 0) * g^-k),
+    so each chunk keeps a single (profiles x steps) working array that is
+    updated in place. Chunks are sized so that array stays near the size of
+    the annual batch chunks, whatever the horizon and step length.
+    """
+    if first_raise_step is None:
+        first_raise_step = steps_per_year
+    (current_age, retirement_age, savings, income, income_growth,
+     expenses, annual_return, inflation) = _as_profile_arrays((
+        current_age, retirement_age, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    horizon_steps = np.maximum(retirement_age - current_age, 0).astype(int) * steps_per_year
+    n = horizon_steps.size
+    if chunk_size is None:
+        chunk_size = max(1, DEFAULT_CHUNK_SIZE * 40 // max(1, int(horizon_steps.max(initial=0))))
+
+    final_nominal = np.empty(n)
+    final_real = np.empty(n)
+    order = np.argsort(horizon_steps, kind='stable')
+    for start in range(0, n, chunk_size):
+        idx = order[start:start + chunk_size]
+        steps = np.arange(horizon_steps[idx[-1]])
+        column = (slice(None), np.newaxis)
+
+        # Working array: contributions, then their discounted positive part
+        flows, spent = _step_flows(
+            steps, steps_per_year, first_raise_step, income[idx][column],
+            income_growth[idx][column], expenses[idx][column], inflation[idx][column]
+        )
+        flows -= spent
+        del spent
+        np.maximum(flows, 0, out=flows)
+        flows[steps >= horizon_steps[idx][column]] = 0.0
+
+        log_growth = np.log1p(annual_return[idx] / 100) / steps_per_year
+        flows *= np.exp(-(steps + 1) * log_growth[column])
+        growth = np.exp(horizon_steps[idx] * log_growth)
+
+        final_nominal[idx] = growth * (savings[idx] + flows.sum(axis=1))
+        final_real[idx] = final_nominal[idx] / np.exp(
+            horizon_steps[idx] / steps_per_year * np.log1p(inflation[idx] / 100)
+        )
+    return final_nominal, final_real
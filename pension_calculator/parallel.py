@@ -0,0 +1,159 @@
+"""Monte Carlo over a whole book of profiles, sharded across processes.
+
+Profiles are split into shards that worker processes of a
+ProcessPoolExecutor simulate one profile at a time, so memory per worker
+is that of a single simulate() call whatever the size of the book. Each
+profile draws from its own stream, SeedSequence(seed, spawn_key=(i,)) for
+the profile at row i, so results don't depend on the shard size or the
+number of workers. Shards are submitted as earlier ones finish, at most
+SHARDS_PER_WORKER per worker in flight, so the profiles of a large book
+aren't all pickled and queued up front.
+
+Per-profile results are small and come back in full. The distribution of
+final real capital over every path of every profile is aggregated as a
+fixed-bin histogram: shards return bin counts that are simply added, and
+book-wide percentiles are read off the merged counts.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+import numpy as np
+
+from .batch import _as_profile_arrays
+from .montecarlo import DEFAULT_PERCENTILES, simulate
+from .projection import SAFE_WITHDRAWAL_RATE
+
+# Profiles per task sent to a worker
+DEFAULT_SHARD_SIZE = 64
+
+# Shards submitted but not yet collected, per worker; keeps every worker
+# busy while the next shard is queued
+SHARDS_PER_WORKER = 2
+
+# Log-spaced bins from 1 to 1e13 with about 0.5% relative width, plus one
+# bin below and one above. Book percentiles are accurate to about a bin.
+HISTOGRAM_EDGES = np.logspace(0, 13, 6001)
+
+BookResult = namedtuple('BookResult', [
+    'percentiles',
+    'final_real_bands',
+    'success_probability',
+    'depletion_probability',
+    'book_histogram',
+    'book_bands',
+])
+
+
+def histogram(values):
+    """Counts of `values` in the HISTOGRAM_EDGES bins (len(edges) + 1 bins)."""
+    return np.bincount(np.searchsorted(HISTOGRAM_EDGES, values, side='right'),
+                       minlength=HISTOGRAM_EDGES.size + 1)
+
+
+def histogram_percentiles(counts, percentiles):
+    """Approximate percentiles of the values behind merged histogram counts.
+
+    Interpolates geometrically inside the bin holding each percentile; values
+    below 1 and above the last edge are reported as the outermost edges.
+    """
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(percentiles, dtype=float) / 100 * (cumulative[-1] - 1)
+    bins = np.searchsorted(cumulative, ranks, side='right')
+    low = np.clip(bins - 1, 0, HISTOGRAM_EDGES.size - 1)
+    high = np.clip(bins, 0, HISTOGRAM_EDGES.size - 1)
+    before = np.where(bins > 0, cumulative[np.maximum(bins - 1, 0)], 0)
+    fraction = (ranks - before + 0.5) / np.maximum(counts[bins], 1)
+    fraction = np.clip(fraction, 0.0, 1.0)
+    return HISTOGRAM_EDGES[low] * (HISTOGRAM_EDGES[high] / HISTOGRAM_EDGES[low]) ** fraction
+
+
+def _simulate_shard(rows, profiles, seed, options):
+    """Simulate the profiles at `rows`; runs inside a worker process."""
+    percentiles = options['percentiles']
+    bands = np.empty((len(rows), len(percentiles)))
+    success = np.full(len(rows), np.nan)
+    depletion = np.full(len(rows), np.nan)
+    counts = np.zeros(HISTOGRAM_EDGES.size + 1, dtype=np.int64)
+
+    for k, row in enumerate(rows):
+        result = simulate(
+            *(int(column[k]) if i < 2 else float(column[k]) for i, column in enumerate(profiles)),
+            seed=np.random.SeedSequence(seed, spawn_key=(int(row),)),
+            **options
+        )
+        bands[k] = np.percentile(result.final_real, percentiles)
+        if result.success_probability is not None:
+            success[k] = result.success_probability
+        if result.depletion_probability is not None:
+            depletion[k] = result.depletion_probability
+        counts += histogram(result.final_real)
+    return rows, bands, success, depletion, counts
+
+
+def simulate_book(current_age, retirement_age, current_savings, monthly_income,
+                  income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                  seed=0, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                  percentiles=DEFAULT_PERCENTILES, return_volatility=15.0,
+                  inflation_volatility=1.5, n_paths=10000, distribution='lognormal',
+                  history=None, target=None, life_expectancy=None,
+                  strategy='constant_real', withdrawal_rate=SAFE_WITHDRAWAL_RATE):
+    """Run simulate() for every profile of a book, in parallel.
+
+    Inputs are profile columns as in project_batch(). `workers` defaults to
+    the number of CPUs; with 1 worker everything runs in this process.
+    Returns a BookResult with, per profile, percentiles of final real
+    capital and the success/depletion probabilities (NaN when no target or
+    life expectancy is given), plus the merged histogram of final real
+    capital over all paths and the book-wide percentiles read from it.
+    """
+    profiles = _as_profile_arrays((
+        current_age, retirement_age, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate
+    ))
+    n = profiles[0].size
+    workers = workers or os.cpu_count() or 1
+    options = dict(
+        percentiles=tuple(percentiles), return_volatility=return_volatility,
+        inflation_volatility=inflation_volatility, n_paths=n_paths, distribution=distribution,
+        history=history, target=target, life_expectancy=life_expectancy,
+        strategy=strategy, withdrawal_rate=withdrawal_rate,
+    )
+
+    bands = np.empty((n, len(percentiles)))
+    success = np.empty(n)
+    depletion = np.empty(n)
+    counts = np.zeros(HISTOGRAM_EDGES.size + 1, dtype=np.int64)
+
+    def collect(shard):
+        rows, shard_bands, shard_success, shard_depletion, shard_counts = shard
+        bands[rows] = shard_bands
+        success[rows] = shard_success
+        depletion[rows] = shard_depletion
+        counts[:] += shard_counts
+
+    shards = (np.arange(start, min(start + shard_size, n)) for start in range(0, n, shard_size))
+    if workers == 1:
+        for rows in shards:
+            collect(_simulate_shard(rows, [column[rows] for column in profiles], seed, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for rows in shards:
+                if len(pending) >= workers * SHARDS_PER_WORKER:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                pending.add(executor.submit(_simulate_shard, rows, [column[rows] for column in profiles],
+                                            seed, options))
+            for future in as_completed(pending):
+                collect(future.result())
+
+    return BookResult(
+        percentiles=tuple(percentiles),
+        final_real_bands=bands,
+        success_probability=success,
+        depletion_probability=depletion,
+        book_histogram=counts,
+        book_bands=histogram_percentiles(counts, percentiles) if n else np.full(len(percentiles), np.nan),
+    )
@@ -0,0 +1,207 @@
+"""Streaming batch projection of profile files larger than memory.
+
+Profiles are read a chunk of rows at a time (pandas chunked CSV, pyarrow
+record batches for Parquet), projected with project_batch() and appended to
+the output before the next chunk is read, so peak memory depends on the
+chunk size and not on the size of the file. Results keep the input order
+and carry the optional `id` column through.
+
+JSON input (a list of records) can't be read incrementally and is loaded
+whole; JSON output is written as a list of records, chunk by chunk.
+"""
+import csv
+import json
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from .accounts import TAX_PRESETS, project_accounts_batch
+from .batch import PROFILE_COLUMNS, project_batch
+from .projection import SAFE_WITHDRAWAL_RATE
+
+# Rows read, projected and written at a time
+DEFAULT_CHUNK_ROWS = 262144
+
+# Parquet is read through a buffered stream instead of pre-buffering whole
+# row groups, which otherwise keeps growing the reader's memory
+PARQUET_READ_BUFFER = 1 << 20
+
+PipelineStats = namedtuple('PipelineStats', ['rows', 'chunks', 'seconds', 'rows_per_second'])
+
+
+def read_profile_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield dicts of numpy columns (the profile columns and `id`, if any).
+
+    The columns are checked before any row is read, and a file without rows
+    yields one empty chunk, so the output keeps the same columns.
+    """
+    suffix = Path(path).suffix.lower()
+    wanted = ('id',) + PROFILE_COLUMNS
+    empty = True
+    if suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path, pre_buffer=False, buffer_size=PARQUET_READ_BUFFER)
+        columns = [name for name in wanted if name in parquet.schema_arrow.names]
+        _check_columns(path, columns)
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            empty = False
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in columns}
+    else:
+        import pandas as pd
+
+        if suffix == '.json':
+            frame = pd.read_json(path)
+            chunks = [frame]
+            # An empty list of records has no columns of its own
+            header = frame.columns if len(frame.columns) else PROFILE_COLUMNS
+        else:
+            header = pd.read_csv(path, nrows=0).columns
+            chunks = None
+        _check_columns(path, header)
+        columns = [name for name in wanted if name in header]
+        if chunks is None:
+            chunks = pd.read_csv(path, chunksize=chunk_rows, usecols=columns)
+        for chunk in chunks:
+            for start in range(0, len(chunk), chunk_rows):
+                part = chunk.iloc[start:start + chunk_rows]
+                empty = False
+                yield {name: part[name].to_numpy() for name in columns}
+    if empty:
+        yield {name: np.empty(0) for name in columns}
+
+
+def _check_columns(path, columns):
+    missing = [column for column in PROFILE_COLUMNS if column not in columns]
+    if missing:
+        raise SystemExit(f"{path} is missing columns: {', '.join(missing)}")
+
+
+class _CsvWriter:
+    def __init__(self, f):
+        self.f = f
+        self.writer = csv.writer(f)
+        self.header = False
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            self.pa = None
+        else:
+            self.pa = pa
+            self.pa_csv = pa_csv
+
+    def write(self, columns):
+        if self.pa is not None:
+            # Several times faster than the csv module on large chunks
+            sink = self.pa.BufferOutputStream()
+            options = self.pa_csv.WriteOptions(include_header=not self.header, quoting_style='needed')
+            self.pa_csv.write_csv(self.pa.table(columns), sink, write_options=options)
+            self.f.write(sink.getvalue().to_pybytes().decode())
+        else:
+            if not self.header:
+                self.writer.writerow(columns)
+            self.writer.writerows(zip(*(values.tolist() for values in columns.values())))
+        self.header = True
+
+    def close(self):
+        pass
+
+
+class _JsonWriter:
+    def __init__(self, f):
+        self.f = f
+        self.separator = '[\n'
+
+    def write(self, columns):
+        names = list(columns)
+        for row in zip(*(values.tolist() for values in columns.values())):
+            self.f.write(self.separator + json.dumps(dict(zip(names, row))))
+            self.separator = ',\n'
+
+    def close(self):
+        self.f.write('[]\n' if self.separator == '[\n' else '\n]\n')
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Writing Parquet requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, columns):
+        table = self.pa.table(columns)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _account_columns(accounts, result):
+    # Final balance of every account and the after-tax totals
+    names = [f'balance_{account.kind}' for account in accounts] + ['after_tax_nominal', 'after_tax_real']
+    return dict(zip(names, [*result.final_balances.T, result.after_tax_nominal, result.after_tax_real]))
+
+
+def run_pipeline(profiles_path, output_path, output_format, withdrawal_rate=SAFE_WITHDRAWAL_RATE,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, progress=None, tax_preset=None):
+    """Project every profile of `profiles_path` into `output_path`.
+
+    Text formats go to stdout when `output_path` is None. With a
+    `tax_preset` (a key of TAX_PRESETS), the final balance of every account
+    and the capital after withdrawal taxes are added to the result columns.
+    `progress`, if given, is called after every chunk with the PipelineStats
+    so far. Returns the final PipelineStats.
+    """
+    accounts = TAX_PRESETS[tax_preset] if tax_preset is not None else None
+    if output_format == 'parquet':
+        if output_path is None:
+            raise SystemExit("Parquet output needs --output")
+        writer = _ParquetWriter(output_path)
+        f = None
+    else:
+        f = open(output_path, 'w', newline='', encoding='utf-8') if output_path else sys.stdout
+        writer = _CsvWriter(f) if output_format == 'csv' else _JsonWriter(f)
+
+    start = time.perf_counter()
+    rows = chunks = 0
+    stats = PipelineStats(0, 0, 0.0, 0.0)
+    try:
+        for chunk in read_profile_chunks(profiles_path, chunk_rows):
+            result = project_batch(
+                *(chunk[column] for column in PROFILE_COLUMNS),
+                withdrawal_rate=withdrawal_rate
+            )
+            columns = {'id': chunk['id']} if 'id' in chunk else {}
+            columns.update(result._asdict())
+            if accounts is not None:
+                columns.update(_account_columns(accounts, project_accounts_batch(
+                    *(chunk[column] for column in PROFILE_COLUMNS),
+                    accounts=accounts
+                )))
+            writer.write(columns)
+
+            rows += len(chunk[PROFILE_COLUMNS[0]])
+            chunks += 1
+            seconds = time.perf_counter() - start
+            stats = PipelineStats(rows, chunks, seconds, rows / seconds if seconds else 0.0)
+            if progress is not None:
+                progress(stats)
+    finally:
+        writer.close()
+        if f is not None and f is not sys.stdout:
+            f.close()
+    return stats
+
@@ -0,0 +1,110 @@
+"""Capital projection engine shared by the Streamlit app and batch jobs.
+
+Nothing in here imports streamlit or plotly, so the same math that main.py
+renders can be reused from scripts without paying the UI startup cost.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Share of the final capital that can be withdrawn each year (4% rule)
+SAFE_WITHDRAWAL_RATE = 0.04
+
+Projection = namedtuple('Projection', [
+    'ages',
+    'annual_income',
+    'annual_expenses',
+    'annual_contribution',
+    'nominal_value',
+    'real_value',
+])
+
+Summary = namedtuple('Summary', [
+    'final_nominal',
+    'final_real',
+    'total_contributions',
+    'investment_gain',
+    'avg_annual_contribution',
+    'monthly_pension_nominal',
+    'monthly_pension_real',
+])
+
+
+def growth_factors(rate, years):
+    """Return (1 + rate/100) ** year for every year offset in `years`."""
+    return np.power(1 + np.asarray(rate, dtype=float) / 100, years)
+
+
+def accumulate(current_savings, contributions, growth):
+    """Roll savings forward with the contribution rule of the app.
+
+    Year 0 holds the starting savings; every following year the positive part
+    of that year's contribution is added and the sum grows by that year's
+    factor: V[t] = (V[t-1] + max(c[t], 0)) * g[t]. `contributions` and
+    `growth` share their last axis (years), `current_savings` broadcasts over
+    the leading ones. Growth factors must be strictly positive.
+
+    Unrolling the recurrence with P[t] = g[1] * ... * g[t] gives
+    V[t] = P[t] * (S + sum_{k<=t} max(c[k], 0) / P[k-1]), which is computed
+    with one cumprod and one cumsum instead of a Python loop over years.
+    """
+    contributions = np.asarray(contributions, dtype=float)
+    growth = np.broadcast_to(np.asarray(growth, dtype=float), contributions.shape).copy()
+    growth[..., 0] = 1.0
+    cumulative = np.cumprod(growth, axis=-1)
+
+    invested = np.maximum(contributions, 0)
+    invested[..., 0] = 0.0
+    # P[k-1]: cumulative growth up to the year before each contribution
+    invested[..., 1:] /= cumulative[..., :-1]
+
+    savings = np.asarray(current_savings, dtype=float)[..., np.newaxis]
+    return cumulative * (savings + np.cumsum(invested, axis=-1))
+
+
+def project(current_age, retirement_age, current_savings, monthly_income,
+            income_growth_rate, monthly_expenses, annual_return, inflation_rate):
+    """Project income, expenses, contributions and capital up to retirement.
+
+    Rates are given in percent, amounts per month as entered in the sidebar.
+    Returns a Projection of arrays with one entry per year from the current
+    age to the retirement age (inclusive).
+    """
+    years = np.arange(max(retirement_age - current_age, 0) + 1)
+
+    annual_income = monthly_income * 12 * growth_factors(income_growth_rate, years)
+    inflation = growth_factors(inflation_rate, years)
+    annual_expenses = monthly_expenses * 12 * inflation
+    annual_contribution = annual_income - annual_expenses
+
+    nominal_value = accumulate(current_savings, annual_contribution, 1 + annual_return / 100)
+    real_value = nominal_value / inflation
+
+    return Projection(
+        ages=current_age + years,
+        annual_income=annual_income,
+        annual_expenses=annual_expenses,
+        annual_contribution=annual_contribution,
+        nominal_value=nominal_value,
+        real_value=real_value,
+    )
+
+
+def summarize(projection, current_savings, withdrawal_rate=SAFE_WITHDRAWAL_RATE):
+    """Compute the summary metrics shown next to the forecast chart."""
+    contributions = projection.annual_contribution[1:]  # Skip year 0
+    positive = contributions[contributions > 0]
+
+    final_nominal = float(projection.nominal_value[-1])
+    final_real = float(projection.real_value[-1])
+    total_contributions = current_savings + float(contributions.sum())
+
+    return Summary(
+        final_nominal=final_nominal,
+        final_real=final_real,
+        total_contributions=total_contributions,
+        investment_gain=final_nominal - total_contributions,
+        avg_annual_contribution=float(positive.mean()) if positive.size else 0.0,
+        monthly_pension_nominal=final_nominal * withdrawal_rate / 12,
+        monthly_pension_real=final_real * withdrawal_rate / 12,
+    )
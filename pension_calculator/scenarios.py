@@ -0,0 +1,183 @@
+"""Saved scenarios in a local SQLite file, keyed by a hash of their inputs.
+
+A scenario is a set of profile inputs (PROFILE_COLUMNS plus the compounding
+step) with a user-facing name, saved by an owner: every method takes the
+owner and only sees that owner's scenarios, so one file can serve all the
+users of a deployment. Its key is the SHA-256 of the normalized inputs and
+ENGINE_VERSION, so saving the same inputs twice updates one entry and a
+scenario can be looked up without recomputing anything. The yearly arrays of its
+Projection are stored next to it as one blob of float64 rows, so reopening
+or comparing scenarios only reads them back. Bumping ENGINE_VERSION when
+the projection changes hides the arrays of older engines: names() only
+lists scenarios of the current one, and the old rows are evicted first.
+
+Reads refresh the entry's access time (at most once per ACCESS_RESOLUTION
+seconds, so repeated reruns don't write); when an owner has more than
+`max_entries` scenarios, their least recently used ones are evicted, and
+when the whole file has more than `max_total_entries`, the least recently
+used of any owner are. Without sign-in every session is a new owner whose
+scenarios nobody reads again, so only the store-wide limit bounds the file.
+Files written before scenarios had owners are cleared on opening, as
+their scenarios can't be attributed to anyone. Each call
+opens its own connection, so one store can be shared between the threads
+of a Streamlit server.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from contextlib import closing
+
+import numpy as np
+
+from .batch import PROFILE_COLUMNS
+from .projection import Projection
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.pension_calculator', 'scenarios.sqlite')
+DEFAULT_MAX_ENTRIES = 200
+# A yearly projection takes a few KiB, so this keeps the file to tens of MB
+DEFAULT_MAX_TOTAL_ENTRIES = 10000
+ACCESS_RESOLUTION = 60.0
+
+# Bumped when the table changes; older tables are dropped on opening
+SCHEMA_VERSION = 3
+
+# Bumped when the projection of the same inputs changes
+ENGINE_VERSION = 1
+
+Scenario = namedtuple('Scenario', ['key', 'name', 'inputs', 'projection'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    owner TEXT NOT NULL,
+    key TEXT NOT NULL,
+    engine INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    arrays BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (owner, key)
+)
+"""
+
+# Store-wide eviction walks the scenarios by access time
+ACCESSED_INDEX = "CREATE INDEX IF NOT EXISTS scenarios_accessed ON scenarios (accessed)"
+
+
+def normalize_inputs(inputs):
+    """Inputs with ages and the compounding step as int, rates and amounts as float."""
+    normalized = {
+        column: int(inputs[column]) if i < 2 else float(inputs[column])
+        for i, column in enumerate(PROFILE_COLUMNS)
+    }
+    normalized['steps_per_year'] = int(inputs.get('steps_per_year', 1))
+    return normalized
+
+
+def scenario_key(inputs):
+    """Content hash of the normalized inputs and the engine version."""
+    versioned = dict(normalize_inputs(inputs), engine=ENGINE_VERSION)
+    encoded = json.dumps(versioned, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _pack(projection):
+    return np.vstack(projection).astype('<f8').tobytes()
+
+
+def _unpack(blob):
+    arrays = np.frombuffer(blob, dtype='<f8').reshape(len(Projection._fields), -1)
+    return Projection(arrays[0].astype(int), *arrays[1:])
+
+
+class ScenarioStore:
+    """Scenarios persisted in the SQLite file at `path`."""
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_total_entries=DEFAULT_MAX_TOTAL_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_total_entries = max_total_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            # Write-ahead logging lets readers and a writer work concurrently
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS scenarios")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute(SCHEMA)
+                conn.execute(ACCESSED_INDEX)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        # Losing the last access-time updates on a power cut is fine; an
+        # fsync on every read is not
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return closing(conn)
+
+    def save(self, owner, name, inputs, projection):
+        """Store (or rename) `owner`'s scenario for `inputs`; returns its key."""
+        key = scenario_key(inputs)
+        now = time.time()
+        with self._connect() as conn, conn:
+            conn.execute(
+                "INSERT INTO scenarios (owner, key, engine, name, inputs, arrays, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(owner, key) DO UPDATE SET "
+                "name = excluded.name, arrays = excluded.arrays, accessed = excluded.accessed",
+                (owner, key, ENGINE_VERSION, name, json.dumps(normalize_inputs(inputs)), _pack(projection), now, now)
+            )
+            conn.execute(
+                "DELETE FROM scenarios WHERE owner = ? AND key IN "
+                "(SELECT key FROM scenarios WHERE owner = ? ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (owner, owner, self.max_entries)
+            )
+            conn.execute(
+                "DELETE FROM scenarios WHERE rowid IN "
+                "(SELECT rowid FROM scenarios ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_total_entries,)
+            )
+        return key
+
+    def load(self, owner, keys):
+        """`owner`'s scenarios for `keys`, in that order; unknown keys and older engines are skipped."""
+        keys = list(keys)
+        if not keys:
+            return []
+        placeholders = ','.join('?' * len(keys))
+        with self._connect() as conn, conn:
+            rows = conn.execute(
+                f"SELECT key, name, inputs, arrays FROM scenarios "
+                f"WHERE owner = ? AND engine = ? AND key IN ({placeholders})",
+                [owner, ENGINE_VERSION, *keys]
+            ).fetchall()
+            now = time.time()
+            conn.execute(
+                f"UPDATE scenarios SET accessed = ? WHERE owner = ? AND key IN ({placeholders}) AND accessed < ?",
+                [now, owner, *keys, now - ACCESS_RESOLUTION]
+            )
+        found = {key: Scenario(key, name, json.loads(inputs), _unpack(arrays)) for key, name, inputs, arrays in rows}
+        return [found[key] for key in keys if key in found]
+
+    def get(self, owner, inputs):
+        """`owner`'s stored scenario for `inputs`, or None."""
+        found = self.load(owner, [scenario_key(inputs)])
+        return found[0] if found else None
+
+    def names(self, owner):
+        """(key, name) of every scenario of `owner` saved by this engine, most recently used first."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT key, name FROM scenarios WHERE owner = ? AND engine = ? ORDER BY accessed DESC",
+                (owner, ENGINE_VERSION)
+            ).fetchall()
+
+    def delete(self, owner, key):
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM scenarios WHERE owner = ? AND key = ?", (owner, key))
@@ -0,0 +1,97 @@
+"""Sensitivity of the final real capital to the rate assumptions.
+
+The final capital of the projection is
+
+    V[T] = S * g^T + sum_k max(12 * (M * a^k - E * b^k), 0) * g^(T - k + 1)
+
+with g, a and b the growth factors of the return, income and inflation. For
+a grid of rates the contribution table only depends on (inflation, income
+growth) and the return weights only on the return, so the whole grid is one
+matrix product of a (returns x years) table with a (years x inflation *
+income growth) table, computed in chunks of inflation rates.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .batch import project_batch
+
+# Contribution table elements per chunk (years x inflation x income growth)
+DEFAULT_CHUNK_ELEMENTS = 4_000_000
+
+# Parameters varied by tornado(), with the default step in each direction
+TORNADO_STEPS = {
+    'annual_return': 1.0,
+    'inflation_rate': 1.0,
+    'income_growth_rate': 1.0,
+    'monthly_expenses': 500,
+    'current_savings': 10000,
+}
+
+TornadoBar = namedtuple('TornadoBar', ['parameter', 'low', 'high'])
+
+
+def sensitivity_grid(current_age, retirement_age, current_savings, monthly_income, monthly_expenses,
+                     annual_returns, inflation_rates, income_growth_rates,
+                     chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """Final real capital for every combination of the given rates (%).
+
+    Returns an array of shape (returns, inflation rates, income growth rates).
+    """
+    annual_returns = np.asarray(annual_returns, dtype=float)
+    inflation_rates = np.asarray(inflation_rates, dtype=float)
+    income_growth_rates = np.asarray(income_growth_rates, dtype=float)
+    horizon = max(retirement_age - current_age, 0)
+    years = np.arange(1, horizon + 1)
+
+    # (returns x years) weights g^(T - k + 1) and the growth of the savings g^T
+    log_return = np.log1p(annual_returns / 100)[:, np.newaxis]
+    weights = np.exp((horizon + 1 - years) * log_return)
+    savings = current_savings * np.exp(horizon * log_return)
+
+    income = monthly_income * 12 * np.exp(years * np.log1p(income_growth_rates / 100)[:, np.newaxis])
+    log_inflation = np.log1p(inflation_rates / 100)
+
+    grid = np.empty((annual_returns.size, inflation_rates.size, income_growth_rates.size))
+    step = max(1, chunk_elements // max(1, horizon * income_growth_rates.size))
+    for start in range(0, inflation_rates.size, step):
+        chunk = slice(start, start + step)
+        expenses = monthly_expenses * 12 * np.exp(years * log_inflation[chunk, np.newaxis])
+        # (inflation x income growth x years) positive contributions
+        contributions = np.maximum(income[np.newaxis, :, :] - expenses[:, np.newaxis, :], 0)
+        rows, columns = contributions.shape[:2]
+        nominal = weights @ contributions.reshape(rows * columns, horizon).T
+        nominal = nominal.reshape(annual_returns.size, rows, columns)
+        nominal += savings[:, :, np.newaxis]
+        grid[:, chunk] = nominal / np.exp(horizon * log_inflation[chunk])[:, np.newaxis]
+    return grid
+
+
+def tornado(current_age, retirement_age, current_savings, monthly_income, income_growth_rate,
+            monthly_expenses, annual_return, inflation_rate, steps=TORNADO_STEPS):
+    """Final real capital when each parameter moves one step down and up.
+
+    Returns TornadoBars sorted by the width of their swing, widest first.
+    """
+    base = dict(
+        current_age=current_age,
+        retirement_age=retirement_age,
+        current_savings=current_savings,
+        monthly_income=monthly_income,
+        income_growth_rate=income_growth_rate,
+        monthly_expenses=monthly_expenses,
+        annual_return=annual_return,
+        inflation_rate=inflation_rate,
+    )
+    # One batch row per (parameter, direction)
+    profiles = {name: np.full(2 * len(steps), value, dtype=float) for name, value in base.items()}
+    for i, (name, step) in enumerate(steps.items()):
+        profiles[name][2 * i] = max(base[name] - step, 0)
+        profiles[name][2 * i + 1] = base[name] + step
+
+    final_real = project_batch(**profiles).final_real
+    bars = [
+        TornadoBar(name, float(final_real[2 * i]), float(final_real[2 * i + 1]))
+        for i, name in enumerate(steps)
+    ]
+    return sorted(bars, key=lambda bar: abs(bar.high - bar.low), reverse=True)
@@ -0,0 +1,353 @@
+"""HTTP JSON API over the calculator, on asyncio and the standard library.
+
+    python -m pension_calculator serve --port 8000
+
+Endpoints (JSON in, JSON out; profile fields as in PROFILE_COLUMNS):
+
+    POST /project      one profile, optional "withdrawal_rate" and "table": true
+    POST /batch        {"profiles": [profile, ...], "withdrawal_rate": ...}
+    POST /montecarlo   one profile plus simulate() options (n_paths, seed, ...)
+    GET  /health
+
+Concurrent /project requests are coalesced: they wait until the end of the
+current event loop iteration (or `batch_window` seconds) and are projected
+together with a single project_batch() call. /project and /montecarlo
+responses are kept in an LRU cache keyed on the normalized inputs. Monte
+Carlo and large batches run in a thread so they don't hold up the loop.
+"""
+import asyncio
+import json
+import logging
+import math
+from collections import OrderedDict
+from http import HTTPStatus
+
+import numpy as np
+
+from .batch import PROFILE_COLUMNS, BatchResult, project_batch
+from .montecarlo import simulate
+from .projection import SAFE_WITHDRAWAL_RATE, project
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8000
+
+# Requests coalesced into one project_batch() call at most
+MAX_BATCH_SIZE = 4096
+
+# Cached /project and /montecarlo responses
+CACHE_MAX_ENTRIES = 4096
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_PATHS = 100000
+
+# Ages (and so horizons) are bounded: projections are (profiles x years)
+# arrays, and single /project requests run on the event loop
+MAX_AGE = 120
+
+# Rates (%) must stay above this; at -100% the growth factors hit zero
+MIN_RATE = -100.0
+RATE_COLUMNS = ('income_growth_rate', 'annual_return', 'inflation_rate')
+
+# Volatilities (percentage points) must stay within [0, MAX_VOLATILITY];
+# far larger values overflow the lognormal parameters
+MAX_VOLATILITY = 1000.0
+VOLATILITY_OPTIONS = ('return_volatility', 'inflation_volatility')
+
+# Bootstrap needs a history of returns, which requests don't carry
+API_DISTRIBUTIONS = ('normal', 'lognormal')
+
+MONTECARLO_OPTIONS = {
+    'return_volatility': float,
+    'inflation_volatility': float,
+    'n_paths': int,
+    'distribution': str,
+    'target': float,
+    'seed': int,
+    'life_expectancy': int,
+    'strategy': str,
+    'withdrawal_rate': float,
+}
+
+
+class RequestError(Exception):
+    """A client error, answered with status 400."""
+
+
+def _finite(name, value):
+    # float() accepts "nan" and "inf", which would come back as invalid JSON
+    if not math.isfinite(value):
+        raise RequestError(f"{name} must be a finite number")
+    return value
+
+
+def _integer(name, value):
+    # JSON true is an int to Python, and int() would truncate 32.9
+    if isinstance(value, bool):
+        raise RequestError(f"{name} must be a whole number")
+    number = float(value)
+    if number != int(number):
+        raise RequestError(f"{name} must be a whole number")
+    return int(number)
+
+
+def _profile(body):
+    """Profile values in PROFILE_COLUMNS order: ages as int, the rest float."""
+    if not isinstance(body, dict):
+        raise RequestError("Expected a JSON object")
+    missing = [column for column in PROFILE_COLUMNS if column not in body]
+    if missing:
+        raise RequestError(f"Missing fields: {', '.join(missing)}")
+    try:
+        values = tuple(
+            _integer(column, body[column]) if i < 2 else float(body[column])
+            for i, column in enumerate(PROFILE_COLUMNS)
+        )
+    except (TypeError, ValueError, OverflowError) as e:
+        raise RequestError(f"Invalid profile: {e}")
+    for column, value in zip(PROFILE_COLUMNS, values):
+        _finite(column, value)
+        if column in RATE_COLUMNS and value <= MIN_RATE:
+            raise RequestError(f"{column} must be above {MIN_RATE:g}")
+    if not 0 <= values[0] < values[1] <= MAX_AGE:
+        raise RequestError(f"Ages must satisfy 0 <= current_age < retirement_age <= {MAX_AGE}")
+    return values
+
+
+def _withdrawal_rate(body):
+    try:
+        withdrawal_rate = float(body.get('withdrawal_rate', SAFE_WITHDRAWAL_RATE))
+    except (TypeError, ValueError):
+        raise RequestError("Invalid withdrawal_rate")
+    return _finite('withdrawal_rate', withdrawal_rate)
+
+
+def _floats(values):
+    return np.asarray(values, dtype=float).tolist()
+
+
+class _MicroBatcher:
+    """Collects single-profile projections and runs them as one batch."""
+
+    def __init__(self, window, max_size):
+        self.window = window
+        self.max_size = max_size
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+
+    def submit(self, profile, withdrawal_rate):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((profile, withdrawal_rate, future))
+        if len(self.pending) >= self.max_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending = self.pending, []
+        by_rate = {}
+        for entry in pending:
+            by_rate.setdefault(entry[1], []).append(entry)
+        for withdrawal_rate, entries in by_rate.items():
+            self.batches += 1
+            columns = np.array([profile for profile, _, _ in entries]).T
+            try:
+                result = project_batch(*columns, withdrawal_rate=withdrawal_rate)
+            except Exception as e:
+                for _, _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for i, (_, _, future) in enumerate(entries):
+                if not future.done():
+                    future.set_result({name: float(values[i]) for name, values in zip(BatchResult._fields, result)})
+
+
+class CalculatorServer:
+    """Routes requests to the engine; one instance serves all connections."""
+
+    def __init__(self, batch_window=0.0, max_batch_size=MAX_BATCH_SIZE, cache_max_entries=CACHE_MAX_ENTRIES):
+        self.batcher = _MicroBatcher(batch_window, max_batch_size)
+        self.cache = OrderedDict()
+        self.cache_max_entries = cache_max_entries
+        self.requests = 0
+
+    async def _cached(self, key, compute):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        response = await compute()
+        if self.cache_max_entries:
+            self.cache[key] = response
+            if len(self.cache) > self.cache_max_entries:
+                self.cache.popitem(last=False)
+        return response
+
+    async def project(self, body):
+        profile = _profile(body)
+        withdrawal_rate = _withdrawal_rate(body)
+        table = bool(body.get('table', False))
+
+        async def compute():
+            response = await self.batcher.submit(profile, withdrawal_rate)
+            if table:
+                projection = project(*profile)
+                response = dict(response, table={
+                    'age': projection.ages.tolist(),
+                    **{name: _floats(values) for name, values in zip(projection._fields[1:], projection[1:])},
+                })
+            return response
+
+        return await self._cached(('project', profile, withdrawal_rate, table), compute)
+
+    async def batch(self, body):
+        if not isinstance(body, dict) or not isinstance(body.get('profiles'), list):
+            raise RequestError('Expected {"profiles": [...]}')
+        profiles = [_profile(profile) for profile in body['profiles']]
+        withdrawal_rate = _withdrawal_rate(body)
+        if not profiles:
+            return {'results': []}
+        columns = np.array(profiles).T
+        result = await asyncio.to_thread(project_batch, *columns, withdrawal_rate=withdrawal_rate)
+        return {'results': [dict(zip(BatchResult._fields, row)) for row in zip(*(_floats(v) for v in result))]}
+
+    async def montecarlo(self, body):
+        profile = _profile(body)
+        options = {}
+        for name, kind in MONTECARLO_OPTIONS.items():
+            if body.get(name) is not None:
+                try:
+                    options[name] = _integer(name, body[name]) if kind is int else kind(body[name])
+                except (TypeError, ValueError, OverflowError):
+                    raise RequestError(f"Invalid {name}")
+                if kind is float:
+                    _finite(name, options[name])
+                if name in VOLATILITY_OPTIONS and not 0 <= options[name] <= MAX_VOLATILITY:
+                    raise RequestError(f"{name} must be between 0 and {MAX_VOLATILITY:g}")
+        if not profile[1] <= options.get('life_expectancy', profile[1]) <= MAX_AGE:
+            raise RequestError(f"life_expectancy must be between retirement_age and {MAX_AGE}")
+        if not 0 < options.get('n_paths', 10000) <= MAX_PATHS:
+            raise RequestError(f"n_paths must be between 1 and {MAX_PATHS}")
+        if options.get('distribution', 'lognormal') not in API_DISTRIBUTIONS:
+            raise RequestError(f"distribution must be one of {', '.join(API_DISTRIBUTIONS)}")
+        options.setdefault('seed', 0)
+
+        async def compute():
+            result = await asyncio.to_thread(simulate, *profile, **options)
+            response = {
+                'ages': result.ages.tolist(),
+                'percentiles': list(result.percentiles),
+                'nominal_bands': _floats(result.nominal_bands),
+                'real_bands': _floats(result.real_bands),
+                'success_probability': result.success_probability,
+            }
+            if result.depletion_probability is not None:
+                response.update(
+                    retirement_ages=result.retirement_ages.tolist(),
+                    retirement_real_bands=_floats(result.retirement_real_bands),
+                    depletion_probability=result.depletion_probability,
+                )
+            return response
+
+        return await self._cached(('montecarlo', profile, tuple(sorted(options.items()))), compute)
+
+    async def route(self, method, path, body):
+        """Return (status, JSON-serializable payload) for one request."""
+        path = path.split('?', 1)[0]
+        if path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'requests': self.requests, 'batches': self.batcher.batches}
+        endpoints = {'/project': self.project, '/batch': self.batch, '/montecarlo': self.montecarlo}
+        if path not in endpoints:
+            return HTTPStatus.NOT_FOUND, {'error': f"Unknown endpoint {path}"}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Use POST"}
+        try:
+            return HTTPStatus.OK, await endpoints[path](json.loads(body or b'{}'))
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Invalid JSON: {e}"}
+        except (RequestError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+        except Exception:
+            # Anything else is a bug; answer it rather than drop the connection
+            logger.exception("Error serving %s %s", method, path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error"}
+
+    async def handle(self, reader, writer):
+        """Serve one connection, with HTTP/1.1 keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get('content-length', '0') or '0'
+                length = int(length) if length.isascii() and length.isdigit() else None
+                if length is None:
+                    # The body can't be delimited, so the connection can't be reused
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': "Invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    self.requests += 1
+                    status, payload = await self.route(method, path, body)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                try:
+                    content = json.dumps(payload, allow_nan=False).encode()
+                except ValueError:
+                    # Finite inputs so large that the results overflow
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': "Inputs out of range: result is not finite"}
+                    content = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+        """Serve until cancelled; `ready`, if given, is called with the bound port."""
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+def run(host='127.0.0.1', port=DEFAULT_PORT, **options):
+    """Run the API server in the foreground."""
+    def ready(bound_port):
+        print(f"Serving on http://{host}:{bound_port}", flush=True)
+
+    try:
+        asyncio.run(CalculatorServer(**options).serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
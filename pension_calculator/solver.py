@@ -0,0 +1,111 @@
+"""Goal seek: which input reaches a target monthly pension.
+
+Every solver evaluates many candidate values at once through project_batch
+and narrows the bracket around the first candidate that reaches the target,
+so a solve takes a handful of vectorized calls instead of dozens of reruns.
+The pension is the monthly withdrawal under `withdrawal_rate` (4% rule by
+default), in today's money when `real` is true.
+"""
+import math
+
+import numpy as np
+
+from .batch import project_batch
+from .projection import SAFE_WITHDRAWAL_RATE
+
+# Candidates evaluated per refinement step
+CANDIDATES = 64
+
+# Upper bound searched for the required annual return (%)
+MAX_ANNUAL_RETURN = 100.0
+
+
+def _pension(result, real):
+    return result.monthly_pension_real if real else result.monthly_pension_nominal
+
+
+def _first_reaching(values, target):
+    # Index of the first candidate reaching the target, or None
+    reached = np.flatnonzero(values >= target)
+    return int(reached[0]) if reached.size else None
+
+
+def _refine(pension_of, target, lo, hi, tolerance):
+    """Smallest x in [lo, hi] with pension_of(x) >= target, pension increasing in x.
+
+    Assumes pension_of(hi) reaches the target. Each step evaluates CANDIDATES
+    points and keeps the interval around the first one reaching the target.
+    Stops early once the interval can't shrink, when `tolerance` is below
+    the float spacing at the answer.
+    """
+    if pension_of(np.array([lo]))[0] >= target:
+        return lo
+    while hi - lo > tolerance:
+        candidates = np.linspace(lo, hi, CANDIDATES)
+        first = _first_reaching(pension_of(candidates), target)
+        if candidates[first - 1] == lo and candidates[first] == hi:
+            break
+        lo, hi = candidates[first - 1], candidates[first]
+    return float(hi)
+
+
+def required_expenses(target_pension, current_age, retirement_age, current_savings, monthly_income,
+                      income_growth_rate, annual_return, inflation_rate, real=True,
+                      withdrawal_rate=SAFE_WITHDRAWAL_RATE, tolerance=0.01):
+    """Highest monthly expenses that still reach the target pension.
+
+    Returns math.inf when the current savings alone are enough and None when
+    the target can't be reached even with zero expenses.
+    """
+    def pension_of(negated_expenses):
+        return _pension(project_batch(
+            current_age, retirement_age, current_savings, monthly_income,
+            income_growth_rate, -negated_expenses, annual_return, inflation_rate,
+            withdrawal_rate=withdrawal_rate
+        ), real)
+
+    # Expenses above this leave no surplus in any year, so only savings grow
+    years = max(retirement_age - current_age, 0)
+    no_surplus = monthly_income * max(1.0, ((1 + income_growth_rate / 100) / (1 + inflation_rate / 100)) ** years)
+
+    # Searched on negated expenses so the pension increases with the variable
+    bounds = pension_of(np.array([-no_surplus, 0.0]))
+    if bounds[0] >= target_pension:
+        return math.inf
+    if bounds[1] < target_pension:
+        return None
+    return -_refine(pension_of, target_pension, -no_surplus, 0.0, tolerance)
+
+
+def required_return(target_pension, current_age, retirement_age, current_savings, monthly_income,
+                    income_growth_rate, monthly_expenses, inflation_rate, real=True,
+                    withdrawal_rate=SAFE_WITHDRAWAL_RATE, tolerance=0.001):
+    """Lowest annual return (%) that reaches the target pension, or None."""
+    def pension_of(annual_return):
+        return _pension(project_batch(
+            current_age, retirement_age, current_savings, monthly_income,
+            income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+            withdrawal_rate=withdrawal_rate
+        ), real)
+
+    if pension_of(np.array([MAX_ANNUAL_RETURN]))[0] < target_pension:
+        return None
+    return _refine(pension_of, target_pension, 0.0, MAX_ANNUAL_RETURN, tolerance)
+
+
+def earliest_retirement_age(target_pension, current_age, current_savings, monthly_income,
+                            income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+                            real=True, withdrawal_rate=SAFE_WITHDRAWAL_RATE, max_age=100):
+    """First retirement age up to `max_age` that reaches the target pension, or None.
+
+    All candidate ages are projected in one batch call; the real pension
+    isn't necessarily monotonic in the age when returns trail inflation.
+    """
+    ages = np.arange(current_age + 1, max_age + 1)
+    pensions = _pension(project_batch(
+        current_age, ages, current_savings, monthly_income,
+        income_growth_rate, monthly_expenses, annual_return, inflation_rate,
+        withdrawal_rate=withdrawal_rate
+    ), real)
+    first = _first_reaching(pensions, target_pension)
+    return None if first is None else int(ages[first])
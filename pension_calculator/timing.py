@@ -0,0 +1,84 @@
+"""Opt-in timing of the stages of one page rerun.
+
+A RenderTimer records laps: each call to lap(stage) stores the time since
+the previous lap under that stage name, so a script can be instrumented by
+dropping lap() calls between its steps without re-indenting them. Laps with
+the same name add up. When disabled, lap() returns straight away and
+nothing is recorded, so the calls can stay in the page.
+
+finish() logs the rerun as one JSON record on the `pension_calculator.timing`
+logger and, when a profile directory is set, stops the cProfile profiler
+started with the timer and dumps its stats there, one .prof file per rerun
+(open them with `python -m pstats` or snakeviz). It has to run however the
+rerun ends (st.stop(), an error, an interrupted rerun), so call it from a
+`finally`; since Python 3.12 a profiler left enabled blocks every other
+one. When another profiler is already active (e.g. a concurrent profiled
+rerun), the timer still records laps but skips the profile.
+"""
+import cProfile
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RenderTimer:
+    """Laps between named points of a rerun; does nothing when disabled."""
+
+    def __init__(self, enabled=False, profile_dir=None):
+        self.enabled = enabled
+        self.laps = {}
+        # Logged with the laps by finish(), e.g. the inputs of the rerun
+        self.context = {}
+        self.profile_path = None
+        self._profiler = None
+        self._finished = False
+        if not enabled:
+            return
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as error:
+                logger.warning("rerun not profiled: %s", error)
+            else:
+                self._profiler = profiler
+                self.profile_path = os.path.join(
+                    profile_dir, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{time.perf_counter_ns()}.prof"
+                )
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        """Add the time since the previous lap to `stage`."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.laps[stage] = self.laps.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self._start if self.enabled else 0.0
+
+    def finish(self, **context):
+        """Stop profiling and log the laps with self.context and `context`.
+
+        Only the first call does anything.
+        """
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        logger.info(json.dumps({
+            'total_ms': round(self.total * 1000, 3),
+            'stages_ms': {stage: round(seconds * 1000, 3) for stage, seconds in self.laps.items()},
+            'profile': self.profile_path,
+            **self.context,
+            **context,
+        }, default=str))
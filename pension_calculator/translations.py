@@ -0,0 +1,616 @@
+"""UI strings and default inputs for every language of the Streamlit app.
+
+Kept in a module so they are built once per process instead of on every
+rerun of main.py.
+"""
+
+# Display name of every language
+LANGUAGE_NAMES = {'en': 'English', 'pl': 'Polski', 'zh': '中文'}
+
+# Translations dictionary
+translations = {
+    'en': {
+        'page_title': 'Retirement Calculator',
+        'page_icon': '📈',
+        'main_title': '📈 Retirement Calculator',
+        'sidebar_options': '⚙️ Options',
+        'language_select': 'Select Language:',
+        'current_age': 'Enter your current age:',
+        'retirement_age': 'Enter the age you plan to retire:',
+        'income_params': '💰 Income Parameters',
+        'current_savings': 'Current savings (USD):',
+        'current_savings_help': 'Amount you already have saved',
+        'monthly_income': 'Current monthly net income (USD):',
+        'monthly_income_help': 'Monthly income including bonuses, tax refunds, etc.',
+        'income_growth': 'Expected income growth (% annually):',
+        'income_growth_help': 'Average annual income growth (e.g., promotions, wage inflation)',
+        'expense_params': '🏠 Expense Parameters',
+        'monthly_expenses': 'Current monthly expenses (USD):',
+        'monthly_expenses_help': 'All monthly living costs',
+        'investment_params': '📈 Investment Parameters',
+        'annual_return': 'Expected annual return (%):',
+        'annual_return_help': 'Average annual return on investments',
+        'inflation_rate': 'Inflation rate (%):',
+        'inflation_help': 'Expected average annual inflation (expense growth)',
+        'capital_forecast': '📊 Capital Growth Forecast',
+        'monthly_surplus': '💰 **Current monthly surplus for savings:**',
+        'age_col': 'Age',
+        'annual_income_col': 'Annual Income',
+        'annual_expenses_col': 'Annual Expenses',
+        'annual_contribution_col': 'Annual Contribution',
+        'nominal_value_col': 'Nominal Value',
+        'real_value_col': 'Real Value',
+        'detailed_data': '📋 Detailed Data',
+        'summary': '📈 Summary',
+        'retirement_capital': 'Retirement Capital',
+        'real_value': 'Real Value',
+        'total_contributions': 'Total Contributions',
+        'avg_annual_contribution': 'Average Annual Contribution',
+        'investment_gain': 'Investment Gain',
+        'additional_info': '💡 Additional Information',
+        'retirement_year_info': '**In retirement year ({} years old):**',
+        'income_label': 'Income',
+        'expenses_label': 'Expenses',
+        'surplus_label': 'Surplus',
+        'monthly_pension_4pct': '**Monthly pension (4% rule):**',
+        'current_purchasing_power': '**This equals today:**',
+        'expense_coverage': '**Coverage of current expenses:**',
+        'doubling_time': '**Capital doubling time:**',
+        'retirement_tips': '💡 Retirement Tips',
+        'rule_4pct_title': '🎯 4% Rule',
+        'rule_4pct_desc': 'Safe annual withdrawal is 4% of accumulated capital. This means you need 25x your annual expenses.',
+        'diversification_title': '📊 Diversification',
+        'diversification_desc': 'Spread investments across different asset classes: stocks, bonds, real estate, commodities.',
+        'time_money_title': '⏰ Time is Money',
+        'time_money_desc': 'The earlier you start, the more you benefit from compound interest. Every year matters!',
+        'error_age': '⚠️ Retirement age must be higher than current age!',
+        'error_no_surplus': '⚠️ Current expenses exceed income! No surplus for savings.',
+        'nominal_value_chart': 'Nominal Value',
+        'real_value_chart': 'Real Value (after inflation)',
+        'chart_title': 'Retirement Capital Growth ({} years)',
+        'chart_age': 'Age',
+        'chart_value': 'Value (USD)',
+        'chart_hover_age': 'Age',
+        'chart_hover_value': 'Value',
+        'chart_hover_real_value': 'Real Value',
+        'currency': 'USD',
+        'years_suffix': 'years',
+        'purchasing_power': 'purchasing power',
+        'monte_carlo_params': '🎲 Monte Carlo Simulation',
+        'monte_carlo_enable': 'Simulate market uncertainty',
+        'monte_carlo_enable_help': 'Simulate thousands of random paths of returns and inflation',
+        'return_volatility': 'Return volatility (% annually):',
+        'return_volatility_help': 'Standard deviation of yearly investment returns',
+        'inflation_volatility': 'Inflation volatility (% annually):',
+        'inflation_volatility_help': 'Standard deviation of yearly inflation',
+        'simulation_paths': 'Number of simulated paths:',
+        'distribution': 'Distribution of returns:',
+        'distribution_normal': 'Normal',
+        'distribution_lognormal': 'Lognormal',
+        'target_capital': "Target capital (today's value, USD):",
+        'target_capital_help': 'Real capital you want to have at retirement',
+        'mc_nominal_band_chart': 'Nominal Value (P5–P95)',
+        'mc_real_band_chart': 'Real Value (P5–P95)',
+        'mc_results': '🎲 Simulation Results',
+        'mc_percentiles': '**Retirement capital P5 / P50 / P95:**',
+        'mc_real_percentiles': '**Real value P5 / P50 / P95:**',
+        'mc_success_probability': '**Probability of reaching target:**',
+        'retirement_phase': '🏖️ Retirement Phase',
+        'life_expectancy': 'Life expectancy (age):',
+        'life_expectancy_help': 'Age up to which withdrawals are simulated',
+        'withdrawal_strategy': 'Withdrawal strategy:',
+        'withdrawal_strategy_help': 'How much is withdrawn from the capital every year in retirement',
+        'strategy_constant_real': 'Constant amount adjusted for inflation',
+        'strategy_fixed_percentage': 'Fixed percentage of balance',
+        'strategy_guardrails': 'Guardrails',
+        'strategy_vpw': 'Variable percentage withdrawal (VPW)',
+        'withdrawal_rate': 'Initial withdrawal rate (%):',
+        'withdrawal_rate_help': 'Share of the retirement capital withdrawn in the first year',
+        'retirement_nominal_chart': 'Nominal Value in retirement',
+        'retirement_real_chart': 'Real Value in retirement',
+        'depletion_age': '**Capital depleted at age:**',
+        'capital_lasts': '**Capital lasts until age {}**',
+        'remaining_balance': '**Remaining capital at {} years old:**',
+        'mc_depletion_probability': '**Probability of running out before life expectancy:**',
+        'goal_seek': '🎯 Goal Seek',
+        'target_pension': 'Target monthly pension (USD):',
+        'target_pension_help': 'Monthly pension you want to receive, using the withdrawal rate from the sidebar',
+        'target_pension_real': "In today's money",
+        'max_monthly_expenses': '**Maximum monthly expenses:**',
+        'expense_cut': 'cut of {} vs now',
+        'required_return': '**Required annual return:**',
+        'earliest_retirement': '**Earliest retirement age:**',
+        'goal_unreachable': 'not reachable',
+        'goal_met_by_savings': 'reached by current savings alone',
+        'sensitivity': '🌡️ Sensitivity Analysis',
+        'sensitivity_heatmap_tab': 'Return × Inflation',
+        'sensitivity_tornado_tab': 'Tornado',
+        'heatmap_title': 'Real capital at retirement (income growth {:.1f}%)',
+        'heatmap_return': 'Annual return (%)',
+        'heatmap_inflation': 'Inflation (%)',
+        'tornado_title': 'Change in real capital when one input changes',
+        'tornado_lower': 'Lower value',
+        'tornado_higher': 'Higher value',
+        'current_inputs': 'Current inputs',
+        'param_annual_return': 'Annual return ±1 pp',
+        'param_inflation_rate': 'Inflation ±1 pp',
+        'param_income_growth_rate': 'Income growth ±1 pp',
+        'param_monthly_expenses': 'Monthly expenses ±500',
+        'param_current_savings': 'Current savings ±10,000',
+        'table_page': 'Page (of {}):',
+        'time_step': 'Compounding step',
+        'time_step_1': 'Yearly',
+        'time_step_12': 'Monthly',
+        'time_step_365': 'Daily',
+        'time_step_help': "Yearly adds the whole year of savings before a full year of returns. Monthly and daily invest each month's savings as they come, compound returns and inflation every step and give the raise once a year; the table and chart show the yearly totals.",
+        'debug_timing': '⏱️ Render timing',
+        'debug_stage': 'Stage',
+        'debug_total': 'Total: {:.1f} ms',
+        'debug_profile': 'Profile: {}',
+        'scenarios': '💾 Scenarios',
+        'scenario_name': 'Scenario name',
+        'scenario_default_name': 'Retire at {}, {:.1f}% return',
+        'scenario_save': 'Save scenario',
+        'scenario_save_help': 'Saves the current inputs and their yearly forecast for comparison',
+        'scenario_saved': 'Saved "{}"',
+        'scenario_compare': '🔀 Scenario Comparison',
+        'scenario_compare_select': 'Compare with saved scenarios',
+        'scenario_compare_placeholder': 'Choose scenarios',
+        'scenario_none': 'No saved scenarios yet',
+        'scenario_current': 'Current inputs',
+        'scenario_chart_title': 'Real capital by scenario',
+        'scenario_retirement_age': 'Retirement age',
+        'scenario_pension_real': "Monthly pension (today's prices)",
+        'backtest_params': '📜 Historical Backtest',
+        'backtest_enable': 'Backtest on historical returns',
+        'backtest_enable_help': 'Run the plan over every historical period of the same length, with the stock, bond and inflation figures of those years',
+        'backtest_missing': 'No historical dataset at {}; build it with `python -m pension_calculator history`',
+        'stock_allocation': 'Stock allocation (%)',
+        'stock_allocation_help': 'Share of the portfolio in stocks, the rest in bonds, rebalanced yearly',
+        'backtest_too_long': 'The historical dataset covers {} years, fewer than the years to retirement',
+        'backtest_worst_chart': 'Worst period, real ({})',
+        'backtest_best_chart': 'Best period, real ({})',
+        'backtest_results': '📜 Historical Backtest',
+        'backtest_success_rate': '**Periods that fund current expenses:**',
+        'backtest_periods': '{} of {} periods, target {:,.0f} {}',
+        'backtest_worst': '**Worst period (real value):**',
+        'backtest_best': '**Best period (real value):**',
+        'tax_params': '🧾 Taxes and Accounts',
+        'tax_enable': 'Model taxes and account limits',
+        'tax_enable_help': 'Split savings over a 401(k), a Roth IRA and a brokerage account up to their yearly limits, with tax relief on 401(k) deposits, tax on brokerage returns and tax on 401(k) payouts (approximate US rules, 22% bracket)',
+        'account_tax_deferred': '401(k) (tax-deferred)',
+        'account_tax_free': 'Roth IRA (tax-free)',
+        'account_taxable': 'Brokerage (taxable)',
+        'tax_results': '🧾 After Taxes',
+        'after_tax_capital': 'After-tax capital',
+        'after_tax_capital_help': 'Capital of all accounts after tax on payout',
+        'after_tax_real': 'After-tax real value',
+        'after_tax_real_help': "After-tax capital in today's prices",
+        'after_tax_real_chart': 'After-tax Real Value',
+        'account_col': 'Account',
+        'account_cap_col': 'Yearly limit (today)',
+        'account_deposits_col': 'Deposits',
+        'account_balance_col': 'Balance',
+        'account_after_tax_col': 'After tax',
+        'savings_rate': '**Savings rate (share of income saved):**',
+        'savings_rate_value': '{:.1%} today, {:.1%} in the retirement year',
+        'years_to_fi': '**Financial independence (withdrawals cover expenses):**',
+        'years_to_fi_value': 'in {:.0f} years, at age {:.0f}',
+        'years_to_fi_never': 'not within {} years',
+        'after_tax_return': 'After-tax return on savings',
+        'after_tax_return_help': 'Money-weighted annual return (IRR) of the money you saved, after taxes and including tax relief on deposits'
+    },
+    'pl': {
+        'page_title': 'Kalkulator emerytalny',
+        'page_icon': '📈',
+        'main_title': '📈 Kalkulator emerytalny',
+        'sidebar_options': '⚙️ Opcje',
+        'language_select': 'Wybierz język:',
+        'current_age': 'Podaj swój obecny wiek:',
+        'retirement_age': 'Podaj wiek, w którym planujesz przejść na emeryturę:',
+        'income_params': '💰 Parametry dochodowe',
+        'current_savings': 'Obecne oszczędności (PLN):',
+        'current_savings_help': 'Kwota, którą już masz zaoszczędzoną',
+        'monthly_income': 'Obecne miesięczne wynagrodzenie netto (PLN):',
+        'monthly_income_help': 'Miesięczne wynagrodzenie uwzględniające premie, zwroty podatku itp.',
+        'income_growth': 'Prognozowany wzrost wynagrodzenia (% rocznie):',
+        'income_growth_help': 'Średni roczny wzrost wynagrodzenia (np. awanse, inflacja płac)',
+        'expense_params': '🏠 Parametry wydatków',
+        'monthly_expenses': 'Obecne miesięczne wydatki (PLN):',
+        'monthly_expenses_help': 'Wszystkie miesięczne koszty życia',
+        'investment_params': '📈 Parametry inwestycyjne',
+        'annual_return': 'Oczekiwany roczny zwrot (%):',
+        'annual_return_help': 'Średni roczny zwrot z inwestycji',
+        'inflation_rate': 'Stopa inflacji (%):',
+        'inflation_help': 'Oczekiwana średnia roczna inflacja (wzrost wydatków)',
+        'capital_forecast': '📊 Prognoza wzrostu kapitału',
+        'monthly_surplus': '💰 **Obecna miesięczna nadwyżka do oszczędzania:**',
+        'age_col': 'Wiek',
+        'annual_income_col': 'Roczny dochód',
+        'annual_expenses_col': 'Roczne wydatki',
+        'annual_contribution_col': 'Roczna wpłata',
+        'nominal_value_col': 'Wartość nominalna',
+        'real_value_col': 'Wartość realna',
+        'detailed_data': '📋 Szczegółowe dane',
+        'summary': '📈 Podsumowanie',
+        'retirement_capital': 'Kapitał na emeryturze',
+        'real_value': 'Wartość realna',
+        'total_contributions': 'Całkowite wpłaty',
+        'avg_annual_contribution': 'Średnia roczna wpłata',
+        'investment_gain': 'Zysk z inwestycji',
+        'additional_info': '💡 Dodatkowe informacje',
+        'retirement_year_info': '**W roku emerytury ({} lat):**',
+        'income_label': 'Dochód',
+        'expenses_label': 'Wydatki',
+        'surplus_label': 'Nadwyżka',
+        'monthly_pension_4pct': '**Miesięczna emerytura (4% reguła):**',
+        'current_purchasing_power': '**To odpowiada dzisiaj:**',
+        'expense_coverage': '**Pokrycie obecnych wydatków:**',
+        'doubling_time': '**Czas podwojenia kapitału:**',
+        'retirement_tips': '💡 Porady emerytalne',
+        'rule_4pct_title': '🎯 Zasada 4%',
+        'rule_4pct_desc': 'Bezpieczna roczna wypłata to 4% zgromadzonego kapitału. To oznacza, że potrzebujesz 25x swoich rocznych wydatków.',
+        'diversification_title': '📊 Dywersyfikacja',
+        'diversification_desc': 'Rozłóż inwestycje między różne klasy aktywów: akcje, obligacje, nieruchomości, surowce.',
+        'time_money_title': '⏰ Czas to pieniądz',
+        'time_money_desc': 'Im wcześniej zaczniesz, tym więcej skorzystasz z procentu składanego. Każdy rok ma znaczenie!',
+        'error_age': '⚠️ Wiek przejścia na emeryturę musi być wyższy niż obecny wiek!',
+        'error_no_surplus': '⚠️ Obecne wydatki przewyższają dochody! Nie ma nadwyżki do oszczędzania.',
+        'nominal_value_chart': 'Wartość nominalna',
+        'real_value_chart': 'Wartość realna (po inflacji)',
+        'chart_title': 'Wzrost kapitału emerytalnego ({} lat)',
+        'chart_age': 'Wiek',
+        'chart_value': 'Wartość (PLN)',
+        'chart_hover_age': 'Wiek',
+        'chart_hover_value': 'Wartość',
+        'chart_hover_real_value': 'Wartość realna',
+        'currency': 'PLN',
+        'years_suffix': 'lat',
+        'purchasing_power': 'siły nabywczej',
+        'monte_carlo_params': '🎲 Symulacja Monte Carlo',
+        'monte_carlo_enable': 'Symuluj niepewność rynkową',
+        'monte_carlo_enable_help': 'Symulacja tysięcy losowych ścieżek stóp zwrotu i inflacji',
+        'return_volatility': 'Zmienność zwrotu (% rocznie):',
+        'return_volatility_help': 'Odchylenie standardowe rocznych stóp zwrotu',
+        'inflation_volatility': 'Zmienność inflacji (% rocznie):',
+        'inflation_volatility_help': 'Odchylenie standardowe rocznej inflacji',
+        'simulation_paths': 'Liczba symulowanych ścieżek:',
+        'distribution': 'Rozkład stóp zwrotu:',
+        'distribution_normal': 'Normalny',
+        'distribution_lognormal': 'Logarytmicznie normalny',
+        'target_capital': 'Docelowy kapitał (w dzisiejszych cenach, PLN):',
+        'target_capital_help': 'Realny kapitał, który chcesz mieć na emeryturze',
+        'mc_nominal_band_chart': 'Wartość nominalna (P5–P95)',
+        'mc_real_band_chart': 'Wartość realna (P5–P95)',
+        'mc_results': '🎲 Wyniki symulacji',
+        'mc_percentiles': '**Kapitał na emeryturze P5 / P50 / P95:**',
+        'mc_real_percentiles': '**Wartość realna P5 / P50 / P95:**',
+        'mc_success_probability': '**Prawdopodobieństwo osiągnięcia celu:**',
+        'retirement_phase': '🏖️ Faza emerytury',
+        'life_expectancy': 'Oczekiwana długość życia (wiek):',
+        'life_expectancy_help': 'Wiek, do którego symulowane są wypłaty',
+        'withdrawal_strategy': 'Strategia wypłat:',
+        'withdrawal_strategy_help': 'Ile kapitału jest wypłacane co roku na emeryturze',
+        'strategy_constant_real': 'Stała kwota korygowana o inflację',
+        'strategy_fixed_percentage': 'Stały procent salda',
+        'strategy_guardrails': 'Strategia z barierami (guardrails)',
+        'strategy_vpw': 'Zmienny procent wypłat (VPW)',
+        'withdrawal_rate': 'Początkowa stopa wypłat (%):',
+        'withdrawal_rate_help': 'Część kapitału emerytalnego wypłacana w pierwszym roku',
+        'retirement_nominal_chart': 'Wartość nominalna na emeryturze',
+        'retirement_real_chart': 'Wartość realna na emeryturze',
+        'depletion_age': '**Kapitał wyczerpie się w wieku:**',
+        'capital_lasts': '**Kapitał wystarczy do {} roku życia**',
+        'remaining_balance': '**Pozostały kapitał w wieku {} lat:**',
+        'mc_depletion_probability': '**Prawdopodobieństwo wyczerpania kapitału przed końcem życia:**',
+        'goal_seek': '🎯 Szukanie celu',
+        'target_pension': 'Docelowa miesięczna emerytura (PLN):',
+        'target_pension_help': 'Miesięczna emerytura, którą chcesz otrzymywać, przy stopie wypłat z panelu bocznego',
+        'target_pension_real': 'W dzisiejszych cenach',
+        'max_monthly_expenses': '**Maksymalne miesięczne wydatki:**',
+        'expense_cut': 'cięcie o {} względem obecnych',
+        'required_return': '**Wymagany roczny zwrot:**',
+        'earliest_retirement': '**Najwcześniejszy wiek emerytalny:**',
+        'goal_unreachable': 'nieosiągalne',
+        'goal_met_by_savings': 'osiągnięte dzięki samym obecnym oszczędnościom',
+        'sensitivity': '🌡️ Analiza wrażliwości',
+        'sensitivity_heatmap_tab': 'Zwrot × Inflacja',
+        'sensitivity_tornado_tab': 'Wykres tornado',
+        'heatmap_title': 'Realny kapitał na emeryturze (wzrost dochodu {:.1f}%)',
+        'heatmap_return': 'Roczny zwrot (%)',
+        'heatmap_inflation': 'Inflacja (%)',
+        'tornado_title': 'Zmiana realnego kapitału przy zmianie jednego parametru',
+        'tornado_lower': 'Niższa wartość',
+        'tornado_higher': 'Wyższa wartość',
+        'current_inputs': 'Obecne parametry',
+        'param_annual_return': 'Roczny zwrot ±1 pp',
+        'param_inflation_rate': 'Inflacja ±1 pp',
+        'param_income_growth_rate': 'Wzrost dochodu ±1 pp',
+        'param_monthly_expenses': 'Miesięczne wydatki ±500',
+        'param_current_savings': 'Obecne oszczędności ±10 000',
+        'table_page': 'Strona (z {}):',
+        'time_step': 'Krok kapitalizacji',
+        'time_step_1': 'Roczny',
+        'time_step_12': 'Miesięczny',
+        'time_step_365': 'Dzienny',
+        'time_step_help': 'Roczny dodaje oszczędności całego roku przed pełnym rokiem zwrotów. Miesięczny i dzienny inwestują oszczędności na bieżąco, kapitalizują zwroty i inflację w każdym kroku, a podwyżka jest raz w roku; tabela i wykres pokazują sumy roczne.',
+        'debug_timing': '⏱️ Czas renderowania',
+        'debug_stage': 'Etap',
+        'debug_total': 'Razem: {:.1f} ms',
+        'debug_profile': 'Profil: {}',
+        'scenarios': '💾 Scenariusze',
+        'scenario_name': 'Nazwa scenariusza',
+        'scenario_default_name': 'Emerytura w wieku {}, zwrot {:.1f}%',
+        'scenario_save': 'Zapisz scenariusz',
+        'scenario_save_help': 'Zapisuje bieżące parametry i ich roczną prognozę do porównania',
+        'scenario_saved': 'Zapisano „{}”',
+        'scenario_compare': '🔀 Porównanie scenariuszy',
+        'scenario_compare_select': 'Porównaj z zapisanymi scenariuszami',
+        'scenario_compare_placeholder': 'Wybierz scenariusze',
+        'scenario_none': 'Brak zapisanych scenariuszy',
+        'scenario_current': 'Bieżące parametry',
+        'scenario_chart_title': 'Kapitał realny według scenariusza',
+        'scenario_retirement_age': 'Wiek emerytalny',
+        'scenario_pension_real': 'Miesięczna emerytura (dzisiejsze ceny)',
+        'backtest_params': '📜 Test historyczny',
+        'backtest_enable': 'Testuj na historycznych stopach zwrotu',
+        'backtest_enable_help': 'Przeliczenie planu dla każdego historycznego okresu tej samej długości, z danymi o akcjach, obligacjach i inflacji z tych lat',
+        'backtest_missing': 'Brak danych historycznych w {}; utwórz je poleceniem `python -m pension_calculator history`',
+        'stock_allocation': 'Udział akcji (%)',
+        'stock_allocation_help': 'Część portfela w akcjach, reszta w obligacjach, z coroczną zmianą proporcji',
+        'backtest_too_long': 'Dane historyczne obejmują {} lat, mniej niż lat do emerytury',
+        'backtest_worst_chart': 'Najgorszy okres, realnie ({})',
+        'backtest_best_chart': 'Najlepszy okres, realnie ({})',
+        'backtest_results': '📜 Test historyczny',
+        'backtest_success_rate': '**Okresy pokrywające obecne wydatki:**',
+        'backtest_periods': '{} z {} okresów, cel {:,.0f} {}',
+        'backtest_worst': '**Najgorszy okres (wartość realna):**',
+        'backtest_best': '**Najlepszy okres (wartość realna):**',
+        'tax_params': '🧾 Podatki i konta',
+        'tax_enable': 'Uwzględnij podatki i limity kont',
+        'tax_enable_help': 'Podział oszczędności na IKZE, IKE i rachunek maklerski do ich rocznych limitów, z ulgą na wpłaty do IKZE, podatkiem Belki od zysków na rachunku maklerskim i 10% podatkiem od wypłaty z IKZE (przybliżone zasady, stawka PIT 12%)',
+        'account_tax_deferred': 'IKZE (odroczony podatek)',
+        'account_tax_free': 'IKE (bez podatku)',
+        'account_taxable': 'Rachunek maklerski (opodatkowany)',
+        'tax_results': '🧾 Po podatkach',
+        'after_tax_capital': 'Kapitał po podatkach',
+        'after_tax_capital_help': 'Kapitał wszystkich kont po podatku od wypłaty',
+        'after_tax_real': 'Wartość realna po podatkach',
+        'after_tax_real_help': 'Kapitał po podatkach w dzisiejszych cenach',
+        'after_tax_real_chart': 'Wartość realna po podatkach',
+        'account_col': 'Konto',
+        'account_cap_col': 'Roczny limit (dziś)',
+        'account_deposits_col': 'Wpłaty',
+        'account_balance_col': 'Saldo',
+        'account_after_tax_col': 'Po podatku',
+        'savings_rate': '**Stopa oszczędności (oszczędzana część dochodu):**',
+        'savings_rate_value': '{:.1%} dziś, {:.1%} w roku emerytury',
+        'years_to_fi': '**Niezależność finansowa (wypłaty pokrywają wydatki):**',
+        'years_to_fi_value': 'za {:.0f} lat, w wieku {:.0f}',
+        'years_to_fi_never': 'nie w ciągu {} lat',
+        'after_tax_return': 'Stopa zwrotu z oszczędności po podatkach',
+        'after_tax_return_help': 'Roczna stopa zwrotu ważona kapitałem (IRR) z zaoszczędzonych pieniędzy, po podatkach i z ulgą od wpłat'
+    },
+    'zh': {
+        'page_title': '退休计算器',
+        'page_icon': '📈',
+        'main_title': '📈 退休计算器',
+        'sidebar_options': '⚙️ 选项',
+        'language_select': '选择语言:',
+        'current_age': '请输入您的当前年龄:',
+        'retirement_age': '请输入您计划退休的年龄:',
+        'income_params': '💰 收入参数',
+        'current_savings': '当前储蓄 (CNY):',
+        'current_savings_help': '您已经储蓄的金额',
+        'monthly_income': '当前月净收入 (CNY):',
+        'monthly_income_help': '月收入包括奖金、退税等',
+        'income_growth': '预期收入增长率 (% 每年):',
+        'income_growth_help': '平均年收入增长率（如升职、工资通胀）',
+        'expense_params': '🏠 支出参数',
+        'monthly_expenses': '当前月支出 (CNY):',
+        'monthly_expenses_help': '所有月生活费用',
+        'investment_params': '📈 投资参数',
+        'annual_return': '预期年回报率 (%):',
+        'annual_return_help': '投资的平均年回报率',
+        'inflation_rate': '通胀率 (%):',
+        'inflation_help': '预期平均年通胀率（支出增长）',
+        'capital_forecast': '📊 资本增长预测',
+        'monthly_surplus': '💰 **当前月储蓄余额:**',
+        'age_col': '年龄',
+        'annual_income_col': '年收入',
+        'annual_expenses_col': '年支出',
+        'annual_contribution_col': '年投入',
+        'nominal_value_col': '名义价值',
+        'real_value_col': '实际价值',
+        'detailed_data': '📋 详细数据',
+        'summary': '📈 摘要',
+        'retirement_capital': '退休资本',
+        'real_value': '实际价值',
+        'total_contributions': '总投入',
+        'avg_annual_contribution': '平均年投入',
+        'investment_gain': '投资收益',
+        'additional_info': '💡 附加信息',
+        'retirement_year_info': '**在退休年份（{}岁）:**',
+        'income_label': '收入',
+        'expenses_label': '支出',
+        'surplus_label': '余额',
+        'monthly_pension_4pct': '**月退休金（4%规则）:**',
+        'current_purchasing_power': '**相当于今天:**',
+        'expense_coverage': '**当前支出覆盖率:**',
+        'doubling_time': '**资本翻倍时间:**',
+        'retirement_tips': '💡 退休建议',
+        'rule_4pct_title': '🎯 4%规则',
+        'rule_4pct_desc': '安全的年提取率是累积资本的4%。这意味着您需要25倍的年支出。',
+        'diversification_title': '📊 多元化',
+        'diversification_desc': '将投资分散到不同的资产类别：股票、债券、房地产、大宗商品。',
+        'time_money_title': '⏰ 时间就是金钱',
+        'time_money_desc': '越早开始，就越能从复利中受益。每一年都很重要！',
+        'error_age': '⚠️ 退休年龄必须高于当前年龄！',
+        'error_no_surplus': '⚠️ 当前支出超过收入！没有储蓄余额。',
+        'nominal_value_chart': '名义价值',
+        'real_value_chart': '实际价值（扣除通胀）',
+        'chart_title': '退休资本增长（{}年）',
+        'chart_age': '年龄',
+        'chart_value': '价值 (CNY)',
+        'chart_hover_age': '年龄',
+        'chart_hover_value': '价值',
+        'chart_hover_real_value': '实际价值',
+        'currency': 'CNY',
+        'years_suffix': '年',
+        'purchasing_power': '购买力',
+        'monte_carlo_params': '🎲 蒙特卡洛模拟',
+        'monte_carlo_enable': '模拟市场不确定性',
+        'monte_carlo_enable_help': '模拟数千条回报率和通胀的随机路径',
+        'return_volatility': '回报波动率 (% 每年):',
+        'return_volatility_help': '年投资回报率的标准差',
+        'inflation_volatility': '通胀波动率 (% 每年):',
+        'inflation_volatility_help': '年通胀率的标准差',
+        'simulation_paths': '模拟路径数量:',
+        'distribution': '回报率分布:',
+        'distribution_normal': '正态分布',
+        'distribution_lognormal': '对数正态分布',
+        'target_capital': '目标资本（今日价值，CNY）:',
+        'target_capital_help': '您希望在退休时拥有的实际资本',
+        'mc_nominal_band_chart': '名义价值 (P5–P95)',
+        'mc_real_band_chart': '实际价值 (P5–P95)',
+        'mc_results': '🎲 模拟结果',
+        'mc_percentiles': '**退休资本 P5 / P50 / P95:**',
+        'mc_real_percentiles': '**实际价值 P5 / P50 / P95:**',
+        'mc_success_probability': '**达到目标的概率:**',
+        'retirement_phase': '🏖️ 退休阶段',
+        'life_expectancy': '预期寿命（年龄）:',
+        'life_expectancy_help': '模拟提取直到该年龄',
+        'withdrawal_strategy': '提取策略:',
+        'withdrawal_strategy_help': '退休后每年从资本中提取多少',
+        'strategy_constant_real': '随通胀调整的固定金额',
+        'strategy_fixed_percentage': '余额的固定百分比',
+        'strategy_guardrails': '护栏策略',
+        'strategy_vpw': '可变百分比提取 (VPW)',
+        'withdrawal_rate': '初始提取率 (%):',
+        'withdrawal_rate_help': '第一年提取的退休资本比例',
+        'retirement_nominal_chart': '退休期间名义价值',
+        'retirement_real_chart': '退休期间实际价值',
+        'depletion_age': '**资本耗尽年龄:**',
+        'capital_lasts': '**资本可维持到{}岁**',
+        'remaining_balance': '**{}岁时剩余资本:**',
+        'mc_depletion_probability': '**在预期寿命前耗尽资本的概率:**',
+        'goal_seek': '🎯 目标求解',
+        'target_pension': '目标月退休金 (CNY):',
+        'target_pension_help': '您希望获得的月退休金，使用侧边栏中的提取率',
+        'target_pension_real': '按今日价值计算',
+        'max_monthly_expenses': '**最高月支出:**',
+        'expense_cut': '比现在减少{}',
+        'required_return': '**所需年回报率:**',
+        'earliest_retirement': '**最早退休年龄:**',
+        'goal_unreachable': '无法达到',
+        'goal_met_by_savings': '仅靠当前储蓄即可达到',
+        'sensitivity': '🌡️ 敏感性分析',
+        'sensitivity_heatmap_tab': '回报率 × 通胀',
+        'sensitivity_tornado_tab': '龙卷风图',
+        'heatmap_title': '退休时的实际资本（收入增长 {:.1f}%）',
+        'heatmap_return': '年回报率 (%)',
+        'heatmap_inflation': '通胀率 (%)',
+        'tornado_title': '单个参数变化时实际资本的变化',
+        'tornado_lower': '较低值',
+        'tornado_higher': '较高值',
+        'current_inputs': '当前参数',
+        'param_annual_return': '年回报率 ±1 个百分点',
+        'param_inflation_rate': '通胀率 ±1 个百分点',
+        'param_income_growth_rate': '收入增长 ±1 个百分点',
+        'param_monthly_expenses': '月支出 ±500',
+        'param_current_savings': '当前储蓄 ±10,000',
+        'table_page': '页码（共 {} 页）:',
+        'time_step': '复利步长',
+        'time_step_1': '按年',
+        'time_step_12': '按月',
+        'time_step_365': '按日',
+        'time_step_help': '按年：全年储蓄先加入，再计算一整年的收益。按月和按日：储蓄随时投入，每一步计算收益和通胀，每年加薪一次；表格和图表显示年度汇总。',
+        'debug_timing': '⏱️ 渲染耗时',
+        'debug_stage': '阶段',
+        'debug_total': '合计：{:.1f} 毫秒',
+        'debug_profile': '性能分析文件：{}',
+        'scenarios': '💾 方案',
+        'scenario_name': '方案名称',
+        'scenario_default_name': '{}岁退休，回报率{:.1f}%',
+        'scenario_save': '保存方案',
+        'scenario_save_help': '保存当前参数及其年度预测以便比较',
+        'scenario_saved': '已保存“{}”',
+        'scenario_compare': '🔀 方案比较',
+        'scenario_compare_select': '与已保存的方案比较',
+        'scenario_compare_placeholder': '选择方案',
+        'scenario_none': '尚无已保存的方案',
+        'scenario_current': '当前参数',
+        'scenario_chart_title': '各方案的实际资本',
+        'scenario_retirement_age': '退休年龄',
+        'scenario_pension_real': '月退休金（按今日价格）',
+        'backtest_params': '📜 历史回测',
+        'backtest_enable': '用历史回报回测',
+        'backtest_enable_help': '在每个相同长度的历史时期上运行计划，使用这些年份的股票、债券和通胀数据',
+        'backtest_missing': '{} 处没有历史数据；请用 `python -m pension_calculator history` 生成',
+        'stock_allocation': '股票配置 (%)',
+        'stock_allocation_help': '投资组合中股票的比例,其余为债券,每年再平衡',
+        'backtest_too_long': '历史数据只涵盖 {} 年，少于距退休的年数',
+        'backtest_worst_chart': '最差时期，实际 ({})',
+        'backtest_best_chart': '最佳时期，实际 ({})',
+        'backtest_results': '📜 历史回测',
+        'backtest_success_rate': '**能覆盖当前支出的时期:**',
+        'backtest_periods': '{} / {} 个时期，目标 {:,.0f} {}',
+        'backtest_worst': '**最差时期 (实际价值):**',
+        'backtest_best': '**最佳时期 (实际价值):**',
+        'tax_params': '🧾 税收与账户',
+        'tax_enable': '计入税收和账户限额',
+        'tax_enable_help': '将储蓄按年度限额分配到个人养老金账户和普通证券账户，个人养老金缴费可抵税，领取时按3%纳税 (近似规则，10%税率档)',
+        'account_tax_deferred': '个人养老金 (递延纳税)',
+        'account_tax_free': '免税账户',
+        'account_taxable': '普通证券账户 (应税)',
+        'tax_results': '🧾 税后',
+        'after_tax_capital': '税后资本',
+        'after_tax_capital_help': '所有账户扣除领取税后的资本',
+        'after_tax_real': '税后实际价值',
+        'after_tax_real_help': '按今日价格计算的税后资本',
+        'after_tax_real_chart': '税后实际价值',
+        'account_col': '账户',
+        'account_cap_col': '年度限额 (今日)',
+        'account_deposits_col': '缴费',
+        'account_balance_col': '余额',
+        'account_after_tax_col': '税后',
+        'savings_rate': '**储蓄率（收入中储蓄的比例）:**',
+        'savings_rate_value': '今天{:.1%}，退休年份{:.1%}',
+        'years_to_fi': '**财务自由（提取额覆盖支出）:**',
+        'years_to_fi_value': '{:.0f}年后，{:.0f}岁时',
+        'years_to_fi_never': '{}年内无法实现',
+        'after_tax_return': '储蓄的税后收益率',
+        'after_tax_return_help': '所储蓄资金的资金加权年收益率（IRR），已扣税并计入缴费抵税'
+    }
+}
+
+# Default values based on language/region
+default_values = {
+    'en': {
+        'current_savings': 71000,
+        'monthly_income': 12833,
+        'monthly_expenses': 6500,
+        'income_growth': 6.5,
+        'annual_return': 6.0,
+        'inflation_rate': 3.5,
+        'tax_preset': 'us'
+    },
+    'pl': {
+        'current_savings': 71000,
+        'monthly_income': 12833,
+        'monthly_expenses': 6500,
+        'income_growth': 6.5,
+        'annual_return': 6.0,
+        'inflation_rate': 3.5,
+        'tax_preset': 'pl'
+    },
+    'zh': {
+        'current_savings': 71000,
+        'monthly_income': 12833,
+        'monthly_expenses': 6500,
+        'income_growth': 6.5,
+        'annual_return': 6.0,
+        'inflation_rate': 3.5,
+        'tax_preset': 'cn'
+    }
+}